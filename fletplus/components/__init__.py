@@ -53,6 +53,7 @@ LAZY_IMPORTS = {
     "resolve_layout_tokens": "fletplus.components.frontend_layouts",
     "SidebarAdmin": "fletplus.components.sidebar_admin",
     "SmartTable": "fletplus.components.smart_table",
+    "FileDataProvider": "fletplus.components.smart_table_file",
     "LineChart": "fletplus.components.charts",
     "LoadingState": "fletplus.components.states",
     "EmptyState": "fletplus.components.states",
@@ -110,6 +111,7 @@ if TYPE_CHECKING:
     from fletplus.components.responsive_grid import ResponsiveGrid, ResponsiveGridItem
     from fletplus.components.sidebar_admin import SidebarAdmin
     from fletplus.components.smart_table import SmartTable
+    from fletplus.components.smart_table_file import FileDataProvider
     from fletplus.components.states import (
         EmptyState,
         ErrorState,
@@ -156,6 +158,7 @@ __all__ = [
     "ResponsiveGridItem",
     "SidebarAdmin",
     "SmartTable",
+    "FileDataProvider",
     "LineChart",
     "LoadingState",
     "EmptyState",
@@ -11,6 +11,7 @@ from fletplus.components.responsive_container import (
 from fletplus.styles import Style
 from fletplus.utils.flet_compat import get_page_width, safe_update_page_sync
 from fletplus.utils.responsive_breakpoints import BreakpointRegistry
+from fletplus.utils.responsive_dispatcher import request_page_update
 from fletplus.utils.responsive_manager import ResponsiveManager
 
 # Alias para mantener compatibilidad con la ruta histórica.
@@ -56,7 +57,7 @@ class FlexRow(_FlexBase):
             target.spacing = cfg.get("spacing", target.spacing)
             target.alignment = cfg.get("alignment", target.alignment)
             target.wrap = cfg.get("wrap", target.wrap)
-            safe_update_page_sync(page)
+            request_page_update(page, safe_update_page_sync)
 
         callbacks = {bp: rebuild for bp in self.breakpoints}
         ResponsiveManager(page, callbacks)
@@ -82,7 +83,7 @@ class FlexColumn(_FlexBase):
             target.spacing = cfg.get("spacing", target.spacing)
             target.alignment = cfg.get("alignment", target.alignment)
             target.scroll = cfg.get("wrap", target.scroll)
-            safe_update_page_sync(page)
+            request_page_update(page, safe_update_page_sync)
 
         callbacks = {bp: rebuild for bp in self.breakpoints}
         ResponsiveManager(page, callbacks)
@@ -156,7 +157,7 @@ class Stack:
             stack.alignment = self._resolve_alignment(width)
             for item in self.items:
                 item.control.visible = item.is_visible(width)
-            safe_update_page_sync(page)
+            request_page_update(page, safe_update_page_sync)
 
         breakpoints = self._collect_breakpoints()
         if not breakpoints:
@@ -263,7 +264,7 @@ class Grid:
             for item, wrapper in wrappers:
                 wrapper.col = item.resolve_span(current_width)
                 wrapper.visible = item.is_visible(current_width)
-            safe_update_page_sync(page)
+            request_page_update(page, safe_update_page_sync)
 
         breakpoints = self._collect_breakpoints()
         if not breakpoints:
@@ -302,7 +303,7 @@ class Wrap(_FlexBase):
             target.spacing = cfg.get("spacing", target.spacing)
             target.run_spacing = cfg.get("run_spacing", target.run_spacing)
             target.alignment = cfg.get("alignment", target.alignment)
-            safe_update_page_sync(page)
+            request_page_update(page, safe_update_page_sync)
 
         callbacks = {bp: rebuild for bp in self.breakpoints}
         ResponsiveManager(page, callbacks)
@@ -338,7 +339,7 @@ class Spacer:
                 container.width = value
             else:
                 container.height = value
-            safe_update_page_sync(page)
+            request_page_update(page, safe_update_page_sync)
 
         callbacks = {bp: rebuild for bp in self.breakpoints}
         ResponsiveManager(page, callbacks)
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+from bisect import bisect_right
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Dict, Mapping, Optional, Sequence
 
 import flet as ft
 
+from fletplus.components.responsive_grid_rs import (
+    GridPlanCache as _GridPlanCache,
+)
 from fletplus.components.responsive_grid_rs import (
     plan_items as _plan_grid_items_native,
 )
@@ -21,6 +25,7 @@ from fletplus.utils.device_profiles import (
     iter_device_profiles,
 )
 from fletplus.utils.responsive_breakpoints import BreakpointRegistry
+from fletplus.utils.responsive_dispatcher import request_page_update
 from fletplus.utils.responsive_manager import ResponsiveManager
 from fletplus.utils.responsive_style import ResponsiveStyle
 
@@ -819,6 +824,15 @@ class ResponsiveGrid:
 
         self._manager: ResponsiveManager | None = None
         self._row: ft.ResponsiveRow | None = None
+        # Contenedor de cada item del último ``_build_row`` por índice.
+        self._item_containers: dict[int, tuple[ResponsiveGridItem, ft.Container]] = {}
+        # Tabla de distribución: para cada intervalo de ancho que empieza en
+        # ``_plan_bounds[i]``, los pares ``(índice, span)`` visibles.
+        self._plan_bounds: list[int] = []
+        self._plan_table: list[tuple[tuple[int, int | None], ...]] = []
+        self._plan_signature: tuple[object, ...] | None = None
+        self._native_plan_cache: object | None = None
+        self._native_plan_items: tuple[int, ...] | None = None
         self._section_container: ft.Container | None = None
         self._section_column: ft.Column | None = None
         self._section_header_container: ft.Container | None = None
@@ -917,9 +931,9 @@ class ResponsiveGrid:
         return container
 
     # ------------------------------------------------------------------
-    def _build_row(self, width: int) -> ft.ResponsiveRow:
-        columns = self._resolve_columns(width)
-        device = self._resolve_device_name(width)
+    def _plan_descriptors(
+        self, width: int, columns: int, device: DeviceName
+    ) -> list[dict[str, object]]:
         descriptors: list[dict[str, object]] | None = None
 
         if _plan_grid_items_native_from_objects is not None:
@@ -980,24 +994,126 @@ class ResponsiveGrid:
                         ),
                     }
                 )
+        return descriptors
 
-        containers = []
-        for descriptor in descriptors:
-            item = self._items[int(descriptor.get("index", 0))]
-            resolved_span = descriptor.get("col")
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _descriptor_span(descriptor: Mapping[str, object]) -> int | None:
+        resolved_span = descriptor.get("col")
+        try:
+            return int(resolved_span) if resolved_span is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    # ------------------------------------------------------------------
+    def invalidate_layout_plan(self) -> None:
+        """Descarta la tabla de distribución precalculada.
+
+        La tabla se recalcula sola cuando cambian los items, los breakpoints
+        o los perfiles de dispositivo. Llama a este método después de
+        modificar en el sitio los atributos de un :class:`ResponsiveGridItem`.
+        """
+
+        self._plan_signature = None
+        self._native_plan_cache = None
+        self._native_plan_items = None
+
+    # ------------------------------------------------------------------
+    def _layout_plan_bounds(self) -> list[int]:
+        """Anchos donde puede cambiar la distribución de algún item."""
+
+        bounds = {0}
+        bounds.update(self.breakpoints)
+        for profile in self.device_profiles:
+            bounds.add(profile.min_width)
+            if profile.max_width is not None:
+                bounds.add(profile.max_width + 1)
+        for item in self._items:
+            bounds.update(item.span_breakpoints or ())
+            if item.min_width is not None:
+                bounds.add(item.min_width)
+            if item.max_width is not None:
+                bounds.add(item.max_width + 1)
+        return sorted(bounds)
+
+    # ------------------------------------------------------------------
+    def _ensure_layout_plan(self) -> None:
+        item_ids = tuple(map(id, self._items))
+        signature = (
+            item_ids,
+            tuple(sorted(self.breakpoints.items())),
+            self.device_profiles,
+        )
+        if signature == self._plan_signature:
+            return
+
+        bounds = self._layout_plan_bounds()
+        contexts = [
+            (bound, self._resolve_columns(bound), self._resolve_device_name(bound))
+            for bound in bounds
+        ]
+        table: list[tuple[tuple[int, int | None], ...]] | None = None
+        if _GridPlanCache is not None:
             try:
-                span_value = int(resolved_span) if resolved_span is not None else None
-            except (TypeError, ValueError):
-                span_value = None
-            containers.append(
-                self._build_item_container(
-                    item,
-                    width,
-                    columns,
-                    device,
-                    resolved_span=span_value,
+                # La caché nativa conserva los items ya extraídos mientras no cambien.
+                if self._native_plan_items != item_ids or self._native_plan_cache is None:
+                    self._native_plan_cache = _GridPlanCache(self._items)
+                    self._native_plan_items = item_ids
+                table = [
+                    tuple((int(index), span) for index, span in plan)
+                    for plan in self._native_plan_cache.plan_table(contexts)
+                ]
+            except Exception:
+                self._native_plan_cache = None
+                self._native_plan_items = None
+                table = None
+
+        if table is None:
+            table = [
+                tuple(
+                    (int(descriptor.get("index", 0)), self._descriptor_span(descriptor))
+                    for descriptor in self._plan_descriptors(*context)
                 )
+                for context in contexts
+            ]
+
+        self._plan_bounds = bounds
+        self._plan_table = table
+        self._plan_signature = signature
+
+    # ------------------------------------------------------------------
+    def _layout_plan(self, width: int) -> tuple[tuple[int, int | None], ...]:
+        """Pares ``(índice, span)`` visibles en ``width`` según la tabla."""
+
+        self._ensure_layout_plan()
+        position = bisect_right(self._plan_bounds, width) - 1
+        if position < 0:
+            # Anchos negativos: quedan fuera de la tabla y se calculan aparte.
+            columns = self._resolve_columns(width)
+            device = self._resolve_device_name(width)
+            return tuple(
+                (int(descriptor.get("index", 0)), self._descriptor_span(descriptor))
+                for descriptor in self._plan_descriptors(width, columns, device)
             )
+        return self._plan_table[position]
+
+    # ------------------------------------------------------------------
+    def _build_row(self, width: int) -> ft.ResponsiveRow:
+        columns = self._resolve_columns(width)
+        device = self._resolve_device_name(width)
+        containers = []
+        self._item_containers = {}
+        for index, span in self._layout_plan(width):
+            item = self._items[index]
+            container = self._build_item_container(
+                item,
+                width,
+                columns,
+                device,
+                resolved_span=span,
+            )
+            self._item_containers[index] = (item, container)
+            containers.append(container)
         row = ft.ResponsiveRow(
             controls=containers,
             alignment=self.alignment,
@@ -1006,6 +1122,84 @@ class ResponsiveGrid:
         self._apply_spacing_to_row(row, width)
         return row
 
+    # ------------------------------------------------------------------
+    def _set_item_padding(self, container: ft.Container, padding: object) -> None:
+        # Con estilos registrados el padding del grid es la base del estilo:
+        # se actualiza en el gestor para no pisar el valor del estilo activo.
+        base = getattr(container, "__fletplus_base_attrs__", None)
+        update_base = getattr(self._manager, "update_base_attributes", None)
+        if isinstance(base, dict) and callable(update_base):
+            if base.get("padding") != padding:
+                update_base(container, padding=padding)
+            return
+        if container.padding != padding:
+            container.padding = padding
+
+    # ------------------------------------------------------------------
+    def _sync_row(self, width: int) -> list[ft.Container]:
+        """Actualiza ``self._row`` en el sitio para ``width``.
+
+        Reutiliza el contenedor de cada item (por índice, mientras el item
+        siga siendo el mismo objeto) y solo asigna ``col``, ``padding`` y
+        ``visible`` cuando cambian, de modo que Flet no vuelve a enviar las
+        tarjetas al cliente. Los items ocultos conservan su contenedor con
+        ``visible=False`` y la lista de controles solo cambia cuando aparece
+        un item por primera vez. Devuelve los contenedores creados.
+        """
+
+        row = self._row
+        assert row is not None
+        columns = self._resolve_columns(width)
+        device = self._resolve_device_name(width)
+        padding = self._resolve_spacing_values(width)[0]
+        spans = dict(self._layout_plan(width))
+
+        created: list[ft.Container] = []
+        for index, (item, container) in list(self._item_containers.items()):
+            if index >= len(self._items) or self._items[index] is not item:
+                del self._item_containers[index]
+        for index, span in spans.items():
+            if index in self._item_containers:
+                continue
+            item = self._items[index]
+            container = self._build_item_container(
+                item, width, columns, device, resolved_span=span
+            )
+            self._item_containers[index] = (item, container)
+            created.append(container)
+
+        for index, (item, container) in self._item_containers.items():
+            visible = index in spans
+            if container.visible != visible:
+                container.visible = visible
+            if not visible:
+                continue
+            span = spans[index] or item.resolve_span(width, columns, device)
+            if container.col != span:
+                container.col = span
+            self._set_item_padding(container, padding)
+
+        controls = [
+            container for _, (_, container) in sorted(self._item_containers.items())
+        ]
+        if len(controls) != len(row.controls) or any(
+            current is not control for current, control in zip(row.controls, controls)
+        ):
+            row.controls[:] = controls
+        if row.alignment != self.alignment:
+            row.alignment = self.alignment
+        _, run_spacing = self._resolve_spacing_values(width)
+        if run_spacing is None:
+            run_spacing = self.run_spacing
+        if run_spacing is not None:
+            try:
+                run_spacing = int(run_spacing)
+            except (TypeError, ValueError):
+                pass
+        if row.run_spacing != run_spacing:
+            row.run_spacing = run_spacing
+        return created
+
     # ------------------------------------------------------------------
     def build(self, page_width: Optional[int]) -> ft.Control:
         width = page_width or 0
@@ -1882,15 +2076,10 @@ class ResponsiveGrid:
                     width=page.width or 0,
                 )
                 self._current_orientation = orientation
-            new_row = self._build_row(width)
-            self._row.controls.clear()
-            self._row.controls.extend(new_row.controls)
-            self._row.alignment = new_row.alignment
-            self._row.run_spacing = new_row.run_spacing
-            self._apply_spacing_to_row(self._row, width)
-            self._register_item_styles(page, self._row.controls)
+            created = self._sync_row(width)
+            self._register_item_styles(page, created)
             self._update_section_layout(width)
-            page.update()
+            request_page_update(page, lambda current: current.update())
 
         callbacks = {bp: rebuild for bp in self.breakpoints}
 
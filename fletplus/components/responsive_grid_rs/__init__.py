@@ -1,9 +1,9 @@
 """Backend opcional en Rust para ``ResponsiveGrid``.
 
-El módulo expone ``plan_items`` y ``plan_items_from_objects`` cuando la
-extensión nativa está compilada. Si no está disponible, ambas variables
-quedan en ``None`` para permitir un fallback transparente en el código
-Python.
+El módulo expone ``plan_items``, ``plan_items_from_objects`` y la caché por
+grid ``GridPlanCache`` cuando la extensión nativa está compilada. Si no está
+disponible, las tres variables quedan en ``None`` para permitir un fallback
+transparente en el código Python.
 """
 from __future__ import annotations
 
@@ -13,6 +13,7 @@ from typing import Any, Callable, Optional
 
 plan_items: Optional[Callable[..., Any]]
 plan_items_from_objects: Optional[Callable[..., Any]]
+GridPlanCache: Optional[Callable[..., Any]]
 
 _spec = importlib.util.find_spec("fletplus.components.responsive_grid_rs._native")
 if _spec is None:
@@ -28,8 +29,10 @@ else:
 if _native is not None:
     plan_items = _native.plan_items
     plan_items_from_objects = getattr(_native, "plan_items_from_objects", None)
+    GridPlanCache = getattr(_native, "GridPlanCache", None)
 else:
     plan_items = None
     plan_items_from_objects = None
+    GridPlanCache = None
 
-__all__ = ["plan_items", "plan_items_from_objects"]
+__all__ = ["GridPlanCache", "plan_items", "plan_items_from_objects"]
@@ -30,14 +30,15 @@ fn resolve_span(item: &GridItemSpec, width: i64, columns: i64, device: &str) ->
     }
 
     if let Some(ref breakpoints) = item.span_breakpoints {
-        let mut selected: Option<i64> = None;
+        // Igual que en Python: gana el mayor breakpoint que no supera el ancho.
+        let mut selected: Option<(i64, i64)> = None;
         for (bp, span) in breakpoints.iter() {
-            if width >= *bp {
-                selected = Some(*span);
+            if width >= *bp && selected.map_or(true, |(best, _)| *bp > best) {
+                selected = Some((*bp, *span));
             }
         }
 
-        if let Some(span) = selected {
+        if let Some((_, span)) = selected {
             return sanitize_span(span);
         }
     }
@@ -285,9 +286,55 @@ fn plan_items_from_objects(
     Ok(result)
 }
 
+/// Items de un grid ya extraídos de Python.
+///
+/// Se crea una vez por grid y se reutiliza mientras sus items no cambien,
+/// de modo que calcular la tabla de distribución no vuelve a leer los
+/// atributos de cada item.
+#[pyclass(module = "fletplus.components.responsive_grid_rs._native")]
+struct GridPlanCache {
+    specs: Vec<GridItemSpec>,
+}
+
+#[pymethods]
+impl GridPlanCache {
+    #[new]
+    fn new(py: Python<'_>, items: Vec<PyObject>) -> PyResult<Self> {
+        let specs = items
+            .iter()
+            .enumerate()
+            .map(|(index, item)| build_item_spec_from_object(item.as_ref(py), index))
+            .collect::<PyResult<Vec<_>>>()?;
+        Ok(Self { specs })
+    }
+
+    fn __len__(&self) -> usize {
+        self.specs.len()
+    }
+
+    /// Pares ``(índice, span)`` visibles para cada ``(ancho, columnas, dispositivo)``.
+    fn plan_table(&self, contexts: Vec<(i64, i64, String)>) -> PyResult<Vec<Vec<(usize, i64)>>> {
+        let mut table = Vec::with_capacity(contexts.len());
+        for (width, columns, device) in contexts.iter() {
+            if *width < 0 {
+                return Err(PyErr::new::<PyValueError, _>("El ancho no puede ser negativo"));
+            }
+            table.push(
+                self.specs
+                    .iter()
+                    .filter(|spec| is_visible(spec, *width, device))
+                    .map(|spec| (spec.index, resolve_span(spec, *width, *columns, device)))
+                    .collect(),
+            );
+        }
+        Ok(table)
+    }
+}
+
 #[pymodule]
 fn _native(_py: Python<'_>, m: &PyModule) -> PyResult<()> {
     m.add_wrapped(wrap_pyfunction!(plan_items))?;
     m.add_wrapped(wrap_pyfunction!(plan_items_from_objects))?;
+    m.add_class::<GridPlanCache>()?;
     Ok(())
 }
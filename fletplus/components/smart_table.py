@@ -3,10 +3,18 @@
 Este módulo provee `SmartTable`, un envoltorio de ``ft.DataTable`` que
 agrega las capacidades necesarias para escenarios de datos modernos:
 
-* Carga virtualizada con proveedores síncronos o asíncronos.
-* Filtros por columna con API declarativa.
+* Carga virtualizada con proveedores síncronos o asíncronos, con delegación
+  opcional de filtros y orden al proveedor y caché de páginas por consulta.
+* Renderizado por ventana: solo se construyen las filas visibles.
+* Consultas pesadas resueltas fuera del bucle de eventos, en un hilo o en
+  un pool de procesos.
+* Filtros por columna con API declarativa y búsqueda rápida en toda la
+  tabla con resaltado de coincidencias.
 * Ordenamiento multi-columna con indicadores visuales.
 * Edición en línea con validaciones y callbacks de guardado.
+* Agregados por columna mantenidos de forma incremental, con agrupación
+  plegable y fila de totales.
+* Exportación en streaming a CSV o JSONL en el orden de la consulta.
 
 Las estructuras auxiliares (`SmartTableColumn`, `SmartTableFilter`,
 `SmartTableSort` y `SmartTableQuery`) facilitan la configuración tipada de
@@ -16,29 +24,57 @@ estas capacidades.
 from __future__ import annotations
 
 import asyncio
+import bisect
+import csv
 import importlib
 import importlib.util
 import inspect
+import io
+import json
+import logging
+import math
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
+from types import MappingProxyType
 from typing import (
     Any,
     AsyncIterable,
+    AsyncIterator,
     Awaitable,
     Callable,
     Dict,
     Iterable,
+    Iterator,
     List,
     Mapping,
     MutableMapping,
     Optional,
     Sequence,
+    Tuple,
     Union,
 )
 
 import flet as ft
 
+from fletplus.components.smart_table_aggregates import AGGREGATES, AggregateIndex
+from fletplus.components.smart_table_search import (
+    SearchIndex,
+    Span,
+    highlight_spans,
+    normalize_text,
+    split_terms,
+)
+from fletplus.components.smart_table_store import ColumnarStore, run_query
+from fletplus.state import Signal
 from fletplus.styles import Style
 
+logger = logging.getLogger(__name__)
+
 # ---------------------------------------------------------------------------
 # Modelos declarativos
 # ---------------------------------------------------------------------------
@@ -103,6 +139,33 @@ _RUST_FILTER_OPERATORS: Dict[Callable[[Any, Any], bool], str] = {
 }
 
 
+def _filter_narrows(new: "SmartTableFilter", old: "SmartTableFilter") -> bool:
+    """Indica si toda fila que cumple ``new`` cumple también ``old``."""
+
+    if old.value in (None, ""):
+        return True
+    if new.value in (None, ""):
+        return False
+    new_op = _RUST_FILTER_OPERATORS.get(new.predicate)
+    old_op = _RUST_FILTER_OPERATORS.get(old.predicate)
+    try:
+        if new_op is None or old_op is None:
+            return new.predicate is old.predicate and bool(new.value == old.value)
+        if new_op == old_op == "contains_ci":
+            return str(old.value).lower() in str(new.value).lower()
+        if new_op in ("lt", "lte") and old_op in ("lt", "lte"):
+            if new.value < old.value:
+                return True
+            return bool(new.value == old.value) and (new_op == "lt" or old_op == "lte")
+        if new_op in ("gt", "gte") and old_op in ("gt", "gte"):
+            if new.value > old.value:
+                return True
+            return bool(new.value == old.value) and (new_op == "gt" or old_op == "gte")
+        return new_op == old_op and bool(new.value == old.value)
+    except Exception:
+        return False
+
+
 @dataclass(slots=True)
 class SmartTableFilter:
     """Representa un filtro aplicado a una columna."""
@@ -136,6 +199,9 @@ class SmartTableQuery:
 
     filters: Dict[str, SmartTableFilter] = field(default_factory=dict)
     sorts: List[SmartTableSort] = field(default_factory=list)
+    search: str = ""
+    #: Columnas en las que debe buscarse ``search`` (las de peso positivo).
+    search_columns: Tuple[str, ...] = ()
 
     def to_dict(self) -> Dict[str, Any]:
         """Devuelve una representación serializable de la consulta."""
@@ -148,6 +214,8 @@ class SmartTableQuery:
                 {"key": sort.key, "ascending": sort.ascending}
                 for sort in self.sorts
             ],
+            "search": self.search,
+            "search_columns": list(self.search_columns),
         }
 
 
@@ -165,6 +233,9 @@ class SmartTableColumn:
     editor_builder: Optional[Callable[[Any, Callable[[Any], None]], ft.Control]] = None
     validator: Optional[Callable[[Any], None]] = None
     alignment: Optional[ft.TextAlign] = None
+    search_weight: float = 1.0
+    highlight_builder: Optional[Callable[[Any, Sequence[Span]], ft.Control]] = None
+    aggregate: Optional[str] = None
 
     def build_label(
         self,
@@ -198,6 +269,153 @@ class _SmartTableRecord:
 
     row_id: int
     values: Dict[str, Any]
+    version: int = 0
+
+
+@dataclass(slots=True)
+class _GroupRecord(_SmartTableRecord):
+    """Cabecera de grupo intercalada en la vista; ``row_id`` es negativo."""
+
+    group: Any = None
+    size: int = 0
+    collapsed: bool = False
+
+
+def _sort_value(value: Any) -> tuple[bool, Any]:
+    # Mismo criterio que el ordenamiento por registros: ``None`` al final.
+    return (value is None, value)
+
+
+def _value_family(value: Any) -> Optional[str]:
+    if value is None:
+        return "none"
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return None if value != value else "number"  # NaN no es ordenable
+    if isinstance(value, str):
+        return "str"
+    return None
+
+
+class _SortedColumnIndex:
+    """Índice ordenado de una columna que se actualiza de forma incremental.
+
+    Guarda ``((value is None, value), row_id, registro)`` ordenado, de modo que los
+    empates quedan en orden de carga como en el ordenamiento estable. Sirve
+    para ordenar sin comparar valores (recorrido del índice o rangos
+    densos) y para resolver filtros ``lt``/``lte``/``gt``/``gte`` por
+    bisección cuando la columna es homogénea.
+    """
+
+    __slots__ = ("key", "_entries", "_values", "_families", "_ranks")
+
+    def __init__(self, key: str, records: Iterable[_SmartTableRecord]) -> None:
+        self.key = key
+        self._values: Dict[int, Any] = {}
+        self._families: Dict[str, int] = {}
+        entries = []
+        for record in records:
+            value = record.values.get(key)
+            self._track(record.row_id, value)
+            entries.append((_sort_value(value), record.row_id, record))
+        entries.sort()  # TypeError si la columna no es ordenable
+        self._entries: List[tuple[tuple[bool, Any], int, _SmartTableRecord]] = entries
+        self._ranks: Optional[Dict[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, records: Sequence[_SmartTableRecord]) -> None:
+        new_entries = []
+        for record in records:
+            value = record.values.get(self.key)
+            self._track(record.row_id, value)
+            new_entries.append((_sort_value(value), record.row_id, record))
+        if len(new_entries) > 32:
+            # Timsort aprovecha los dos tramos ya ordenados.
+            self._entries.extend(new_entries)
+            self._entries.sort()
+        else:
+            for entry in new_entries:
+                bisect.insort(self._entries, entry)
+        self._ranks = None
+
+    def update(self, record: _SmartTableRecord) -> None:
+        old_value = self._values.get(record.row_id)
+        old_entry = (_sort_value(old_value), record.row_id)
+        position = bisect.bisect_left(self._entries, old_entry)
+        if position < len(self._entries) and self._entries[position][1] == record.row_id:
+            del self._entries[position]
+        self._untrack(old_value)
+        value = record.values.get(self.key)
+        self._track(record.row_id, value)
+        bisect.insort(self._entries, (_sort_value(value), record.row_id, record))
+        self._ranks = None
+
+    def ranks(self) -> Dict[int, int]:
+        """Rango denso de cada fila: valores iguales comparten rango."""
+
+        if self._ranks is None:
+            ranks: Dict[int, int] = {}
+            rank = -1
+            previous: Any = object()
+            for value, row_id, _ in self._entries:
+                if rank < 0 or value != previous:
+                    rank += 1
+                    previous = value
+                ranks[row_id] = rank
+            self._ranks = ranks
+        return self._ranks
+
+    def walk(self, ascending: bool) -> List[_SmartTableRecord]:
+        """Registros en orden; al descender los empates no se invierten."""
+
+        if ascending:
+            return [record for _, _, record in self._entries]
+        ordered: List[_SmartTableRecord] = []
+        end = len(self._entries)
+        while end > 0:
+            value = self._entries[end - 1][0]
+            start = bisect.bisect_left(self._entries, (value,), 0, end)
+            ordered.extend(record for _, _, record in self._entries[start:end])
+            end = start
+        return ordered
+
+    def range_ids(self, op: str, value: Any) -> Optional[set[int]]:
+        """``row_id`` que cumplen ``op value`` o ``None`` si no es aplicable."""
+
+        family = _value_family(value)
+        families = set(self._families) - {"none"}
+        if family in (None, "none") or families - {family}:
+            return None
+        entries = self._entries
+        bound = (False, value)
+        nulls = bisect.bisect_left(entries, ((True, None),))
+        if op == "lt":
+            selected = entries[: bisect.bisect_left(entries, (bound,))]
+        elif op == "lte":
+            selected = entries[: bisect.bisect_right(entries, (bound, math.inf))]
+        elif op == "gt":
+            selected = entries[bisect.bisect_right(entries, (bound, math.inf)) : nulls]
+        elif op == "gte":
+            selected = entries[bisect.bisect_left(entries, (bound,)) : nulls]
+        else:
+            return None
+        return {row_id for _, row_id, _ in selected}
+
+    def _track(self, row_id: int, value: Any) -> None:
+        self._values[row_id] = value
+        family = _value_family(value) or "other"
+        self._families[family] = self._families.get(family, 0) + 1
+
+    def _untrack(self, value: Any) -> None:
+        family = _value_family(value) or "other"
+        remaining = self._families.get(family, 0) - 1
+        if remaining > 0:
+            self._families[family] = remaining
+        else:
+            self._families.pop(family, None)
 
 
 # ---------------------------------------------------------------------------
@@ -226,6 +444,31 @@ def _default_cell(value: Any) -> ft.Control:
     return ft.Text("" if value is None else str(value))
 
 
+_NO_HIGHLIGHTS: Mapping[str, List[Span]] = MappingProxyType({})
+_NO_UPDATES: Mapping[str, Any] = MappingProxyType({})
+
+_HIGHLIGHT_STYLE = ft.TextStyle(
+    weight=ft.FontWeight.BOLD,
+    bgcolor=ft.Colors.with_opacity(0.2, ft.Colors.PRIMARY),
+)
+
+
+def _highlighted_cell(value: Any, spans: Sequence[Span]) -> ft.Control:
+    """Celda por defecto con los rangos de la búsqueda resaltados."""
+
+    text = str(value)
+    parts: List[ft.TextSpan] = []
+    cursor = 0
+    for start, end in spans:
+        if start > cursor:
+            parts.append(ft.TextSpan(text[cursor:start]))
+        parts.append(ft.TextSpan(text[start:end], style=_HIGHLIGHT_STYLE))
+        cursor = end
+    if cursor < len(text):
+        parts.append(ft.TextSpan(text[cursor:]))
+    return ft.Text(spans=parts)
+
+
 def _default_editor(
     value: Any,
     on_changed: Callable[[Any], None],
@@ -235,6 +478,68 @@ def _default_editor(
     return ft.TextField(value="" if value is None else str(value), on_change=lambda e: on_changed(e.control.value))
 
 
+_AGGREGATE_LABELS = {
+    "sum": "Suma",
+    "count": "Total",
+    "min": "Mín",
+    "max": "Máx",
+    "avg": "Media",
+    "distinct": "Distintos",
+}
+
+
+def _format_aggregate(kind: str, value: Any) -> str:
+    if value is None:
+        text = "—"
+    elif isinstance(value, float):
+        text = f"{value:,.2f}"
+    else:
+        text = str(value)
+    return f"{_AGGREGATE_LABELS[kind]}: {text}"
+
+
+_EXPORT_FORMATS = ("csv", "jsonl")
+
+
+def _encode_csv(rows: Iterable[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerows(rows)
+    return buffer.getvalue()
+
+
+def _encode_export_rows(
+    rows: Sequence[Mapping[str, Any]], keys: Sequence[str], format: str
+) -> str:
+    if format == "jsonl":
+        return "".join(
+            json.dumps({key: row.get(key) for key in keys}, ensure_ascii=False, default=str) + "\n"
+            for row in rows
+        )
+    return _encode_csv(
+        ["" if row.get(key) is None else row.get(key) for key in keys] for row in rows
+    )
+
+
+def _is_async_writer(target: Any) -> bool:
+    return isinstance(target, asyncio.StreamWriter) or inspect.iscoroutinefunction(
+        getattr(target, "write", None)
+    )
+
+
+def _open_export_target(target: Any) -> tuple[Any, bool]:
+    """Devuelve ``(flujo, propio)``; los flujos abiertos aquí se cierran al terminar."""
+
+    if isinstance(target, (str, os.PathLike)):
+        return open(target, "w", encoding="utf-8", newline=""), True
+    return target, False
+
+
+def _export_write(stream: Any, text: str) -> Any:
+    if isinstance(stream, (io.RawIOBase, io.BufferedIOBase, asyncio.StreamWriter)):
+        return stream.write(text.encode("utf-8"))
+    return stream.write(text)
+
+
 def _ensure_awaitable_result(result: Any) -> Awaitable:
     """Normaliza resultados de proveedores asíncronos."""
 
@@ -296,6 +601,29 @@ def _load_rust_backend():
 _SMART_TABLE_RS = _load_rust_backend()
 
 
+_SHARED_EXECUTORS: Dict[str, Executor] = {}
+_SHARED_EXECUTORS_LOCK = threading.Lock()
+
+
+def _shared_executor(kind: str) -> Executor:
+    """Pool compartido por todas las tablas para ``query_executor`` ``"thread"``/``"process"``."""
+
+    with _SHARED_EXECUTORS_LOCK:
+        executor = _SHARED_EXECUTORS.get(kind)
+        if executor is None:
+            if kind == "thread":
+                # Un único hilo: las consultas se serializan y las obsoletas en
+                # cola pueden cancelarse antes de empezar.
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smart-table")
+            else:
+                executor = ProcessPoolExecutor(max_workers=1)
+            _SHARED_EXECUTORS[kind] = executor
+        return executor
+
+
+_ALL_ROWS = object()
+
+
 class SmartTable:
     """Tabla enriquecida con virtualización, filtros y edición."""
 
@@ -313,7 +641,35 @@ class SmartTable:
         style: Optional[Style] = None,
         on_save: Optional[Callable[[MutableMapping[str, Any]], Union[None, Awaitable[None]]]] = None,
         auto_load: bool = True,
+        window_size: Optional[int] = None,
+        overscan: int = 10,
+        row_height: float = 48,
+        storage: str = "records",
+        pushdown: bool = False,
+        page_cache_size: int = 8,
+        prefetch_threshold: Optional[int] = None,
+        prefetch_pages: int = 1,
+        max_concurrent_loads: int = 2,
+        adaptive_page_size: bool = False,
+        target_load_latency: float = 0.25,
+        query_executor: Union[None, str, Executor] = None,
+        offload_threshold: int = 10_000,
+        show_computing: bool = True,
+        quick_search: bool = False,
+        group_by: Optional[str] = None,
+        show_footer: bool = True,
+        on_save_many: Optional[
+            Callable[[List[MutableMapping[str, Any]]], Union[None, Awaitable[None]]]
+        ] = None,
     ) -> None:
+        if window_size is not None and window_size < 1:
+            raise ValueError("window_size debe ser None o un entero mayor o igual a 1")
+        if row_height <= 0:
+            raise ValueError("row_height debe ser mayor que 0")
+        if storage not in {"records", "columnar"}:
+            raise ValueError("storage debe ser 'records' o 'columnar'")
+        if isinstance(query_executor, str) and query_executor not in {"thread", "process"}:
+            raise ValueError("query_executor debe ser None, 'thread', 'process' o un Executor")
         self.columns: List[SmartTableColumn] = [
             self._normalize_column(col) for col in columns
         ]
@@ -323,11 +679,60 @@ class SmartTable:
         self.total_rows = total_rows
         self.style = style
         self.on_save = on_save
+        self.on_save_many = on_save_many
         self.auto_load = auto_load
+        self.window_size = window_size
+        self.overscan = max(overscan, 0)
+        self.row_height = row_height
+        self.pushdown = pushdown and data_provider is not None
+        self.page_cache_size = max(page_cache_size, 0)
+        self.prefetch_threshold = prefetch_threshold
+        self.prefetch_pages = max(prefetch_pages, 1)
+        self.max_concurrent_loads = max(max_concurrent_loads, 1)
+        self.adaptive_page_size = adaptive_page_size
+        self.target_load_latency = target_load_latency
+        self.query_executor = query_executor
+        self.offload_threshold = max(offload_threshold, 0)
+        self.show_computing = show_computing
+        self.quick_search = quick_search
+        self.group_by = group_by
+        self.show_footer = show_footer
+        # ``True`` mientras una consulta se resuelve fuera del bucle de eventos.
+        self.computing: Signal[bool] = Signal(False)
 
         self._filters: Dict[str, SmartTableFilter] = {}
         self._sorts: List[SmartTableSort] = []
+        self._search_text = ""
         self._records: List[_SmartTableRecord] = []
+        self._records_by_id: Dict[int, _SmartTableRecord] = {}
+        self._store: Optional[ColumnarStore] = (
+            ColumnarStore() if storage == "columnar" else None
+        )
+        # ``TableHandle`` nativo: se crea en la primera consulta en Rust.
+        self._native_table: Any = None
+        self._native_table_failed = False
+        # Caché de resultados por consulta normalizada; se vacía al cambiar los datos.
+        self._query_cache: "OrderedDict[tuple[Any, Any], List[_SmartTableRecord]]" = OrderedDict()
+        self._query_cache_size = 8
+        self._query_cache_stats = {"hits": 0, "narrowed": 0, "resorted": 0, "misses": 0}
+        # Índices ordenados por columna, creados al ordenar o filtrar por rango.
+        self._sort_indexes: Dict[str, _SortedColumnIndex] = {}
+        self._unindexable: set[str] = set()
+        # Crece con cada alta, edición o recarga de filas locales.
+        self._data_version = 0
+        # Índice de trigramas para la búsqueda rápida, creado en la primera búsqueda.
+        self._search_index: Optional[SearchIndex] = None
+        self._search_version = 0
+        self._search_scores: Dict[int, float] = {}
+        self._search_scores_key: Optional[tuple[str, int]] = None
+        # Agregados de las filas visibles y cabeceras de grupo.
+        self._aggregates: Optional[AggregateIndex] = None
+        self._collapsed_groups: set[Any] = set()
+        self._group_ids: Dict[Any, int] = {}
+        self._aggregate_version = 0
+        self._footer_row: Optional[ft.DataRow] = None
+        # Progreso de ``export()``: ``(filas escritas, total o None si se desconoce)``.
+        self.export_progress: Signal[tuple[int, Optional[int]]] = Signal((0, None))
         self._next_row_id = 0
         self._exhausted = False
         self._editing_rows: set[int] = set()
@@ -335,6 +740,39 @@ class SmartTable:
         self._table: Optional[ft.DataTable] = None
         self._container: Optional[ft.Control] = None
         self._background_tasks: set[asyncio.Task[Any]] = set()
+        # Estado del renderizado por ventana
+        self._scroll_offset = 0.0
+        self._viewport_rows = window_size or 0
+        self._view_records: List[_SmartTableRecord] = []
+        self._window: tuple[int, int] = (0, 0)
+        # Caché de controles por fila y de cabeceras
+        self._row_cache: Dict[int, ft.DataRow] = {}
+        self._row_keys: Dict[int, tuple[int, int, bool, int, tuple[Any, ...]]] = {}
+        self._columns_version = 0
+        self._header_key: Optional[tuple[Any, ...]] = None
+        self._row_pool: List[ft.DataRow] = []
+        self._top_spacer: Optional[ft.Container] = None
+        self._bottom_spacer: Optional[ft.Container] = None
+        self._viewport: Optional[ft.Column] = None
+        # Delegación de consultas: páginas cacheadas por consulta y cargas en curso.
+        self._page_cache: "OrderedDict[Any, tuple[List[_SmartTableRecord], bool]]" = OrderedDict()
+        self._active_query_key: Any = self._page_key()
+        self._query_generation = 0
+        # Cargas en curso por offset inicial y páginas que esperan a las anteriores.
+        # Sin bucle de eventos, las precargas son ``Future`` del ejecutor compartido.
+        self._inflight_loads: Dict[int, tuple[int, Union[asyncio.Task[Any], Future[Any]]]] = {}
+        self._completed_pages: Dict[int, tuple[List[Any], int]] = {}
+        self._prefetching = False
+        self._load_latency: Optional[float] = None
+        self._min_page_size = max(self.page_size // 4, 1)
+        self._max_page_size = self.page_size * 8
+        # Consultas fuera del bucle: el cerrojo protege cachés e índices frente
+        # al hilo de trabajo y la generación descarta resultados obsoletos.
+        self._query_lock = threading.RLock()
+        self._compute_generation = 0
+        self._compute_future: Optional["asyncio.Future[Any]"] = None
+        self._computing_indicator: Optional[ft.ProgressBar] = None
+        self._search_field: Optional[ft.TextField] = None
 
         if rows:
             self._ingest_rows(rows)
@@ -350,23 +788,56 @@ class SmartTable:
     # API pública
     # ------------------------------------------------------------------
 
+    @property
+    def windowed(self) -> bool:
+        """Indica si solo se construyen las filas de la ventana visible."""
+
+        return self.window_size is not None
+
+    @property
+    def visible_range(self) -> tuple[int, int]:
+        """Rango ``[inicio, fin)`` de filas del resultado construidas como controles."""
+
+        if not self.windowed:
+            return (0, len(self._view_records))
+        return self._window
+
     def build(self) -> ft.Control:
         """Construye la tabla con filtros y acciones."""
 
         self._table = ft.DataTable(
             columns=self._build_columns(),
-            rows=self._build_rows_view(),
             heading_row_height=48,
             divider_thickness=1,
         )
+        self._header_key = self._columns_state()
+        if self.windowed:
+            # Con altura fija el desplazamiento se traduce directamente en índices.
+            self._table.data_row_min_height = self.row_height
+            self._table.data_row_max_height = self.row_height
+            self._top_spacer = ft.Container(height=0)
+            self._bottom_spacer = ft.Container(height=0)
+        self._table.rows = self._build_rows_view()
 
-        controls: List[ft.Control] = []
-        filters_row = self._build_filters_row()
-        if filters_row is not None:
-            controls.append(filters_row)
-        controls.append(self._table)
+        if self.windowed:
+            self._viewport = ft.Column(
+                [self._top_spacer, self._table, self._bottom_spacer],
+                spacing=0,
+                scroll=ft.ScrollMode.AUTO,
+                height=self._table.heading_row_height + self.row_height * (self.window_size or 0),
+                on_scroll=self._handle_scroll,
+            )
+        if self.query_executor is not None and self.show_computing:
+            self._computing_indicator = ft.ProgressBar(visible=self.computing.get())
+        if self.quick_search:
+            self._search_field = ft.TextField(
+                value=self._search_text,
+                hint_text="Buscar",
+                prefix_icon=ft.Icons.SEARCH,
+                on_change=lambda e: self.set_search(e.control.value or ""),
+            )
 
-        self._container = ft.Column(controls, spacing=12, expand=True)
+        self._container = ft.Column(self._container_controls(), spacing=12, expand=True)
         wrapped: ft.Control = self._container
         if self.style:
             wrapped = self.style.apply(wrapped)
@@ -377,22 +848,73 @@ class SmartTable:
 
         if self._table is None:
             return
-        self._table.columns = self._build_columns()
-        self._table.rows = self._build_rows_view()
-        updated = False
-        if self._container is not None:
-            try:
-                if self._container.page:
-                    self._container.update()
-                    updated = True
-            except RuntimeError:
-                pass
-        if not updated and self._table is not None:
-            try:
-                if self._table.page:
-                    self._table.update()
-            except RuntimeError:
-                pass
+        self._refresh_columns()
+        if self._should_offload():
+            self._offload_query()
+            return
+        self._compute_generation += 1
+        if self._compute_future is not None:
+            self._compute_future.cancel()
+            self._compute_future = None
+            self._set_computing(False)
+        self._show_records(self._query_records())
+
+    def _show_records(self, records: List[_SmartTableRecord]) -> None:
+        assert self._table is not None
+        self._table.rows = self._build_rows_view(records)
+        if not self._update_control(self._container):
+            self._update_control(self._table)
+        self._maybe_prefetch()
+
+    def query_cache_info(self) -> Dict[str, int]:
+        """Contadores de la caché de consultas y número de entradas guardadas."""
+
+        return {**self._query_cache_stats, "size": len(self._query_cache)}
+
+    def set_scroll_offset(self, offset: float) -> None:
+        """Desplaza la ventana de renderizado a ``offset`` píxeles.
+
+        Solo vuelve a construir las filas que entran en la ventana; las que
+        siguen visibles conservan sus controles y las que salen vuelven al
+        pool para reutilizarse. No recalcula filtros ni ordenamientos.
+        """
+
+        self._scroll_offset = max(float(offset), 0.0)
+        if not self.windowed or self._table is None:
+            return
+        self._drain_prefetched()
+        window = self._compute_window(len(self._view_records))
+        if window == self._window:
+            return
+        self._table.rows = self._materialize_window(window)
+        self._update_control(self._viewport or self._table)
+        self._maybe_prefetch()
+
+    def set_columns(
+        self, columns: Sequence[Union[SmartTableColumn, str, Mapping[str, Any]]]
+    ) -> None:
+        """Sustituye la configuración de columnas y reconstruye las filas."""
+
+        self.columns = [self._normalize_column(col) for col in columns]
+        self._columns_version += 1
+        if self._container is not None and self._table is not None:
+            self._container.controls = self._container_controls()
+        self.refresh()
+
+    def _container_controls(self) -> List[ft.Control]:
+        """Controles del contenedor principal, en el orden de :meth:`build`."""
+
+        assert self._table is not None
+        controls: List[ft.Control] = []
+        if self._search_field is not None:
+            controls.append(self._search_field)
+        filters_row = self._build_filters_row()
+        if filters_row is not None:
+            controls.append(filters_row)
+        if self._computing_indicator is not None:
+            controls.append(self._computing_indicator)
+        controls.append(self._viewport or self._table)
+        return controls
 
     def set_filter(self, key: str, value: Any, predicate: Optional[Callable[[Any, Any], bool]] = None) -> None:
         """Configura un filtro para la columna ``key``."""
@@ -401,18 +923,132 @@ class SmartTable:
         if column is None or not column.filterable:
             raise KeyError(f"La columna '{key}' no admite filtros")
 
-        self._filters[key] = SmartTableFilter(
-            key=key,
-            value=value,
-            predicate=predicate or _default_filter_predicate,
-        )
+        # Filtros y orden se sustituyen en lugar de mutarse: una consulta en
+        # curso en otro hilo sigue viendo un estado coherente.
+        self._filters = {
+            **self._filters,
+            key: SmartTableFilter(
+                key=key,
+                value=value,
+                predicate=predicate or _default_filter_predicate,
+            ),
+        }
+        self._on_query_changed()
         self.refresh()
 
+    def set_search(self, text: str) -> None:
+        """Aplica una búsqueda rápida sobre todas las columnas buscables.
+
+        Cada término separado por espacios debe aparecer en alguna columna
+        con ``search_weight`` mayor que cero, sin distinguir mayúsculas ni
+        acentos. Sin ordenamientos activos las filas se ordenan por la suma
+        de los pesos de las columnas que contienen cada término.
+        """
+
+        text = " ".join(text.split())
+        if text == self._search_text:
+            return
+        self._search_text = text
+        field = self._search_field
+        if field is not None and " ".join((field.value or "").split()) != text:
+            # Búsqueda aplicada por código: el campo refleja la consulta vigente.
+            field.value = text
+            self._update_control(field)
+        self._on_query_changed()
+        self.refresh()
+
+    def clear_search(self) -> None:
+        """Elimina la búsqueda rápida."""
+
+        self.set_search("")
+
+    def search_highlights(self, row_id: int) -> Dict[str, List[Span]]:
+        """Rangos ``(inicio, fin)`` que coinciden con la búsqueda en cada columna de la fila.
+
+        Pensado para ``cell_builder`` propios que quieran resaltar las
+        coincidencias; devuelve un diccionario vacío sin búsqueda activa.
+        """
+
+        return self._record_highlights(self._record(row_id))
+
+    def aggregates(self, group: Any = _ALL_ROWS) -> Dict[str, Any]:
+        """Resultados de los agregados declarados en las columnas.
+
+        Sin argumentos devuelve los totales de las filas visibles; con
+        ``group`` los de ese grupo. La clave ``"__size__"`` indica cuántas
+        filas incluye el resultado.
+        """
+
+        index = self._aggregate_index()
+        if index is None:
+            return {}
+        if self._table is None:
+            self._arrange_view(self._query_records())
+        if group is _ALL_ROWS:
+            return index.totals()
+        return index.groups().get(group, {})
+
+    def set_group_by(self, key: Optional[str]) -> None:
+        """Agrupa las filas por la columna ``key`` (``None`` desactiva la agrupación)."""
+
+        if key == self.group_by:
+            return
+        self.group_by = key
+        self._collapsed_groups.clear()
+        self._group_ids.clear()
+        self.refresh()
+
+    def toggle_group(self, group: Any) -> None:
+        """Pliega o despliega las filas del grupo ``group``."""
+
+        if group in self._collapsed_groups:
+            self._collapsed_groups.discard(group)
+        else:
+            self._collapsed_groups.add(group)
+        self.refresh()
+
+    def export(
+        self,
+        target: Union[str, "os.PathLike[str]", Any],
+        format: str = "csv",
+        *,
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+        max_sort_rows: Optional[int] = 100_000,
+    ) -> Union[int, Awaitable[int]]:
+        """Exporta las filas de la consulta actual a CSV o JSONL.
+
+        ``target`` es una ruta o un flujo abierto (de texto o binario); un
+        escritor asíncrono (``write`` como corutina o ``asyncio.StreamWriter``)
+        o un ``data_provider`` asíncrono hacen que se devuelva un awaitable.
+        Las filas se escriben en bloques de ``chunk_size`` en el orden de la
+        consulta y el progreso se publica en :attr:`export_progress`. Con
+        ``data_provider`` y filas por cargar se recorren sus páginas sin
+        conservarlas; devuelve el número de filas escritas.
+
+        La excepción es un orden sin ``pushdown``: el proveedor no ordena, así
+        que las filas filtradas se reúnen en memoria antes de escribirlas. Si
+        superan ``max_sort_rows`` (``None`` sin límite) se lanza
+        ``ValueError``.
+        """
+
+        if format not in _EXPORT_FORMATS:
+            raise ValueError(f"format debe ser uno de {', '.join(_EXPORT_FORMATS)}")
+        if max_sort_rows is not None and max_sort_rows < 1:
+            raise ValueError("max_sort_rows debe ser None o un entero positivo")
+        keys = list(columns) if columns is not None else [column.key for column in self.columns]
+        chunk_size = max(chunk_size, 1)
+        pages, total = self._export_pages(max_sort_rows)
+        if isinstance(pages, AsyncIterator) or _is_async_writer(target):
+            return self._export_async(target, pages, keys, format, chunk_size, total)
+        return self._export_sync(target, pages, keys, format, chunk_size, total)
+
     def clear_filter(self, key: str) -> None:
         """Elimina el filtro de una columna."""
 
         if key in self._filters:
-            self._filters.pop(key)
+            self._filters = {name: flt for name, flt in self._filters.items() if name != key}
+            self._on_query_changed()
             self.refresh()
 
     def toggle_sort(self, key: str, multi: bool = False) -> None:
@@ -425,20 +1061,25 @@ class SmartTable:
         existing = next((s for s in self._sorts if s.key == key), None)
         if existing:
             if existing.ascending:
-                existing.ascending = False
+                self._sorts = [
+                    SmartTableSort(key=key, ascending=False) if s is existing else s
+                    for s in self._sorts
+                ]
             else:
-                self._sorts.remove(existing)
+                self._sorts = [s for s in self._sorts if s is not existing]
         else:
-            if not multi:
-                self._sorts.clear()
-            self._sorts.append(SmartTableSort(key=key, ascending=True))
+            sorts = list(self._sorts) if multi else []
+            sorts.append(SmartTableSort(key=key, ascending=True))
+            self._sorts = sorts
+        self._on_query_changed()
         self.refresh()
 
     def clear_sorts(self) -> None:
         """Elimina todos los ordenamientos."""
 
         if self._sorts:
-            self._sorts.clear()
+            self._sorts = []
+            self._on_query_changed()
             self.refresh()
 
     def load_more(
@@ -458,54 +1099,32 @@ class SmartTable:
         if not self.virtualized or self._exhausted or self.data_provider is None:
             return None
 
+        self._drain_prefetched()
         start = len(self._records)
-        end = start + self.page_size
-
-        query = self._build_query()
-        result = self.data_provider(query, start, end)
-
-        if inspect.isawaitable(result) or isinstance(result, AsyncIterable):
-            awaitable = _ensure_awaitable_result(result)
-
-            async def consume_async() -> None:
-                batch = await awaitable
-                self._ingest_rows(batch)
-                if self.total_rows is not None and len(self._records) >= self.total_rows:
-                    self._exhausted = True
-                self.refresh()
-
-            if sync:
-                try:
-                    _run_async(consume_async())
-                except RuntimeError:
-                    if inspect.iscoroutine(awaitable):
-                        awaitable.close()
-                    raise
-                return None
-
-            try:
-                loop = asyncio.get_running_loop()
-            except RuntimeError:
-                return consume_async()
-
-            task = loop.create_task(consume_async())
-            self._attach_background_task(task, context="load_more")
-            return task
-
-        batch = list(result) if isinstance(result, Iterable) else []
-        self._ingest_rows(batch)
-        if self.total_rows is not None and len(self._records) >= self.total_rows:
-            self._exhausted = True
-        self.refresh()
-        return None
+        inflight = self._inflight_loads.get(start)
+        if inflight is not None and isinstance(inflight[1], Future):
+            return self._after_prefetch(inflight[1], sync=sync)
+        if inflight is not None and not sync:
+            # La página ya se está pidiendo (p. ej. por la precarga): se reutiliza.
+            return inflight[1]
+        return self._load_range(start, self.page_size, sync=sync, context="load_more")
 
     def start_edit(self, row_id: int) -> None:
         """Activa el modo edición para una fila."""
 
-        if row_id not in {record.row_id for record in self._records}:
-            raise KeyError(f"Fila '{row_id}' inexistente")
-        self._editing_rows.add(row_id)
-        self._edit_buffers.setdefault(row_id, {}).clear()
+        self.start_edits([row_id])
+
+    def start_edits(self, row_ids: Iterable[int]) -> None:
+        """Activa el modo edición para varias filas con un único refresco."""
+
+        ids = list(row_ids)
+        for row_id in ids:
+            self._record(row_id)
+        for row_id in ids:
+            self._editing_rows.add(row_id)
+            self._edit_buffers[row_id] = {}
+            # El búfer nuevo obliga a regenerar los editores aunque la fila ya estuviera en edición.
+            self._row_keys.pop(row_id, None)
         self.refresh()
 
     def cancel_edit(self, row_id: int) -> None:
@@ -518,24 +1137,15 @@ class SmartTable:
     def save_row(self, row_id: int) -> Optional[Awaitable[None]]:
         """Valida y guarda los cambios en una fila."""
 
-        record = next((r for r in self._records if r.row_id == row_id), None)
-        if record is None:
-            raise KeyError(f"Fila '{row_id}' inexistente")
-
+        record = self._record(row_id)
         updates = self._edit_buffers.get(row_id, {})
         if not updates:
             self.cancel_edit(row_id)
             return None
 
-        # Validaciones por columna
-        for column in self.columns:
-            if not column.editable or column.key not in updates:
-                continue
-            validator = column.validator
-            if validator:
-                validator(updates[column.key])
-
-        record.values.update(updates)
+        self._validate_updates(updates)
+        with self._query_lock:
+            self._apply_updates(record, updates)
         self._editing_rows.discard(row_id)
         self._edit_buffers.pop(row_id, None)
 
@@ -555,6 +1165,52 @@ class SmartTable:
         self.refresh()
         return None
 
+    def save_rows(self, row_ids: Optional[Iterable[int]] = None) -> Optional[Awaitable[None]]:
+        """Valida y guarda varias filas con un único callback y un único refresco.
+
+        Sin ``row_ids`` guarda todas las filas en edición. Se validan todas
+        antes de aplicar ninguna, así que un error de validación no deja el
+        lote a medias. Las filas guardadas se pasan juntas a
+        ``on_save_many``; si no está configurado se llama a ``on_save`` por
+        cada una. Las filas sin cambios solo salen del modo edición.
+        """
+
+        ids = sorted(self._editing_rows) if row_ids is None else list(row_ids)
+        records = [self._record(row_id) for row_id in ids]
+        changed = [
+            (record, self._edit_buffers[record.row_id])
+            for record in records
+            if self._edit_buffers.get(record.row_id)
+        ]
+        for _, updates in changed:
+            self._validate_updates(updates)
+
+        with self._query_lock:
+            for record, updates in changed:
+                self._apply_updates(record, updates)
+        for row_id in ids:
+            self._editing_rows.discard(row_id)
+            self._edit_buffers.pop(row_id, None)
+
+        saved = [record.values for record, _ in changed]
+        results: List[Any] = []
+        if saved and self.on_save_many is not None:
+            results.append(self.on_save_many(saved))
+        elif saved and self.on_save is not None:
+            results.extend(self.on_save(values) for values in saved)
+        pending = [result for result in results if inspect.isawaitable(result)]
+        if pending:
+
+            async def wait_and_refresh() -> None:
+                for awaitable in pending:
+                    await awaitable
+                self.refresh()
+
+            return wait_and_refresh()
+
+        self.refresh()
+        return None
+
     # ------------------------------------------------------------------
     # Métodos internos
     # ------------------------------------------------------------------
@@ -577,38 +1233,319 @@ class SmartTable:
 
         new_records: List[_SmartTableRecord] = []
         for item in rows:
-            if isinstance(item, ft.DataRow):
-                values = {
-                    column.key: _extract_value(cell.content)
-                    for column, cell in zip(self.columns, item.cells)
-                }
-            elif isinstance(item, Mapping):
-                values = dict(item)
-            else:
-                raise TypeError(
-                    "Cada fila debe ser Mapping[str, Any] o ft.DataRow"
-                )
-
-            record = _SmartTableRecord(row_id=self._next_row_id, values=values)
+            record = _SmartTableRecord(row_id=self._next_row_id, values=self._row_values(item))
             self._next_row_id += 1
             new_records.append(record)
 
-        self._records.extend(new_records)
+        with self._query_lock:
+            self._records.extend(new_records)
+            for record in new_records:
+                self._records_by_id[record.row_id] = record
+            self._data_version += 1
+            self._query_cache.clear()
+            for key, index in list(self._sort_indexes.items()):
+                try:
+                    index.add(new_records)
+                except TypeError:
+                    self._drop_sort_index(key)
+            if self._store is not None:
+                for record in new_records:
+                    self._store.append(record.row_id, record.values)
+            if self._search_index is not None:
+                self._search_index.add((record.row_id, record.values) for record in new_records)
+                self._search_version += 1
+            if self._native_table is not None:
+                self._sync_native_table(
+                    "append", [(record.row_id, record.values) for record in new_records]
+                )
+
+    def _row_values(self, item: Union[Mapping[str, Any], ft.DataRow]) -> Dict[str, Any]:
+        if isinstance(item, ft.DataRow):
+            return {
+                column.key: _extract_value(cell.content)
+                for column, cell in zip(self.columns, item.cells)
+            }
+        if isinstance(item, Mapping):
+            return dict(item)
+        raise TypeError(
+            "Cada fila debe ser Mapping[str, Any] o ft.DataRow"
+        )
 
-    def _build_rows_view(self) -> List[ft.DataRow]:
-        records = self._apply_query(self._records)
-        view: List[ft.DataRow] = []
+    def _record(self, row_id: int) -> _SmartTableRecord:
+        record = self._records_by_id.get(row_id)
+        if record is None:
+            raise KeyError(f"Fila '{row_id}' inexistente")
+        return record
+
+    def _validate_updates(self, updates: Mapping[str, Any]) -> None:
+        for column in self.columns:
+            if not column.editable or column.key not in updates:
+                continue
+            validator = column.validator
+            if validator:
+                validator(updates[column.key])
+
+    def _apply_updates(self, record: _SmartTableRecord, updates: Mapping[str, Any]) -> None:
+        """Aplica ``updates`` a ``record`` y mantiene cachés e índices; requiere ``_query_lock``."""
+
+        row_id = record.row_id
+        record.values.update(updates)
+        record.version += 1
+        self._data_version += 1
+        self._query_cache.clear()
+        for key, index in list(self._sort_indexes.items()):
+            try:
+                index.update(record)
+            except TypeError:
+                self._drop_sort_index(key)
+        if self._store is not None:
+            self._store.update(row_id)
+        if self._search_index is not None:
+            self._search_index.update(row_id, record.values)
+            self._search_version += 1
+        if self._aggregates is not None:
+            self._aggregates.update(row_id, record.values)
+        self._sync_native_table("update", row_id, record.values)
+
+    def _build_rows_view(
+        self, records: Optional[List[_SmartTableRecord]] = None
+    ) -> List[ft.DataRow]:
+        if records is None:
+            records = self._query_records()
+        records = self._arrange_view(records)
+        self._view_records = records
+        if self.windowed:
+            return self._materialize_window(self._compute_window(len(records)))
+        # Sin ventana, la caché se limita a las filas del resultado actual.
+        visible = {record.row_id for record in records}
+        for row_id in [row_id for row_id in self._row_cache if row_id not in visible]:
+            self._evict_row(row_id)
+        return self._with_footer([self._cached_row(record) for record in records], len(records))
+
+    def _aggregate_index(self) -> Optional[AggregateIndex]:
+        """Índice de agregados acorde a las columnas y la agrupación actuales."""
+
+        columns = {
+            column.key: column.aggregate for column in self.columns if column.aggregate
+        }
+        if not columns and self.group_by is None:
+            self._aggregates = None
+            return None
+        index = self._aggregates
+        if index is None or index.columns != columns or index.group_by != self.group_by:
+            for kind in columns.values():
+                if kind not in AGGREGATES:
+                    raise ValueError(
+                        f"Agregado '{kind}' no soportado; usa uno de {', '.join(AGGREGATES)}"
+                    )
+            index = AggregateIndex(columns, self.group_by)
+            self._aggregates = index
+        return index
+
+    def _arrange_view(self, records: List[_SmartTableRecord]) -> List[_SmartTableRecord]:
+        """Actualiza los agregados con ``records`` e intercala las cabeceras de grupo."""
+
+        index = self._aggregate_index()
+        if index is None:
+            self._footer_row = None
+            return records
+        index.sync((record.row_id, record.values) for record in records)
+        self._aggregate_version += 1
+        self._footer_row = None
+        if self.group_by is None:
+            return records
+
+        members: Dict[Any, List[_SmartTableRecord]] = {}
         for record in records:
-            row = self._build_row(record)
-            view.append(row)
-        return view
+            members.setdefault(index.group_of(record.row_id), []).append(record)
+        arranged: List[_SmartTableRecord] = []
+        for group, rows in members.items():
+            group_id = self._group_ids.get(group)
+            if group_id is None:
+                group_id = self._group_ids[group] = -len(self._group_ids) - 1
+            collapsed = group in self._collapsed_groups
+            arranged.append(
+                _GroupRecord(
+                    row_id=group_id,
+                    values={},
+                    version=self._aggregate_version,
+                    group=group,
+                    size=len(rows),
+                    collapsed=collapsed,
+                )
+            )
+            if not collapsed:
+                arranged.extend(rows)
+        return arranged
+
+    def _with_footer(self, rows: List[ft.DataRow], end: int) -> List[ft.DataRow]:
+        """Añade la fila de totales cuando la vista llega hasta la última fila."""
+
+        if (
+            not self.show_footer
+            or self._aggregates is None
+            or not self._aggregates.columns
+            or end < len(self._view_records)
+        ):
+            return rows
+        if self._footer_row is None:
+            self._footer_row = ft.DataRow(
+                cells=self._aggregate_cells(self._aggregates.totals(), ft.Text("Total")),
+                color=ft.Colors.with_opacity(0.05, ft.Colors.PRIMARY),
+            )
+        return rows + [self._footer_row]
 
-    def _build_row(self, record: _SmartTableRecord) -> ft.DataRow:
+    def _aggregate_cells(self, results: Mapping[str, Any], lead: ft.Control) -> List[ft.DataCell]:
+        cells: List[ft.DataCell] = []
+        for position, column in enumerate(self.columns):
+            if column.aggregate:
+                control: ft.Control = ft.Text(
+                    _format_aggregate(column.aggregate, results.get(column.key)),
+                    weight=ft.FontWeight.BOLD,
+                    text_align=column.alignment,
+                )
+            elif position == 0:
+                control = lead
+            else:
+                control = ft.Text("")
+            cells.append(ft.DataCell(control))
+        if any(column.editable for column in self.columns) or self.on_save:
+            cells.append(ft.DataCell(ft.Text("")))
+        return cells
+
+    def _fill_group_row(self, row: ft.DataRow, record: _GroupRecord) -> ft.DataRow:
+        assert self._aggregates is not None
+        results = self._aggregates.groups().get(record.group, {})
+        label = "(vacío)" if record.group is None else str(record.group)
+        lead = ft.Row(
+            [
+                ft.IconButton(
+                    icon=ft.Icons.CHEVRON_RIGHT if record.collapsed else ft.Icons.EXPAND_MORE,
+                    tooltip="Desplegar" if record.collapsed else "Plegar",
+                    on_click=lambda _=None, group=record.group: self.toggle_group(group),
+                ),
+                ft.Text(f"{label} ({record.size})", weight=ft.FontWeight.BOLD),
+            ],
+            spacing=4,
+        )
+        row.cells = self._aggregate_cells(results, lead)
+        row.selected = False
+        return row
+
+    def _compute_window(self, total: int) -> tuple[int, int]:
+        if total == 0:
+            return (0, 0)
+        visible = max(self.window_size or 0, self._viewport_rows)
+        first = min(int(self._scroll_offset // self.row_height), total - 1)
+        start = max(first - self.overscan, 0)
+        end = min(first + visible + self.overscan, total)
+        return (start, end)
+
+    def _materialize_window(self, window: tuple[int, int]) -> List[ft.DataRow]:
+        """Devuelve las filas de ``window`` reutilizando controles existentes.
+
+        La caché de filas se limita a la ventana: las que salen devuelven su
+        ``DataRow`` al pool y las que entran lo toman de ahí, regenerando
+        solo sus celdas.
+        """
+
+        start, end = window
+        records = self._view_records[start:end]
+        # Las filas que salen de la ventana se liberan antes de asignar las nuevas.
+        entering = {record.row_id for record in records}
+        for row_id in [row_id for row_id in self._row_cache if row_id not in entering]:
+            self._release_row(row_id)
+        rows = [self._cached_row(record) for record in records]
+        capacity = max(self.window_size or 0, self._viewport_rows) + 2 * self.overscan
+        del self._row_pool[capacity:]
+        self._window = window
+
+        if self._top_spacer is not None and self._bottom_spacer is not None:
+            self._top_spacer.height = start * self.row_height
+            self._bottom_spacer.height = (len(self._view_records) - end) * self.row_height
+        return self._with_footer(rows, end)
+
+    def _handle_scroll(self, event: Any) -> None:
+        viewport = getattr(event, "viewport_dimension", None)
+        if viewport:
+            self._viewport_rows = math.ceil(viewport / self.row_height)
+        self.set_scroll_offset(getattr(event, "pixels", 0.0) or 0.0)
+
+    def _update_control(self, control: Optional[ft.Control]) -> bool:
+        if control is None:
+            return False
+        try:
+            if control.page:
+                control.update()
+                return True
+        except RuntimeError:
+            pass
+        return False
+
+    def _row_highlights(self, record: _SmartTableRecord) -> Mapping[str, List[Span]]:
+        if (
+            not self._search_text
+            or isinstance(record, _GroupRecord)
+            or record.row_id in self._editing_rows
+        ):
+            return _NO_HIGHLIGHTS
+        return self._record_highlights(record) or _NO_HIGHLIGHTS
+
+    def _row_cache_key(
+        self, record: _SmartTableRecord, highlights: Mapping[str, List[Span]]
+    ) -> tuple[int, int, bool, int, tuple[Any, ...]]:
+        return (
+            record.row_id,
+            record.version,
+            record.row_id in self._editing_rows,
+            self._columns_version,
+            # Solo cuentan los resaltados de la propia fila: una búsqueda que
+            # no la toca no obliga a regenerarla.
+            tuple((key, tuple(spans)) for key, spans in highlights.items()),
+        )
+
+    def _cached_row(self, record: _SmartTableRecord) -> ft.DataRow:
+        """Reutiliza el ``DataRow`` de ``record`` si su clave no cambió."""
+
+        highlights = self._row_highlights(record)
+        key = self._row_cache_key(record, highlights)
+        row = self._row_cache.get(record.row_id)
+        if row is not None and self._row_keys.get(record.row_id) == key:
+            return row
+        if row is None:
+            row = self._row_pool.pop() if self._row_pool else ft.DataRow(cells=[])
+            self._row_cache[record.row_id] = row
+        self._fill_row(row, record, highlights)
+        self._row_keys[record.row_id] = key
+        return row
+
+    def _release_row(self, row_id: int) -> None:
+        row = self._row_cache.pop(row_id, None)
+        self._row_keys.pop(row_id, None)
+        if row is not None:
+            self._row_pool.append(row)
+
+    def _evict_row(self, row_id: int) -> None:
+        self._row_cache.pop(row_id, None)
+        self._row_keys.pop(row_id, None)
+
+    def _fill_row(
+        self,
+        row: ft.DataRow,
+        record: _SmartTableRecord,
+        highlights: Optional[Mapping[str, List[Span]]] = None,
+    ) -> ft.DataRow:
+        if isinstance(record, _GroupRecord):
+            return self._fill_group_row(row, record)
         cells: List[ft.DataCell] = []
         edit_mode = record.row_id in self._editing_rows
-        buffer = self._edit_buffers.setdefault(record.row_id, {})
+        values = record.values
+        if highlights is None:
+            highlights = self._row_highlights(record)
+        # Las filas sin editar no crean búfer ni cierres propios.
+        buffer = self._edit_buffers.setdefault(record.row_id, {}) if edit_mode else _NO_UPDATES
         for column in self.columns:
-            value = buffer.get(column.key, record.values.get(column.key))
+            value = buffer[column.key] if column.key in buffer else values.get(column.key)
             control: ft.Control
             if column.editable and edit_mode:
                 builder = column.editor_builder or _default_editor
@@ -618,8 +1555,14 @@ class SmartTable:
 
                 control = builder(value, on_changed)
             else:
-                builder = column.cell_builder or _default_cell
-                control = builder(value)
+                spans = highlights.get(column.key)
+                if spans and column.highlight_builder is not None:
+                    control = column.highlight_builder(value, spans)
+                elif spans and column.cell_builder is None and not isinstance(value, ft.Control):
+                    control = _highlighted_cell(value, spans)
+                else:
+                    builder = column.cell_builder or _default_cell
+                    control = builder(value)
 
             if column.alignment and isinstance(control, ft.Text):
                 control.text_align = column.alignment
@@ -647,11 +1590,19 @@ class SmartTable:
                 action_button = ft.IconButton(
                     icon=ft.Icons.EDIT,
                     tooltip="Editar",
-                    on_click=lambda _=None, row=record.row_id: self.start_edit(row),
+                    data=record.row_id,
+                    on_click=self._handle_edit_click,
                 )
             cells.append(ft.DataCell(action_button))
 
-        return ft.DataRow(cells=cells, selected=edit_mode)
+        row.cells = cells
+        row.selected = edit_mode
+        return row
+
+    def _handle_edit_click(self, event: Any) -> None:
+        row_id = getattr(getattr(event, "control", None), "data", None)
+        if row_id is not None:
+            self.start_edit(row_id)
 
     def _resolve_save(self, row_id: int) -> None:
         maybe = self.save_row(row_id)
@@ -706,6 +1657,8 @@ class SmartTable:
 
         def _on_done(done_task: asyncio.Task[Any]) -> None:
             self._background_tasks.discard(done_task)
+            if done_task.cancelled():
+                return
             try:
                 done_task.result()
             except Exception as exc:
@@ -719,22 +1672,786 @@ class SmartTable:
 
         task.add_done_callback(_on_done)
 
+    def _load_range(
+        self,
+        start: int,
+        size: int,
+        *,
+        sync: bool,
+        context: str,
+    ) -> Optional[Union[Awaitable[None], asyncio.Task[None]]]:
+        assert self.data_provider is not None
+        end = start + size
+        query = self._build_query()
+        generation = self._query_generation
+        started = time.perf_counter()
+        result = self.data_provider(query, start, end)
+
+        if inspect.isawaitable(result) or isinstance(result, AsyncIterable):
+            awaitable = _ensure_awaitable_result(result)
+
+            async def consume_async() -> None:
+                batch = await awaitable
+                if generation != self._query_generation:
+                    # La consulta cambió mientras se cargaba: el bloque ya no aplica.
+                    return
+                self._record_load_latency(time.perf_counter() - started)
+                self._complete_range(start, batch, size)
+
+            if sync:
+                try:
+                    _run_async(consume_async())
+                except RuntimeError:
+                    if inspect.iscoroutine(awaitable):
+                        awaitable.close()
+                    raise
+                return None
+
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return consume_async()
+
+            task = loop.create_task(consume_async())
+            self._attach_background_task(task, context=context)
+            self._inflight_loads[start] = (end, task)
+
+            def _on_load_done(done_task: asyncio.Task[None]) -> None:
+                current = self._inflight_loads.get(start)
+                if current is not None and current[1] is done_task:
+                    del self._inflight_loads[start]
+                # Cancelada antes de empezar, la corutina del proveedor nunca se esperó.
+                if done_task.cancelled() and inspect.iscoroutine(awaitable):
+                    awaitable.close()
+
+            task.add_done_callback(_on_load_done)
+            return task
+
+        batch = list(result) if isinstance(result, Iterable) else []
+        self._record_load_latency(time.perf_counter() - started)
+        self._complete_range(start, batch, size)
+        return None
+
+    def _complete_range(self, start: int, batch: Any, requested: int) -> None:
+        """Incorpora la página ``start`` y las siguientes que ya estuvieran listas.
+
+        Las precargas pueden terminar desordenadas: cada página espera a que
+        se hayan incorporado las anteriores para mantener el orden del
+        proveedor.
+        """
+
+        self._completed_pages[start] = (list(batch) if batch is not None else [], requested)
+        while not self._exhausted and len(self._records) in self._completed_pages:
+            rows, size = self._completed_pages.pop(len(self._records))
+            self._ingest_rows(rows)
+            if self.pushdown:
+                # Cada consulta tiene su propio total: una página incompleta es la última.
+                if len(rows) < size:
+                    self._exhausted = True
+            elif self.total_rows is not None and len(self._records) >= self.total_rows:
+                self._exhausted = True
+        loaded = len(self._records)
+        for offset in [offset for offset in self._completed_pages if self._exhausted or offset < loaded]:
+            del self._completed_pages[offset]
+        self.refresh()
+
+    def _record_load_latency(self, elapsed: float) -> None:
+        """Ajusta ``page_size`` según la latencia media del proveedor."""
+
+        if not self.adaptive_page_size:
+            return
+        if self._load_latency is None:
+            self._load_latency = elapsed
+        else:
+            self._load_latency = 0.7 * self._load_latency + 0.3 * elapsed
+        if self._load_latency < self.target_load_latency / 2:
+            self.page_size = min(self.page_size * 2, self._max_page_size)
+        elif self._load_latency > self.target_load_latency:
+            self.page_size = max(self.page_size // 2, self._min_page_size)
+
+    def _next_load_start(self) -> int:
+        return max([len(self._records)] + [end for end, _ in self._inflight_loads.values()])
+
+    def _maybe_prefetch(self) -> None:
+        """Pide en segundo plano las páginas siguientes si la ventana se acerca al final.
+
+        Con un bucle de eventos en marcha cada página es una tarea; sin él
+        (handlers síncronos de Flet) se piden en el ejecutor de hilos
+        compartido para no bloquear el desplazamiento.
+        """
+
+        if (
+            self.prefetch_threshold is None
+            or not self.windowed
+            or not self.virtualized
+            or self.data_provider is None
+            or self._prefetching
+        ):
+            return
+        if len(self._view_records) - self._window[1] > self.prefetch_threshold:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            running = False
+        else:
+            running = True
+        self._prefetching = True
+        try:
+            for _ in range(self.prefetch_pages):
+                if self._exhausted or len(self._inflight_loads) >= self.max_concurrent_loads:
+                    break
+                start = self._next_load_start()
+                if start in self._inflight_loads:
+                    break
+                if running:
+                    self._load_range(start, self.page_size, sync=False, context="prefetch")
+                else:
+                    self._prefetch_in_executor(start, self.page_size)
+        finally:
+            self._prefetching = False
+
+    def _prefetch_in_executor(self, start: int, size: int) -> None:
+        """Pide la página ``start`` en un hilo; las filas se incorporan en el hilo de la tabla.
+
+        El hilo solo llama al proveedor. El resultado se aplica con
+        :meth:`_drain_prefetched`, que se ejecuta en el bucle de la página si
+        la tabla está montada y, si no, en el siguiente desplazamiento o
+        ``load_more``.
+        """
+
+        assert self.data_provider is not None
+        provider = self.data_provider
+        end = start + size
+        query = self._build_query()
+        generation = self._query_generation
+
+        def fetch() -> Callable[[], None]:
+            started = time.perf_counter()
+            result = provider(query, start, end)
+            if inspect.isawaitable(result) or isinstance(result, AsyncIterable):
+                result = asyncio.run(_ensure_awaitable_result(result))
+            batch = list(result) if isinstance(result, Iterable) else []
+            elapsed = time.perf_counter() - started
+
+            def apply() -> None:
+                if generation != self._query_generation:
+                    # La consulta cambió mientras se cargaba: el bloque ya no aplica.
+                    return
+                self._record_load_latency(elapsed)
+                self._complete_range(start, batch, size)
+
+            return apply
+
+        future = _shared_executor("thread").submit(fetch)
+        self._inflight_loads[start] = (end, future)
+        loop = self._owner_loop()
+        if loop is not None:
+            future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._drain_prefetched))
+
+    def _drain_prefetched(self) -> None:
+        """Incorpora las precargas del ejecutor que ya terminaron."""
+
+        for start, (_, pending) in list(self._inflight_loads.items()):
+            if not isinstance(pending, Future) or not pending.done():
+                continue
+            if self._inflight_loads.get(start, (None, None))[1] is not pending:
+                continue
+            del self._inflight_loads[start]
+            try:
+                apply = pending.result()
+            except Exception:
+                logger.warning("Falló la precarga de SmartTable desde la fila %d", start, exc_info=True)
+                continue
+            apply()
+
+    def _after_prefetch(
+        self, pending: "Future[Callable[[], None]]", *, sync: bool
+    ) -> Optional[Union[Awaitable[None], asyncio.Task[None]]]:
+        """Encadena ``load_more`` tras la precarga del ejecutor que cubre la página siguiente.
+
+        Si la precarga falla, su error queda en el log y ``load_more`` vuelve
+        a pedir la página.
+        """
+
+        if sync:
+            wait([pending])
+            self._drain_prefetched()
+            return self.load_more(sync=True)
+
+        async def chained() -> None:
+            await asyncio.wait([asyncio.wrap_future(pending)])
+            self._drain_prefetched()
+            follow_up = self.load_more()
+            if follow_up is not None:
+                await follow_up
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return chained()
+        task = loop.create_task(chained())
+        self._attach_background_task(task, context="load_more")
+        return task
+
+    def _owner_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """Bucle de la página en la que está montada la tabla, si lo hay."""
+
+        try:
+            page = self._table.page if self._table is not None else None
+            return page.loop if page is not None else None
+        except (AttributeError, RuntimeError):
+            return None
+
+    def _query_key(self) -> Any:
+        """Clave normalizada de filtros y orden, o ``None`` si no es *hashable*."""
+
+        filters_key = tuple(
+            sorted(
+                ((key, flt.predicate, flt.value) for key, flt in self._filters.items()),
+                key=lambda item: item[0],
+            )
+        )
+        sorts_key = tuple((sort.key, sort.ascending) for sort in self._sorts)
+        try:
+            hash(filters_key)
+        except TypeError:
+            return None
+        return (filters_key, sorts_key)
+
+    def _page_key(self) -> Any:
+        """Clave de la caché de páginas: consulta normalizada más búsqueda."""
+
+        key = self._query_key()
+        return None if key is None else (key, self._search_text)
+
+    def _on_query_changed(self) -> None:
+        """Con ``pushdown`` cambia al conjunto de filas de la nueva consulta.
+
+        Guarda las páginas de la consulta anterior en una LRU, cancela sus
+        cargas en curso y recupera las páginas de la nueva si estaban en
+        caché; si no, reinicia la paginación pidiendo la primera página.
+        """
+
+        if not self.pushdown:
+            return
+        key = self._page_key()
+        if key is not None and key == self._active_query_key:
+            return
+
+        self._query_generation += 1
+        for _, task in list(self._inflight_loads.values()):
+            task.cancel()
+        self._inflight_loads.clear()
+        self._completed_pages.clear()
+
+        if self._active_query_key is not None and self.page_cache_size:
+            self._page_cache[self._active_query_key] = (self._records, self._exhausted)
+            self._page_cache.move_to_end(self._active_query_key)
+            while len(self._page_cache) > self.page_cache_size:
+                self._page_cache.popitem(last=False)
+
+        cached = self._page_cache.pop(key, None) if key is not None else None
+        self._active_query_key = key
+        with self._query_lock:
+            self._reset_local_indexes()
+            if cached is not None:
+                records, exhausted = cached
+                self._records = records
+                self._exhausted = exhausted
+                self._rebuild_local_indexes()
+                self._prune_row_cache()
+                return
+            self._records = []
+        self._prune_row_cache()
+        self._exhausted = False
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            running = False
+        else:
+            running = True
+        pending = self.load_more(sync=not running)
+        if pending is not None and not isinstance(pending, asyncio.Task):
+            self._resolve_async_result(pending, context="pushdown")
+
+    def _prune_row_cache(self) -> None:
+        """Descarta las filas cacheadas ajenas a la consulta activa y a la caché de páginas.
+
+        Cada consulta delegada asigna ``row_id`` nuevos, así que sin esta poda
+        los ``DataRow`` de consultas abandonadas se acumularían sin límite.
+        """
+
+        keep = {record.row_id for record in self._records}
+        for records, _ in self._page_cache.values():
+            keep.update(record.row_id for record in records)
+        for row_id in [row_id for row_id in self._row_cache if row_id not in keep]:
+            self._evict_row(row_id)
+
+    def _reset_local_indexes(self) -> None:
+        self._data_version += 1
+        self._query_cache.clear()
+        self._sort_indexes.clear()
+        self._unindexable.clear()
+        self._records_by_id = {}
+        self._search_index = None
+        self._search_scores_key = None
+        self._native_table = None
+        self._native_table_failed = False
+        if self._store is not None:
+            self._store = ColumnarStore()
+
+    def _rebuild_local_indexes(self) -> None:
+        self._records_by_id = {record.row_id: record for record in self._records}
+        if self._store is not None:
+            for record in self._records:
+                self._store.append(record.row_id, record.values)
+
+    def _query_records(self) -> List[_SmartTableRecord]:
+        """Resuelve la consulta actual reutilizando resultados anteriores.
+
+        Orden de preferencia: resultado idéntico en caché; resultado con los
+        mismos filtros y otro orden (solo se reordena); resultado de filtros
+        más amplios que los actuales (solo se filtra ese subconjunto); y, si
+        nada sirve, la consulta completa sobre todas las filas.
+        """
+
+        if self.pushdown:
+            # El proveedor ya devolvió las filas filtradas y ordenadas.
+            return list(self._records)
+        with self._query_lock:
+            return self._apply_search(self._query_records_locked())
+
+    def _apply_search(self, records: List[_SmartTableRecord]) -> List[_SmartTableRecord]:
+        """Conserva las filas que contienen la búsqueda y, sin orden explícito, las ordena por relevancia."""
+
+        if not self._search_text:
+            return records
+        scores = self._search_matches()
+        matched = [record for record in records if record.row_id in scores]
+        if not self._sorts:
+            # ``sort`` es estable: a igual puntuación se mantiene el orden de carga.
+            matched.sort(key=lambda record: -scores[record.row_id])
+        return matched
+
+    def _search_matches(self) -> Dict[int, float]:
+        with self._query_lock:
+            key = (self._search_text, self._search_version)
+            if self._search_scores_key != key:
+                self._search_scores = self._ensure_search_index().search(self._search_text)
+                self._search_scores_key = key
+            return self._search_scores
+
+    def _ensure_search_index(self) -> SearchIndex:
+        weights = {
+            column.key: column.search_weight
+            for column in self.columns
+            if column.search_weight > 0
+        }
+        index = self._search_index
+        if index is None or index.weights != weights:
+            index = SearchIndex(weights)
+            index.add((record.row_id, record.values) for record in self._records)
+            self._search_index = index
+            self._search_version += 1
+        return index
+
+    def _export_pages(
+        self, max_sort_rows: Optional[int] = None
+    ) -> tuple[Union[Iterator[List[Mapping[str, Any]]], AsyncIterator[List[Mapping[str, Any]]]], Optional[int]]:
+        """Páginas de valores a exportar y el total de filas si se conoce."""
+
+        if self.data_provider is None or self._exhausted:
+            records = self._query_records()
+            return iter([[record.values for record in records]]), len(records)
+        if self._export_sorts_locally() and max_sort_rows is not None:
+            # Sin filtros locales el total ya dice si cabe: falla antes de abrir el destino.
+            unfiltered = not self._filters and not split_terms(self._search_text)
+            if unfiltered and self.total_rows is not None and self.total_rows > max_sort_rows:
+                raise self._export_sort_limit_error(max_sort_rows)
+        else:
+            max_sort_rows = None
+        query = self._build_query()
+        size = self.page_size
+        first = self.data_provider(query, 0, size)
+        if inspect.isawaitable(first) or isinstance(first, AsyncIterable):
+            return self._provider_pages_async(query, size, first, max_sort_rows), None
+        return self._provider_pages(query, size, first, max_sort_rows), None
+
+    def _provider_pages(
+        self, query: SmartTableQuery, size: int, result: Any, max_sort_rows: Optional[int] = None
+    ) -> Iterator[List[Mapping[str, Any]]]:
+        assert self.data_provider is not None
+        pending: Optional[List[Mapping[str, Any]]] = [] if self._export_sorts_locally() else None
+        start = 0
+        while True:
+            batch = list(result) if isinstance(result, Iterable) else []
+            rows = self._export_filter(batch)
+            if pending is None:
+                yield rows
+            else:
+                self._export_buffer(pending, rows, max_sort_rows)
+            start += len(batch)
+            if self._export_last_page(len(batch), size, start):
+                break
+            result = self.data_provider(query, start, start + size)
+        if pending:
+            yield self._export_sort(pending)
+
+    async def _provider_pages_async(
+        self, query: SmartTableQuery, size: int, result: Any, max_sort_rows: Optional[int] = None
+    ) -> AsyncIterator[List[Mapping[str, Any]]]:
+        assert self.data_provider is not None
+        pending: Optional[List[Mapping[str, Any]]] = [] if self._export_sorts_locally() else None
+        start = 0
+        while True:
+            if inspect.isawaitable(result) or isinstance(result, AsyncIterable):
+                batch = list(await _ensure_awaitable_result(result) or [])
+            else:
+                batch = list(result) if isinstance(result, Iterable) else []
+            rows = self._export_filter(batch)
+            if pending is None:
+                yield rows
+            else:
+                self._export_buffer(pending, rows, max_sort_rows)
+            start += len(batch)
+            if self._export_last_page(len(batch), size, start):
+                break
+            result = self.data_provider(query, start, start + size)
+        if pending:
+            yield self._export_sort(pending)
+
+    def _export_buffer(
+        self,
+        pending: List[Mapping[str, Any]],
+        rows: List[Mapping[str, Any]],
+        max_sort_rows: Optional[int],
+    ) -> None:
+        pending.extend(rows)
+        if max_sort_rows is not None and len(pending) > max_sort_rows:
+            pending.clear()
+            raise self._export_sort_limit_error(max_sort_rows)
+
+    @staticmethod
+    def _export_sort_limit_error(max_sort_rows: int) -> ValueError:
+        return ValueError(
+            f"La exportación ordenada en local supera max_sort_rows ({max_sort_rows} filas): "
+            "activa pushdown para que el data_provider ordene, quita el orden o aumenta max_sort_rows"
+        )
+
+    def _export_last_page(self, received: int, size: int, loaded: int) -> bool:
+        if received < size:
+            return True
+        return not self.pushdown and self.total_rows is not None and loaded >= self.total_rows
+
+    def _export_sorts_locally(self) -> bool:
+        # Sin delegación el orden se aplica en local y exige reunir las filas filtradas.
+        return not self.pushdown and bool(self._sorts)
+
+    def _export_filter(self, batch: Sequence[Any]) -> List[Mapping[str, Any]]:
+        rows = [self._row_values(item) for item in batch]
+        if self.pushdown:
+            return rows
+        filters = list(self._filters.values())
+        terms = split_terms(self._search_text)
+        keys = [column.key for column in self.columns if column.search_weight > 0]
+        return [
+            values
+            for values in rows
+            if all(flt.matches(values.get(flt.key)) for flt in filters)
+            and all(
+                any(term in normalize_text(values.get(key)) for key in keys) for term in terms
+            )
+        ]
+
+    def _export_sort(self, rows: List[Mapping[str, Any]]) -> List[Mapping[str, Any]]:
+        for sort in reversed(self._sorts):
+            rows.sort(
+                key=lambda values, key=sort.key: (values.get(key) is None, values.get(key)),
+                reverse=not sort.ascending,
+            )
+        return rows
+
+    def _export_sync(
+        self,
+        target: Any,
+        pages: Iterable[List[Mapping[str, Any]]],
+        keys: Sequence[str],
+        format: str,
+        chunk_size: int,
+        total: Optional[int],
+    ) -> int:
+        stream, owned = _open_export_target(target)
+        written = 0
+        self.export_progress.set((0, total))
+        try:
+            if format == "csv":
+                _export_write(stream, _encode_csv([keys]))
+            for page in pages:
+                for offset in range(0, len(page), chunk_size):
+                    chunk = page[offset : offset + chunk_size]
+                    _export_write(stream, _encode_export_rows(chunk, keys, format))
+                    written += len(chunk)
+                    self.export_progress.set((written, total))
+        finally:
+            if owned:
+                stream.close()
+        return written
+
+    async def _export_async(
+        self,
+        target: Any,
+        pages: Union[Iterable[List[Mapping[str, Any]]], AsyncIterator[List[Mapping[str, Any]]]],
+        keys: Sequence[str],
+        format: str,
+        chunk_size: int,
+        total: Optional[int],
+    ) -> int:
+        stream, owned = _open_export_target(target)
+        written = 0
+        self.export_progress.set((0, total))
+
+        async def emit(text: str) -> None:
+            maybe = _export_write(stream, text)
+            if inspect.isawaitable(maybe):
+                await maybe
+            drain = getattr(stream, "drain", None)
+            if drain is not None:
+                await drain()
+
+        async def iterate() -> AsyncIterator[List[Mapping[str, Any]]]:
+            if isinstance(pages, AsyncIterator):
+                async for page in pages:
+                    yield page
+            else:
+                for page in pages:
+                    yield page
+
+        try:
+            if format == "csv":
+                await emit(_encode_csv([keys]))
+            async for page in iterate():
+                for offset in range(0, len(page), chunk_size):
+                    chunk = page[offset : offset + chunk_size]
+                    await emit(_encode_export_rows(chunk, keys, format))
+                    written += len(chunk)
+                    self.export_progress.set((written, total))
+        finally:
+            if owned:
+                stream.close()
+        return written
+
+    def _record_highlights(self, record: _SmartTableRecord) -> Dict[str, List[Span]]:
+        if not self._search_text:
+            return {}
+        terms = split_terms(self._search_text)
+        result: Dict[str, List[Span]] = {}
+        for column in self.columns:
+            if column.search_weight <= 0:
+                continue
+            value = record.values.get(column.key)
+            if value is None or isinstance(value, ft.Control):
+                continue
+            spans = highlight_spans(value, terms)
+            if spans:
+                result[column.key] = spans
+        return result
+
+    def _query_records_locked(self) -> List[_SmartTableRecord]:
+        query_key = self._query_key()
+        if query_key is None:
+            return self._apply_query(self._records)
+        filters_key, sorts_key = query_key
+
+        cached = self._query_cache.get(query_key)
+        if cached is not None:
+            self._query_cache.move_to_end(query_key)
+            self._query_cache_stats["hits"] += 1
+            return cached
+
+        base: Optional[List[_SmartTableRecord]] = None
+        base_sorts: Any = None
+        for (cached_filters, cached_sorts), result in self._query_cache.items():
+            if cached_filters == filters_key:
+                stat = "resorted"
+            elif self._narrows_cached(cached_filters):
+                stat = "narrowed"
+            else:
+                continue
+            if base is None or len(result) < len(base):
+                base, base_sorts, base_stat = result, cached_sorts, stat
+
+        if base is None:
+            self._query_cache_stats["misses"] += 1
+            result = self._apply_query(self._records)
+        else:
+            self._query_cache_stats[base_stat] += 1
+            if base_sorts != sorts_key:
+                # Los ``row_id`` crecen con el orden de carga: así se recupera el
+                # orden original y el ordenamiento estable da el mismo resultado.
+                base = sorted(base, key=lambda record: record.row_id)
+            result = self._apply_query(base)
+
+        if self._query_key() != query_key:
+            # Los filtros cambiaron durante una consulta fuera del bucle.
+            return result
+        self._query_cache[query_key] = result
+        while len(self._query_cache) > self._query_cache_size:
+            self._query_cache.popitem(last=False)
+        return result
+
+    def _narrows_cached(self, cached_filters: tuple[Any, ...]) -> bool:
+        for key, predicate, value in cached_filters:
+            current = self._filters.get(key)
+            if current is None:
+                return False
+            old = SmartTableFilter(key=key, value=value, predicate=predicate)
+            if not _filter_narrows(current, old):
+                return False
+        return True
+
+    def _should_offload(self) -> bool:
+        if self.query_executor is None or self.pushdown:
+            return False
+        if len(self._records) < self.offload_threshold:
+            return False
+        query_key = self._query_key()
+        if query_key is not None and query_key in self._query_cache:
+            # Un acierto de caché es inmediato: no compensa salir del bucle.
+            return False
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+
+    def _offload_query(self) -> None:
+        """Resuelve la consulta en el ejecutor y muestra el resultado al terminar.
+
+        Mientras tanto se conservan las filas anteriores y ``computing`` vale
+        ``True``. Cada consulta nueva incrementa la generación: los resultados
+        de consultas sustituidas se descartan y, si aún no habían empezado, se
+        cancelan.
+        """
+
+        loop = asyncio.get_running_loop()
+        self._compute_generation += 1
+        generation = self._compute_generation
+        if self._compute_future is not None:
+            self._compute_future.cancel()
+
+        executor = self.query_executor
+        if isinstance(executor, str):
+            executor = _shared_executor(executor)
+        job = self._process_query_job() if isinstance(executor, ProcessPoolExecutor) else None
+        if job is not None:
+            records, query_key, version, args = job
+            future = loop.run_in_executor(executor, run_query, *args)
+        else:
+            if isinstance(executor, ProcessPoolExecutor):
+                executor = _shared_executor("thread")
+            future = loop.run_in_executor(executor, self._query_records)
+        self._compute_future = future
+        self._set_computing(True)
+
+        async def consume() -> None:
+            try:
+                result = await future
+            except asyncio.CancelledError:
+                return
+            finally:
+                if generation == self._compute_generation:
+                    self._compute_future = None
+                    self._set_computing(False)
+            if generation != self._compute_generation or self._table is None:
+                return
+            if job is not None:
+                if result is None:
+                    result = self._query_records()
+                else:
+                    result = [records[position] for position in result]
+                    with self._query_lock:
+                        stale = version != self._data_version
+                        if not stale and query_key not in self._query_cache:
+                            self._query_cache[query_key] = result
+                    if stale:
+                        # Las filas cambiaron durante la consulta: las posiciones ya no valen.
+                        result = self._query_records()
+                    else:
+                        result = self._apply_search(result)
+            self._show_records(result)
+
+        task = loop.create_task(consume())
+        self._attach_background_task(task, context="consulta")
+
+    def _process_query_job(self) -> Optional[tuple[List[_SmartTableRecord], Any, int, tuple[Any, ...]]]:
+        """Prepara la consulta columnar para un pool de procesos.
+
+        Solo se envían las columnas implicadas, copiadas con :meth:`ColumnarStore.detach`.
+        Sin almacén columnar o con filtros no serializables (predicados
+        propios definidos como ``lambda``) devuelve ``None`` y la consulta se
+        resuelve en un hilo.
+        """
+
+        query_key = self._query_key()
+        if self._store is None or query_key is None:
+            return None
+        filters = [
+            (flt, _RUST_FILTER_OPERATORS.get(flt.predicate)) for flt in self._filters.values()
+        ]
+        sorts = list(self._sorts)
+        try:
+            pickle.dumps(filters)
+        except Exception:
+            return None
+        with self._query_lock:
+            store = self._store.detach(
+                [flt.key for flt, _ in filters] + [sort.key for sort in sorts]
+            )
+            records = list(self._records)
+            version = self._data_version
+        if store is None:
+            return None
+        return records, query_key, version, (store, filters, sorts)
+
+    def _set_computing(self, value: bool) -> None:
+        self.computing.set(value)
+        indicator = self._computing_indicator
+        if indicator is not None and indicator.visible != value:
+            indicator.visible = value
+            self._update_control(indicator)
+
     def _apply_query(
         self, records: Sequence[_SmartTableRecord]
     ) -> List[_SmartTableRecord]:
+        if self._store is not None and records is self._records:
+            positions = self._store.query(
+                [
+                    (flt, _RUST_FILTER_OPERATORS.get(flt.predicate))
+                    for flt in self._filters.values()
+                ],
+                self._sorts,
+            )
+            if positions is not None:
+                return [records[position] for position in positions]
+
         rust_filters, py_filters = self._serialize_filters_for_rust()
         rust_sorts = [
             {"key": sort.key, "ascending": sort.ascending}
             for sort in self._sorts
         ]
         if _SMART_TABLE_RS is not None and (rust_filters or rust_sorts):
-            payload = [(record.row_id, record.values) for record in records]
+            handle = self._native_table_handle() if records is self._records else None
             try:
-                if not py_filters and getattr(_SMART_TABLE_RS, "apply_query_ids", None):
+                if handle is not None:
+                    ordered_ids = handle.query(rust_filters, rust_sorts)
+                elif not py_filters and getattr(_SMART_TABLE_RS, "apply_query_ids", None):
+                    payload = [(record.row_id, record.values) for record in records]
                     ordered_ids = _SMART_TABLE_RS.apply_query_ids(
                         payload, rust_filters, rust_sorts
                     )
                 else:
+                    payload = [(record.row_id, record.values) for record in records]
                     ordered_ids = _SMART_TABLE_RS.apply_query(
                         payload, rust_filters, rust_sorts
                     )
@@ -742,7 +2459,11 @@ class SmartTable:
                 ordered_ids = None
             else:
                 if ordered_ids is not None:
-                    index = {record.row_id: record for record in records}
+                    index = (
+                        self._records_by_id
+                        if records is self._records
+                        else {record.row_id: record for record in records}
+                    )
                     ordered_records = [
                         index[row_id] for row_id in ordered_ids if row_id in index
                     ]
@@ -756,6 +2477,34 @@ class SmartTable:
 
         return self._apply_query_py(records)
 
+    def _native_table_handle(self) -> Any:
+        """Devuelve el ``TableHandle`` nativo, ingiriendo las filas la primera vez."""
+
+        if self._native_table is None and not self._native_table_failed:
+            handle_cls = getattr(_SMART_TABLE_RS, "TableHandle", None)
+            if handle_cls is None:
+                self._native_table_failed = True
+                return None
+            try:
+                handle = handle_cls()
+                handle.ingest([(record.row_id, record.values) for record in self._records])
+            except Exception:
+                self._native_table_failed = True
+                return None
+            self._native_table = handle
+        return self._native_table
+
+    def _sync_native_table(self, method: str, *args: Any) -> None:
+        if self._native_table is None:
+            return
+        try:
+            getattr(self._native_table, method)(*args)
+        except Exception:
+            # Un handle desincronizado daría resultados erróneos: se descarta
+            # y las consultas vuelven a serializar las filas.
+            self._native_table = None
+            self._native_table_failed = True
+
     def _serialize_filters_for_rust(
         self,
     ) -> tuple[List[Dict[str, Any]], List[SmartTableFilter]]:
@@ -783,21 +2532,54 @@ class SmartTable:
             ]
         return filtered_records
 
+    def _sort_index(self, key: str) -> Optional[_SortedColumnIndex]:
+        index = self._sort_indexes.get(key)
+        if index is None and key not in self._unindexable:
+            try:
+                index = _SortedColumnIndex(key, self._records)
+            except TypeError:
+                self._unindexable.add(key)
+                return None
+            self._sort_indexes[key] = index
+        return index
+
+    def _drop_sort_index(self, key: str) -> None:
+        self._sort_indexes.pop(key, None)
+        self._unindexable.add(key)
+
     def _apply_query_py(
         self, records: Sequence[_SmartTableRecord]
     ) -> List[_SmartTableRecord]:
-        filtered = [
-            record
-            for record in records
-            if all(
-                flt.matches(record.values.get(key))
-                for key, flt in self._filters.items()
-            )
-        ]
+        range_sets: List[set[int]] = []
+        predicate_filters: List[SmartTableFilter] = []
+        for flt in self._filters.values():
+            op = _RUST_FILTER_OPERATORS.get(flt.predicate)
+            ids = None
+            if op in ("lt", "lte", "gt", "gte") and flt.value not in (None, ""):
+                index = self._sort_index(flt.key)
+                if index is not None:
+                    ids = index.range_ids(op, flt.value)
+            if ids is None:
+                predicate_filters.append(flt)
+            else:
+                range_sets.append(ids)
+        range_sets.sort(key=len)
+
+        filtered = list(records)
+        for ids in range_sets:
+            filtered = [record for record in filtered if record.row_id in ids]
+        for flt in predicate_filters:
+            filtered = [
+                record for record in filtered if flt.matches(record.values.get(flt.key))
+            ]
 
         if not self._sorts:
             return filtered
 
+        indexes = [self._sort_index(sort.key) for sort in self._sorts]
+        if all(index is not None for index in indexes):
+            return self._sort_with_indexes(filtered, indexes)  # type: ignore[arg-type]
+
         def sort_key_factory(sort: SmartTableSort) -> Callable[[
             _SmartTableRecord
         ], Any]:
@@ -813,6 +2595,54 @@ class SmartTable:
             sorted_records.sort(key=key_fn, reverse=not sort.ascending)
         return sorted_records
 
+    def _refresh_columns(self) -> None:
+        """Reconstruye las cabeceras solo si cambió el orden o las columnas."""
+
+        if self._table is None:
+            return
+        key = self._columns_state()
+        if key == self._header_key:
+            return
+        self._table.columns = self._build_columns()
+        self._header_key = key
+
+    def _columns_state(self) -> tuple[Any, ...]:
+        return (
+            tuple((sort.key, sort.ascending) for sort in self._sorts),
+            self._columns_version,
+            self.on_save is not None,
+        )
+
+    def _sort_with_indexes(
+        self,
+        records: Sequence[_SmartTableRecord],
+        indexes: Sequence[_SortedColumnIndex],
+    ) -> List[_SmartTableRecord]:
+        """Ordena ``records`` con los índices de columna sin comparar valores.
+
+        Con un único criterio y una selección grande se recorre el índice;
+        en otro caso se ordena por los rangos densos (negados al descender),
+        con el ``row_id`` como desempate igual que el ordenamiento estable.
+        """
+
+        if len(indexes) == 1 and len(records) * 4 >= len(indexes[0]):
+            ordered = indexes[0].walk(self._sorts[0].ascending)
+            if len(records) == len(ordered):
+                return ordered
+            members = {record.row_id for record in records}
+            return [record for record in ordered if record.row_id in members]
+        rank_maps = [
+            (index.ranks(), 1 if sort.ascending else -1)
+            for index, sort in zip(indexes, self._sorts)
+        ]
+        return sorted(
+            records,
+            key=lambda record: (
+                *(sign * ranks[record.row_id] for ranks, sign in rank_maps),
+                record.row_id,
+            ),
+        )
+
     def _build_columns(self) -> List[ft.DataColumn]:
         columns: List[ft.DataColumn] = []
         for column in self.columns:
@@ -881,7 +2711,12 @@ class SmartTable:
         return handler
 
     def _build_query(self) -> SmartTableQuery:
-        return SmartTableQuery(filters=dict(self._filters), sorts=list(self._sorts))
+        return SmartTableQuery(
+            filters=dict(self._filters),
+            sorts=list(self._sorts),
+            search=self._search_text,
+            search_columns=tuple(column.key for column in self.columns if column.search_weight > 0),
+        )
 
     def _find_column(self, key: str) -> Optional[SmartTableColumn]:
         return next((column for column in self.columns if column.key == key), None)
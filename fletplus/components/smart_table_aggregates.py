@@ -0,0 +1,316 @@
+"""Agregados incrementales para ``SmartTable``.
+
+:class:`AggregateIndex` mantiene los agregados declarados por columna
+(``sum``, ``count``, ``min``, ``max``, ``avg`` y ``distinct``) sobre las
+filas visibles, en total y por grupo. Al cambiar el resultado de la
+consulta solo procesa la diferencia entre el conjunto anterior y el nuevo;
+las ediciones restan el valor previo de la fila y suman el nuevo.
+
+Las sumas también son incrementales y exactas: los enteros se acumulan
+como ``int`` y los decimales en sumas parciales sin solapamiento (el
+algoritmo de :func:`math.fsum`), así que las altas y bajas repetidas no
+acumulan error.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Any, Dict, Hashable, Iterable, Mapping, Optional, Tuple
+
+AGGREGATES = ("sum", "count", "min", "max", "avg", "distinct")
+
+_EXTREME_UNKNOWN = object()
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _ExactFloatSum:
+    """Suma de ``float`` que admite restas sin perder precisión.
+
+    Guarda sumas parciales sin solapamiento (Shewchuk), como
+    :func:`math.fsum`; restar es sumar el opuesto. Los infinitos y ``NaN``
+    se cuentan aparte para poder retirarlos.
+    """
+
+    __slots__ = ("partials", "positive_inf", "negative_inf", "nan")
+
+    def __init__(self) -> None:
+        self.partials: list[float] = []
+        self.positive_inf = 0
+        self.negative_inf = 0
+        self.nan = 0
+
+    def add(self, value: float, sign: int = 1) -> None:
+        if value != value:
+            self.nan += sign
+            return
+        if value in (math.inf, -math.inf):
+            if value > 0:
+                self.positive_inf += sign
+            else:
+                self.negative_inf += sign
+            return
+        x = value if sign > 0 else -value
+        partials = self.partials
+        used = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            high = x + y
+            low = y - (high - x)
+            if low:
+                partials[used] = low
+                used += 1
+            x = high
+        partials[used:] = [x]
+
+    def value(self, extra: int = 0) -> float:
+        if self.nan or (self.positive_inf and self.negative_inf):
+            return math.nan
+        if self.positive_inf:
+            return math.inf
+        if self.negative_inf:
+            return -math.inf
+        return math.fsum([*self.partials, extra])
+
+
+def _value_key(value: Any) -> Tuple[type, Any]:
+    # ``True``, ``1`` y ``1.0`` son iguales para un dict pero no son el mismo valor.
+    return (type(value), value)
+
+
+class RunningAggregate:
+    """Acumulador que admite altas y bajas de valores."""
+
+    __slots__ = ("count", "numeric", "values", "_integral", "_floats", "_fractional", "_min", "_max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.numeric = 0
+        # Claves ``(tipo, valor)`` con sus repeticiones.
+        self.values: Counter[Tuple[type, Any]] = Counter()
+        self._integral = 0
+        self._floats = 0
+        self._fractional = _ExactFloatSum()
+        self._min: Any = None
+        self._max: Any = None
+
+    @property
+    def total(self) -> float:
+        """Suma de los valores numéricos; ``int`` mientras no haya decimales."""
+
+        if not self._floats:
+            return self._integral
+        return self._fractional.value(self._integral)
+
+    def _accumulate(self, value: Any, sign: int) -> None:
+        # Las subclases (``IntEnum``, escalares propios) suman como su base.
+        if isinstance(value, float):
+            self._floats += sign
+            self._fractional.add(float(value), sign)
+        else:
+            self._integral += sign * int(value)
+
+    def add(self, value: Any) -> None:
+        if value is None:
+            return
+        self.count += 1
+        if _is_number(value):
+            self.numeric += 1
+            self._accumulate(value, 1)
+        try:
+            self.values[_value_key(value)] += 1
+        except TypeError:
+            return
+        if self._min is not _EXTREME_UNKNOWN and (self._min is None or _lt(value, self._min)):
+            self._min = value
+        if self._max is not _EXTREME_UNKNOWN and (self._max is None or _lt(self._max, value)):
+            self._max = value
+
+    def remove(self, value: Any) -> None:
+        if value is None:
+            return
+        self.count -= 1
+        if _is_number(value):
+            self.numeric -= 1
+            self._accumulate(value, -1)
+        key = _value_key(value)
+        try:
+            remaining = self.values[key] - 1
+        except TypeError:
+            return
+        if remaining > 0:
+            self.values[key] = remaining
+            return
+        del self.values[key]
+        # Al desaparecer un extremo se recalcula bajo demanda sobre los valores distintos.
+        if self._min is not _EXTREME_UNKNOWN and value == self._min:
+            self._min = _EXTREME_UNKNOWN
+        if self._max is not _EXTREME_UNKNOWN and value == self._max:
+            self._max = _EXTREME_UNKNOWN
+
+    def result(self, kind: str) -> Any:
+        if kind == "count":
+            return self.count
+        if kind == "sum":
+            return self.total
+        if kind == "avg":
+            return self.total / self.numeric if self.numeric else None
+        if kind == "distinct":
+            return len(self.values)
+        if kind == "min":
+            if self._min is _EXTREME_UNKNOWN:
+                self._min = _extreme((value for _, value in self.values), min)
+            return self._min
+        if kind == "max":
+            if self._max is _EXTREME_UNKNOWN:
+                self._max = _extreme((value for _, value in self.values), max)
+            return self._max
+        raise ValueError(f"Agregado '{kind}' no soportado")
+
+
+def _lt(left: Any, right: Any) -> bool:
+    try:
+        return bool(left < right)
+    except TypeError:
+        return False
+
+
+def _extreme(values: Iterable[Any], pick: Any) -> Any:
+    try:
+        return pick(values, default=None)
+    except TypeError:
+        return None
+
+
+class _Bucket:
+    __slots__ = ("size", "aggregates")
+
+    def __init__(self, keys: Iterable[str]) -> None:
+        self.size = 0
+        self.aggregates = {key: RunningAggregate() for key in keys}
+
+    def add(self, snapshot: Tuple[Any, ...]) -> None:
+        self.size += 1
+        for aggregate, value in zip(self.aggregates.values(), snapshot):
+            aggregate.add(value)
+
+    def remove(self, snapshot: Tuple[Any, ...]) -> None:
+        self.size -= 1
+        for aggregate, value in zip(self.aggregates.values(), snapshot):
+            aggregate.remove(value)
+
+
+class AggregateIndex:
+    """Agregados totales y por grupo de un conjunto de filas.
+
+    ``columns`` asocia cada clave con su agregado; ``group_by`` es la
+    columna que define los grupos (o ``None``). Cada fila incluida guarda
+    una instantánea de sus valores para poder restarlos después aunque el
+    registro se edite en el sitio.
+    """
+
+    def __init__(self, columns: Mapping[str, str], group_by: Optional[str] = None) -> None:
+        for kind in columns.values():
+            if kind not in AGGREGATES:
+                raise ValueError(f"Agregado '{kind}' no soportado")
+        self.columns = dict(columns)
+        self.group_by = group_by
+        self._keys = tuple(self.columns)
+        self._members: Dict[int, Tuple[Hashable, Tuple[Any, ...]]] = {}
+        self._total = _Bucket(self._keys)
+        self._groups: Dict[Hashable, _Bucket] = {}
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    # ------------------------------------------------------------------
+    def sync(self, rows: Iterable[Tuple[int, Mapping[str, Any]]]) -> None:
+        """Ajusta los agregados al conjunto ``rows`` de pares ``(row_id, valores)``.
+
+        Si la diferencia con el conjunto anterior es mayor que el propio
+        conjunto nuevo, se reconstruye desde cero.
+        """
+
+        current = dict(rows)
+        removed = [row_id for row_id in self._members if row_id not in current]
+        added = [row_id for row_id in current if row_id not in self._members]
+        if len(removed) + len(added) > len(current):
+            self.clear()
+            added = list(current)
+            removed = []
+        for row_id in removed:
+            self._discard(row_id)
+        for row_id in added:
+            self._insert(row_id, current[row_id])
+
+    # ------------------------------------------------------------------
+    def update(self, row_id: int, values: Mapping[str, Any]) -> None:
+        """Sustituye los valores de ``row_id`` tras una edición."""
+
+        if row_id in self._members:
+            self._discard(row_id)
+            self._insert(row_id, values)
+
+    # ------------------------------------------------------------------
+    def totals(self) -> Dict[str, Any]:
+        return self._results(self._total)
+
+    # ------------------------------------------------------------------
+    def groups(self) -> Dict[Hashable, Dict[str, Any]]:
+        """Agregados por grupo; cada entrada incluye ``"__size__"`` con sus filas."""
+
+        return {group: self._results(bucket) for group, bucket in self._groups.items()}
+
+    # ------------------------------------------------------------------
+    def group_of(self, row_id: int) -> Hashable:
+        return self._members[row_id][0]
+
+    # ------------------------------------------------------------------
+    def clear(self) -> None:
+        self._members.clear()
+        self._total = _Bucket(self._keys)
+        self._groups.clear()
+
+    # ------------------------------------------------------------------
+    def _results(self, bucket: _Bucket) -> Dict[str, Any]:
+        results: Dict[str, Any] = {
+            key: aggregate.result(self.columns[key])
+            for key, aggregate in bucket.aggregates.items()
+        }
+        results["__size__"] = bucket.size
+        return results
+
+    def _insert(self, row_id: int, values: Mapping[str, Any]) -> None:
+        snapshot = tuple(values.get(key) for key in self._keys)
+        group = _group_key(values.get(self.group_by)) if self.group_by else None
+        self._members[row_id] = (group, snapshot)
+        self._total.add(snapshot)
+        if self.group_by:
+            bucket = self._groups.get(group)
+            if bucket is None:
+                bucket = self._groups[group] = _Bucket(self._keys)
+            bucket.add(snapshot)
+
+    def _discard(self, row_id: int) -> None:
+        group, snapshot = self._members.pop(row_id)
+        self._total.remove(snapshot)
+        if self.group_by:
+            bucket = self._groups[group]
+            bucket.remove(snapshot)
+            if not bucket.size:
+                del self._groups[group]
+
+
+def _group_key(value: Any) -> Hashable:
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+__all__ = ["AGGREGATES", "AggregateIndex", "RunningAggregate"]
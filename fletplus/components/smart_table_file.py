@@ -0,0 +1,449 @@
+"""Proveedor de datos de ``SmartTable`` respaldado por un archivo local.
+
+:class:`FileDataProvider` proyecta en memoria (``mmap``) un archivo CSV o
+JSONL con una fila por línea y sirve páginas ``(query, start, end)``
+decodificando solo las líneas pedidas. El desplazamiento de cada línea se
+guarda en un índice compacto (``array`` de 32 o 64 bits) que se construye
+en un hilo en segundo plano y se persiste junto al archivo para
+reutilizarlo mientras no cambie su tamaño ni su fecha de modificación.
+
+Con ``pushdown=True`` en la tabla, los filtros, la búsqueda y el orden se
+resuelven recorriendo el índice: cada consulta guarda los números de línea
+que cumplen los filtros y continúa el recorrido donde lo dejó al pedir la
+página siguiente. Un orden necesita recorrer todo el archivo, así que se
+calcula en un hilo propio y, mientras tanto, el proveedor devuelve un
+awaitable que la tabla espera sin bloquear el bucle.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Union
+
+from fletplus.components.smart_table_search import normalize_text, split_terms
+
+logger = logging.getLogger(__name__)
+
+_INDEX_MAGIC = b"FPLXIDX1"
+_INDEX_HEADER = struct.Struct("<8sQQcx")
+# Número de líneas que el hilo publica de cada vez.
+_PUBLISH_EVERY = 65536
+
+
+class _Scan:
+    __slots__ = ("lines", "next_line", "complete", "done", "builder")
+
+    def __init__(self, typecode: str) -> None:
+        self.lines = array(typecode)
+        self.next_line = 0
+        self.complete = False
+        # Solo para consultas ordenadas: hilo que las calcula y aviso de fin.
+        self.done = threading.Event()
+        self.builder: Optional[threading.Thread] = None
+
+
+class FileDataProvider:
+    """``data_provider`` que lee páginas de un archivo CSV o JSONL sin cargarlo.
+
+    ``format`` se deduce de la extensión (``.csv``/``.jsonl``/``.ndjson``) si
+    no se indica. En CSV la primera línea es la cabecera y ``converters``
+    permite convertir los textos de cada columna. El índice de líneas se
+    guarda en ``index_path`` (por defecto, junto al archivo con sufijo
+    ``.idx``) salvo con ``persist_index=False``.
+
+    La búsqueda se limita a ``query.search_columns`` (las columnas con
+    ``search_weight`` positivo de la tabla) o, si la consulta no las
+    indica, a todos los campos de la fila.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike[str]"],
+        *,
+        format: Optional[str] = None,
+        encoding: str = "utf-8",
+        converters: Optional[Mapping[str, Callable[[str], Any]]] = None,
+        index_path: Union[str, "os.PathLike[str]", None] = None,
+        persist_index: bool = True,
+        scan_cache_size: int = 8,
+        background: bool = True,
+    ) -> None:
+        self.path = os.fspath(path)
+        if format is None:
+            extension = os.path.splitext(self.path)[1].lower()
+            format = "csv" if extension == ".csv" else "jsonl"
+        if format not in {"csv", "jsonl"}:
+            raise ValueError("format debe ser 'csv' o 'jsonl'")
+        self.format = format
+        self.encoding = encoding
+        self.converters = dict(converters or {})
+        self.index_path = os.fspath(index_path) if index_path is not None else self.path + ".idx"
+        self.persist_index = persist_index
+        self.scan_cache_size = max(scan_cache_size, 1)
+
+        self._file = open(self.path, "rb")
+        self._mmap: Optional[mmap.mmap] = None
+        self._closing = False
+        try:
+            stat = os.fstat(self._file.fileno())
+            self._size = stat.st_size
+            self._mtime_ns = stat.st_mtime_ns
+            if self._size:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            # Desplazamientos de 32 bits mientras el archivo lo permita.
+            self._typecode = "I" if self._size < 2**32 else "Q"
+            self._offsets = array(self._typecode)
+            self._complete = False
+            self._condition = threading.Condition()
+            self._scans: "OrderedDict[Any, _Scan]" = OrderedDict()
+            self._header: List[str] = []
+            self._data_start = 0
+            if self.format == "csv":
+                self._read_header()
+
+            self._builder: Optional[threading.Thread] = None
+            if not self._load_index():
+                if background:
+                    self._builder = threading.Thread(
+                        target=self._build_index, name="smart-table-file-index", daemon=True
+                    )
+                    self._builder.start()
+                else:
+                    self._build_index()
+        except BaseException:
+            if self._mmap is not None:
+                self._mmap.close()
+            self._file.close()
+            raise
+
+    # ------------------------------------------------------------------
+    def __call__(
+        self, query: Any, start: int, end: int
+    ) -> Union[List[Dict[str, Any]], Awaitable[List[Dict[str, Any]]]]:
+        """Devuelve las filas ``[start, end)`` de ``query``.
+
+        Si la consulta tiene orden y aún no está calculado, devuelve un
+        awaitable que se resuelve cuando el hilo de orden termina.
+        """
+
+        start = max(start, 0)
+        if end <= start:
+            return []
+        if not self._needs_scan(query):
+            self._wait_for_lines(end)
+            stop = min(end, len(self._offsets))
+            return [self._decode(line) for line in range(start, stop)]
+
+        if getattr(query, "sorts", None):
+            scan = self._sorted_scan(query)
+            if not scan.complete:
+                return self._sorted_page(scan, start, end)
+        else:
+            scan = self._scan(query, end)
+        return [self._decode(line) for line in scan.lines[start:end]]
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        """Número de filas; espera a que el índice esté completo."""
+
+        self.wait_ready()
+        return len(self._offsets)
+
+    # ------------------------------------------------------------------
+    @property
+    def ready(self) -> bool:
+        return self._complete
+
+    # ------------------------------------------------------------------
+    @property
+    def indexed_rows(self) -> int:
+        """Filas indexadas hasta el momento."""
+
+        return len(self._offsets)
+
+    # ------------------------------------------------------------------
+    @property
+    def columns(self) -> List[str]:
+        """Cabecera del CSV (vacía en JSONL)."""
+
+        return list(self._header)
+
+    # ------------------------------------------------------------------
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: self._complete, timeout)
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Detiene los hilos de orden, espera al del índice y libera el archivo."""
+
+        self._closing = True
+        for scan in list(self._scans.values()):
+            if scan.builder is not None:
+                scan.builder.join()
+        if self._builder is not None:
+            self._builder.join()
+            self._builder = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    # ------------------------------------------------------------------
+    def __enter__(self) -> "FileDataProvider":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    def _read_header(self) -> None:
+        if self._mmap is None:
+            return
+        end = self._mmap.find(b"\n")
+        end = self._size if end == -1 else end
+        line = self._mmap[:end].decode(self.encoding).lstrip("\ufeff").rstrip("\r")
+        self._header = next(csv.reader([line]), [])
+        self._data_start = min(end + 1, self._size)
+
+    # ------------------------------------------------------------------
+    def _build_index(self) -> None:
+        data = self._mmap
+        offsets = array(self._typecode)
+        published = 0
+        try:
+            position = self._data_start
+            size = self._size
+            while data is not None and position < size:
+                newline = data.find(b"\n", position)
+                end = size if newline == -1 else newline
+                # Las líneas vacías no son filas.
+                if end > position and data[position:end].strip():
+                    offsets.append(position)
+                position = end + 1
+                if len(offsets) - published >= _PUBLISH_EVERY:
+                    self._publish(offsets, published)
+                    published = len(offsets)
+        except (ValueError, OSError):  # pragma: no cover - archivo cerrado a mitad
+            logger.debug("Índice de %s interrumpido", self.path, exc_info=True)
+        self._publish(offsets, published, complete=True)
+        if self.persist_index:
+            self._save_index()
+
+    def _publish(self, offsets: array, published: int, *, complete: bool = False) -> None:
+        with self._condition:
+            self._offsets.extend(offsets[published:])
+            self._complete = complete
+            self._condition.notify_all()
+
+    # ------------------------------------------------------------------
+    def _load_index(self) -> bool:
+        try:
+            with open(self.index_path, "rb") as handle:
+                header = handle.read(_INDEX_HEADER.size)
+                magic, size, mtime_ns, typecode = _INDEX_HEADER.unpack(header)
+                if (
+                    magic != _INDEX_MAGIC
+                    or size != self._size
+                    or mtime_ns != self._mtime_ns
+                    or typecode.decode() != self._typecode
+                ):
+                    return False
+                offsets = array(self._typecode)
+                offsets.frombytes(handle.read())
+        except (OSError, struct.error, ValueError):
+            return False
+        self._offsets = offsets
+        self._complete = True
+        return True
+
+    def _save_index(self) -> None:
+        temporary = self.index_path + ".tmp"
+        try:
+            with open(temporary, "wb") as handle:
+                handle.write(
+                    _INDEX_HEADER.pack(
+                        _INDEX_MAGIC, self._size, self._mtime_ns, self._typecode.encode()
+                    )
+                )
+                self._offsets.tofile(handle)
+            os.replace(temporary, self.index_path)
+        except OSError:
+            logger.debug("No se pudo guardar el índice %s", self.index_path, exc_info=True)
+
+    # ------------------------------------------------------------------
+    def _wait_for_lines(self, count: int) -> None:
+        with self._condition:
+            self._condition.wait_for(lambda: self._complete or len(self._offsets) >= count)
+
+    # ------------------------------------------------------------------
+    def _decode(self, line: int) -> Dict[str, Any]:
+        data = self._mmap
+        assert data is not None
+        start = self._offsets[line]
+        end = data.find(b"\n", start)
+        raw = data[start : self._size if end == -1 else end].decode(self.encoding).rstrip("\r")
+        if self.format == "jsonl":
+            value = json.loads(raw)
+            return value if isinstance(value, dict) else {"value": value}
+        cells = next(csv.reader([raw]), [])
+        row: Dict[str, Any] = {}
+        for key, cell in zip(self._header, cells):
+            converter = self.converters.get(key)
+            if converter is not None:
+                try:
+                    row[key] = converter(cell)
+                except (TypeError, ValueError):
+                    row[key] = None
+            else:
+                row[key] = cell
+        return row
+
+    # ------------------------------------------------------------------
+    def _needs_scan(self, query: Any) -> bool:
+        filters = getattr(query, "filters", None) or {}
+        return (
+            any(flt.value not in (None, "") for flt in filters.values())
+            or bool(getattr(query, "sorts", None))
+            or bool(getattr(query, "search", ""))
+        )
+
+    # ------------------------------------------------------------------
+    def _cached_scan(self, query: Any) -> _Scan:
+        key = _query_key(query)
+        scan = self._scans.get(key) if key is not None else None
+        if scan is None:
+            scan = _Scan(self._typecode)
+            if key is not None:
+                self._scans[key] = scan
+                while len(self._scans) > self.scan_cache_size:
+                    self._scans.popitem(last=False)
+        else:
+            self._scans.move_to_end(key)
+        return scan
+
+    # ------------------------------------------------------------------
+    def _scan(self, query: Any, end: int) -> _Scan:
+        """Recorre el índice hasta tener ``end`` coincidencias o llegar al final."""
+
+        scan = self._cached_scan(query)
+        if scan.complete or len(scan.lines) >= end:
+            return scan
+
+        matches = self._matcher(query)
+        line = scan.next_line
+        while len(scan.lines) < end:
+            if line >= len(self._offsets):
+                self._wait_for_lines(line + 1)
+                if line >= len(self._offsets):
+                    scan.complete = True
+                    break
+            if matches(self._decode(line)):
+                scan.lines.append(line)
+            line += 1
+        scan.next_line = line
+        return scan
+
+    # ------------------------------------------------------------------
+    def _sorted_scan(self, query: Any) -> _Scan:
+        """Devuelve el recorrido ordenado de ``query`` y lo lanza en un hilo si hace falta."""
+
+        scan = self._cached_scan(query)
+        if scan.builder is None and not scan.complete:
+            scan.builder = threading.Thread(
+                target=self._build_sorted,
+                args=(scan, self._matcher(query), list(query.sorts)),
+                name="smart-table-file-sort",
+                daemon=True,
+            )
+            scan.builder.start()
+        return scan
+
+    def _build_sorted(self, scan: _Scan, matches: Callable[[Dict[str, Any]], bool], sorts: List[Any]) -> None:
+        """Recorre todas las líneas y ordena las coincidencias por sus claves.
+
+        Solo se conservan las claves de orden y el número de línea, no la
+        fila decodificada.
+        """
+
+        pending: List[Any] = []
+        try:
+            line = 0
+            while not self._closing:
+                if line >= len(self._offsets):
+                    self._wait_for_lines(line + 1)
+                    if line >= len(self._offsets):
+                        break
+                values = self._decode(line)
+                if matches(values):
+                    pending.append((tuple(values.get(sort.key) for sort in sorts), line))
+                line += 1
+            for position in reversed(range(len(sorts))):
+                pending.sort(
+                    key=lambda item, position=position: (
+                        item[0][position] is None,
+                        item[0][position],
+                    ),
+                    reverse=not sorts[position].ascending,
+                )
+            scan.lines.extend(line for _, line in pending)
+            scan.next_line = line
+            scan.complete = not self._closing
+        except Exception:
+            logger.warning("No se pudo ordenar %s", self.path, exc_info=True)
+        finally:
+            scan.done.set()
+
+    async def _sorted_page(self, scan: _Scan, start: int, end: int) -> List[Dict[str, Any]]:
+        await asyncio.to_thread(scan.done.wait)
+        return [self._decode(line) for line in scan.lines[start:end]]
+
+    # ------------------------------------------------------------------
+    def _matcher(self, query: Any) -> Callable[[Dict[str, Any]], bool]:
+        """Predicado con los filtros y la búsqueda de ``query``.
+
+        Como la búsqueda en memoria, cada término debe aparecer en alguna de
+        las columnas buscables.
+        """
+
+        filters = [flt for flt in (getattr(query, "filters", None) or {}).values() if flt.value not in (None, "")]
+        terms = split_terms(getattr(query, "search", "") or "")
+        columns = tuple(getattr(query, "search_columns", ()) or ())
+
+        def matches(values: Dict[str, Any]) -> bool:
+            if not all(flt.matches(values.get(flt.key)) for flt in filters):
+                return False
+            if not terms:
+                return True
+            fields = [values.get(key) for key in columns] if columns else list(values.values())
+            texts = [normalize_text(value) for value in fields]
+            return all(any(term in text for text in texts) for term in terms)
+
+        return matches
+
+
+def _query_key(query: Any) -> Any:
+    filters = getattr(query, "filters", None) or {}
+    key = (
+        tuple(sorted((name, flt.predicate, flt.value) for name, flt in filters.items())),
+        tuple((sort.key, sort.ascending) for sort in getattr(query, "sorts", ()) or ()),
+        getattr(query, "search", ""),
+        tuple(getattr(query, "search_columns", ()) or ()),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+__all__ = ["FileDataProvider"]
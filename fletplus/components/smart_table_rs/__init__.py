@@ -1,8 +1,10 @@
 """Backend opcional en Rust para ``SmartTable``.
 
-El módulo expone ``apply_query`` cuando la extensión nativa está disponible.
-De lo contrario, la variable queda en ``None`` permitiendo al código Python
-aplicar el fallback automáticamente.
+El módulo expone ``apply_query`` y la clase ``TableHandle`` (tabla
+persistente que convierte cada fila una sola vez y responde consultas sin
+volver a serializar los datos) cuando la extensión nativa está disponible.
+De lo contrario, las variables quedan en ``None`` permitiendo al código
+Python aplicar el fallback automáticamente.
 """
 from __future__ import annotations
 
@@ -13,6 +15,7 @@ from typing import Any, Callable, Optional
 _native: Optional[Any]
 apply_query: Optional[Callable[..., Any]]
 apply_query_ids: Optional[Callable[..., Any]]
+TableHandle: Optional[Any]
 
 _spec = importlib.util.find_spec("fletplus.components.smart_table_rs._native")
 if _spec is None:
@@ -28,8 +31,10 @@ else:
 if _native is not None:
     apply_query = _native.apply_query
     apply_query_ids = getattr(_native, "apply_query_ids", None)
+    TableHandle = getattr(_native, "TableHandle", None)
 else:
     apply_query = None
     apply_query_ids = None
+    TableHandle = None
 
-__all__ = ["apply_query", "apply_query_ids"]
+__all__ = ["TableHandle", "apply_query", "apply_query_ids"]
@@ -1,7 +1,9 @@
 use pyo3::basic::CompareOp;
+use pyo3::exceptions::PyKeyError;
 use pyo3::prelude::*;
-use pyo3::types::{PyAny, PyDict, PyTuple};
+use pyo3::types::{PyAny, PyBool, PyDict, PyFloat, PyLong, PyString, PyTuple};
 use std::cmp::Ordering;
+use std::collections::{HashMap, HashSet};
 
 #[derive(Clone)]
 struct Record {
@@ -183,25 +185,29 @@ fn matches_filter(py: Python<'_>, record: &Record, filter: &FilterSpec) -> PyRes
                 .unwrap_or(ComparableValue::NoneValue);
             let filter_value = ComparableValue::from_py(py, filter_value);
 
-            match filter.op {
-                FilterOp::Eq => Ok(eq_values(&cell_value, &filter_value)),
-                FilterOp::Neq => Ok(!eq_values(&cell_value, &filter_value)),
-                FilterOp::Lt => Ok(order_values(&cell_value, &filter_value) == Some(Ordering::Less)),
-                FilterOp::Lte => Ok(matches!(
-                    order_values(&cell_value, &filter_value),
-                    Some(Ordering::Less | Ordering::Equal)
-                )),
-                FilterOp::Gt => Ok(order_values(&cell_value, &filter_value) == Some(Ordering::Greater)),
-                FilterOp::Gte => Ok(matches!(
-                    order_values(&cell_value, &filter_value),
-                    Some(Ordering::Greater | Ordering::Equal)
-                )),
-                FilterOp::ContainsCi => Ok(false),
-            }
+            Ok(compare_filter(filter.op, &cell_value, &filter_value))
         }
     }
 }
 
+fn compare_filter(op: FilterOp, cell_value: &ComparableValue, filter_value: &ComparableValue) -> bool {
+    match op {
+        FilterOp::Eq => eq_values(cell_value, filter_value),
+        FilterOp::Neq => !eq_values(cell_value, filter_value),
+        FilterOp::Lt => order_values(cell_value, filter_value) == Some(Ordering::Less),
+        FilterOp::Lte => matches!(
+            order_values(cell_value, filter_value),
+            Some(Ordering::Less | Ordering::Equal)
+        ),
+        FilterOp::Gt => order_values(cell_value, filter_value) == Some(Ordering::Greater),
+        FilterOp::Gte => matches!(
+            order_values(cell_value, filter_value),
+            Some(Ordering::Greater | Ordering::Equal)
+        ),
+        FilterOp::ContainsCi => false,
+    }
+}
+
 fn fallback_str(value: &PyAny) -> String {
     value
         .str()
@@ -275,19 +281,24 @@ fn compare_records(
     })
 }
 
+fn parse_entry<'py>(py: Python<'py>, item: &'py PyObject) -> PyResult<(i64, &'py PyDict)> {
+    let tuple: &PyTuple = item.as_ref(py).downcast()?;
+    if tuple.len() != 2 {
+        return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
+            "Cada registro debe ser (row_id, dict)",
+        ));
+    }
+
+    let row_id: i64 = tuple.get_item(0)?.extract()?;
+    let values: &PyDict = tuple.get_item(1)?.downcast()?;
+    Ok((row_id, values))
+}
+
 fn parse_records(py: Python<'_>, items: Vec<PyObject>) -> PyResult<Vec<Record>> {
     let mut records: Vec<Record> = Vec::with_capacity(items.len());
 
-    for item in items {
-        let tuple: &PyTuple = item.as_ref(py).downcast()?;
-        if tuple.len() != 2 {
-            return Err(PyErr::new::<pyo3::exceptions::PyValueError, _>(
-                "Cada registro debe ser (row_id, dict)",
-            ));
-        }
-
-        let row_id: i64 = tuple.get_item(0)?.extract()?;
-        let values: &PyDict = tuple.get_item(1)?.downcast()?;
+    for item in &items {
+        let (row_id, values) = parse_entry(py, item)?;
 
         records.push(Record {
             row_id,
@@ -369,9 +380,244 @@ fn apply_query_ids(
     apply_query_inner(py, records, filters, sorts)
 }
 
+/// Valor de una celda convertido una sola vez al ingerir la fila.
+struct StoredValue {
+    comparable: ComparableValue,
+    lowered: Option<String>,
+    /// `true` si el objeto es exactamente `bool`, `int`, `float` o `str`, de
+    /// modo que `order_values` coincide con la comparación de Python.
+    native: bool,
+    object: PyObject,
+}
+
+impl StoredValue {
+    fn from_py(py: Python<'_>, value: &PyAny) -> Self {
+        let comparable = ComparableValue::from_py(py, value);
+        let native = match &comparable {
+            ComparableValue::NoneValue => true,
+            ComparableValue::Bool(_) => value.is_exact_instance_of::<PyBool>(),
+            ComparableValue::Int(_) => value.is_exact_instance_of::<PyLong>(),
+            ComparableValue::Float(_) => value.is_exact_instance_of::<PyFloat>(),
+            ComparableValue::String(_) => value.is_exact_instance_of::<PyString>(),
+        };
+
+        StoredValue {
+            lowered: normalize_str(py, value),
+            comparable,
+            native,
+            object: value.into(),
+        }
+    }
+}
+
+struct StoredRecord {
+    row_id: i64,
+    values: HashMap<String, StoredValue>,
+}
+
+impl StoredRecord {
+    fn from_dict(py: Python<'_>, row_id: i64, dict: &PyDict) -> Self {
+        let mut values = HashMap::with_capacity(dict.len());
+        for (key, value) in dict.iter() {
+            if let Ok(key) = key.extract::<String>() {
+                values.insert(key, StoredValue::from_py(py, value));
+            }
+        }
+
+        StoredRecord { row_id, values }
+    }
+}
+
+/// Filtro con el valor ya normalizado para toda la consulta.
+struct PreparedFilter {
+    key: String,
+    op: FilterOp,
+    empty: bool,
+    needle: Option<String>,
+    comparable: ComparableValue,
+}
+
+impl PreparedFilter {
+    fn new(py: Python<'_>, filter: &FilterSpec) -> Self {
+        let value = filter.value.as_ref(py);
+        PreparedFilter {
+            key: filter.key.clone(),
+            op: filter.op,
+            empty: is_empty_filter_value(value),
+            needle: normalize_str(py, value),
+            comparable: ComparableValue::from_py(py, value),
+        }
+    }
+
+    fn matches(&self, record: &StoredRecord) -> bool {
+        if self.empty {
+            return true;
+        }
+
+        match self.op {
+            FilterOp::ContainsCi => {
+                let Some(cell) = record.values.get(&self.key) else {
+                    return false;
+                };
+                let Some(needle) = &self.needle else {
+                    return true;
+                };
+                if needle.is_empty() {
+                    return true;
+                }
+                let Some(haystack) = &cell.lowered else {
+                    return false;
+                };
+                haystack.contains(needle.as_str())
+            }
+            _ => {
+                let none = ComparableValue::NoneValue;
+                let cell = record
+                    .values
+                    .get(&self.key)
+                    .map_or(&none, |value| &value.comparable);
+                compare_filter(self.op, cell, &self.comparable)
+            }
+        }
+    }
+}
+
+fn compare_stored(py: Python<'_>, left: Option<&StoredValue>, right: Option<&StoredValue>) -> Ordering {
+    let left = left.filter(|value| value.comparable != ComparableValue::NoneValue);
+    let right = right.filter(|value| value.comparable != ComparableValue::NoneValue);
+
+    match (left, right) {
+        (None, None) => Ordering::Equal,
+        (None, Some(_)) => Ordering::Greater,
+        (Some(_), None) => Ordering::Less,
+        (Some(left), Some(right)) => {
+            if left.native && right.native {
+                if let Some(ordering) = order_values(&left.comparable, &right.comparable) {
+                    return ordering;
+                }
+            }
+            // Tipos no nativos, NaN o mezclas: misma comparación que `apply_query`.
+            compare_sort_values(py, Some(left.object.as_ref(py)), Some(right.object.as_ref(py)))
+        }
+    }
+}
+
+/// Tabla persistente del lado nativo.
+///
+/// Convierte cada fila una sola vez al ingerirla y se mantiene sincronizada
+/// con `append`, `update` y `delete`; `query` devuelve los IDs filtrados y
+/// ordenados sin volver a convertir los diccionarios de Python. La semántica
+/// de filtros y ordenamientos es la misma que la de `apply_query_ids`.
+#[pyclass(module = "fletplus.components.smart_table_rs._native")]
+struct TableHandle {
+    records: Vec<StoredRecord>,
+    positions: HashMap<i64, usize>,
+}
+
+impl TableHandle {
+    fn reindex(&mut self) {
+        self.positions = self
+            .records
+            .iter()
+            .enumerate()
+            .map(|(position, record)| (record.row_id, position))
+            .collect();
+    }
+}
+
+#[pymethods]
+impl TableHandle {
+    #[new]
+    fn new() -> Self {
+        TableHandle {
+            records: Vec::new(),
+            positions: HashMap::new(),
+        }
+    }
+
+    /// Sustituye el contenido por `records` (lista de `(row_id, dict)`).
+    fn ingest(&mut self, py: Python<'_>, records: Vec<PyObject>) -> PyResult<()> {
+        self.records.clear();
+        self.positions.clear();
+        self.append(py, records)
+    }
+
+    /// Añade filas al final; un `row_id` existente se reemplaza en su sitio.
+    fn append(&mut self, py: Python<'_>, records: Vec<PyObject>) -> PyResult<()> {
+        self.records.reserve(records.len());
+        for item in &records {
+            let (row_id, values) = parse_entry(py, item)?;
+            let stored = StoredRecord::from_dict(py, row_id, values);
+            match self.positions.get(&row_id) {
+                Some(&position) => self.records[position] = stored,
+                None => {
+                    self.positions.insert(row_id, self.records.len());
+                    self.records.push(stored);
+                }
+            }
+        }
+        Ok(())
+    }
+
+    /// Reconvierte los valores de una fila tras editarla.
+    fn update(&mut self, py: Python<'_>, row_id: i64, values: &PyDict) -> PyResult<()> {
+        let Some(&position) = self.positions.get(&row_id) else {
+            return Err(PyKeyError::new_err(format!("Fila inexistente: {row_id}")));
+        };
+        self.records[position] = StoredRecord::from_dict(py, row_id, values);
+        Ok(())
+    }
+
+    /// Elimina las filas indicadas y devuelve cuántas existían.
+    fn delete(&mut self, row_ids: Vec<i64>) -> usize {
+        let targets: HashSet<i64> = row_ids
+            .into_iter()
+            .filter(|row_id| self.positions.contains_key(row_id))
+            .collect();
+        if targets.is_empty() {
+            return 0;
+        }
+        self.records.retain(|record| !targets.contains(&record.row_id));
+        self.reindex();
+        targets.len()
+    }
+
+    /// Devuelve los IDs que cumplen `filters` ordenados por `sorts`.
+    fn query(&self, py: Python<'_>, filters: Vec<FilterSpec>, sorts: Vec<SortSpec>) -> Vec<i64> {
+        let prepared: Vec<PreparedFilter> = filters
+            .iter()
+            .map(|filter| PreparedFilter::new(py, filter))
+            .collect();
+
+        let mut selected: Vec<&StoredRecord> = self
+            .records
+            .iter()
+            .filter(|record| prepared.iter().all(|filter| filter.matches(record)))
+            .collect();
+
+        for sort in sorts.iter().rev() {
+            selected.sort_by(|left, right| {
+                let ordering = compare_stored(py, left.values.get(&sort.key), right.values.get(&sort.key));
+                if sort.ascending {
+                    ordering
+                } else {
+                    ordering.reverse()
+                }
+            });
+        }
+
+        selected.into_iter().map(|record| record.row_id).collect()
+    }
+
+    fn __len__(&self) -> usize {
+        self.records.len()
+    }
+}
+
 #[pymodule]
 fn _native(_py: Python<'_>, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(apply_query, m)?)?;
     m.add_function(wrap_pyfunction!(apply_query_ids, m)?)?;
+    m.add_class::<TableHandle>()?;
     Ok(())
 }
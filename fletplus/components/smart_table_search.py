@@ -0,0 +1,167 @@
+"""Índice de búsqueda rápida para ``SmartTable``.
+
+Guarda por fila el texto normalizado (minúsculas y sin acentos) de cada
+columna buscable y un índice invertido de trigramas a ``row_id``. Un
+término de tres o más caracteres se resuelve intersecando las listas de
+sus trigramas y verificando solo esos candidatos; los términos más cortos
+recorren los textos ya normalizados sin volver a convertir cada valor.
+
+:func:`highlight_spans` calcula los rangos a resaltar de un valor para que
+las celdas muestren qué parte coincide con la búsqueda.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+Span = Tuple[int, int]
+
+
+@lru_cache(maxsize=4096)
+def _fold_char(char: str) -> str:
+    base = unicodedata.normalize("NFKD", char)[0].lower()
+    # Solo se aceptan equivalencias de un carácter para conservar las posiciones.
+    return base if len(base) == 1 else char
+
+
+def normalize_text(value: Any) -> str:
+    """Texto en minúsculas y sin acentos con la misma longitud que ``str(value)``."""
+
+    if value is None:
+        return ""
+    text = value if isinstance(value, str) else str(value)
+    if text.isascii():
+        return text.lower()
+    return "".join(_fold_char(char) for char in text)
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def split_terms(text: str) -> List[str]:
+    """Términos normalizados y sin repetir de una búsqueda."""
+
+    return list(dict.fromkeys(normalize_text(text).split()))
+
+
+class SearchIndex:
+    """Índice de trigramas sobre las columnas buscables de una tabla.
+
+    ``weights`` asocia cada columna con su peso en el ranking: una fila
+    suma, por cada término, el peso de las columnas que lo contienen.
+    """
+
+    def __init__(self, weights: Mapping[str, float]) -> None:
+        self.weights: Dict[str, float] = dict(weights)
+        self._keys = tuple(self.weights)
+        self._texts: Dict[int, Tuple[str, ...]] = {}
+        self._grams: Dict[str, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    # ------------------------------------------------------------------
+    def add(self, rows: Iterable[Tuple[int, Mapping[str, Any]]]) -> None:
+        """Indexa filas nuevas como pares ``(row_id, valores)``."""
+
+        grams = self._grams
+        for row_id, values in rows:
+            texts = tuple(normalize_text(values.get(key)) for key in self._keys)
+            self._texts[row_id] = texts
+            for gram in set().union(*map(_trigrams, texts)):
+                postings = grams.get(gram)
+                if postings is None:
+                    grams[gram] = {row_id}
+                else:
+                    postings.add(row_id)
+
+    # ------------------------------------------------------------------
+    def update(self, row_id: int, values: Mapping[str, Any]) -> None:
+        """Reindexa ``row_id`` tras una edición."""
+
+        old = self._texts.get(row_id)
+        if old is not None:
+            texts = tuple(normalize_text(values.get(key)) for key in self._keys)
+            if texts == old:
+                return
+            for gram in set().union(*map(_trigrams, old)):
+                postings = self._grams.get(gram)
+                if postings is not None:
+                    postings.discard(row_id)
+                    if not postings:
+                        del self._grams[gram]
+        self.add([(row_id, values)])
+
+    # ------------------------------------------------------------------
+    def search(self, text: str) -> Dict[int, float]:
+        """Devuelve ``row_id -> puntuación`` de las filas que contienen todos los términos."""
+
+        terms = split_terms(text)
+        if not terms:
+            return {}
+        # Primero los términos más selectivos: reducen antes los candidatos.
+        terms.sort(key=len, reverse=True)
+        candidates: Optional[set[int]] = None
+        for term in terms:
+            if len(term) < 3:
+                continue
+            postings = sorted(
+                (self._grams.get(gram, set()) for gram in _trigrams(term)), key=len
+            )
+            found = set(postings[0]).intersection(*postings[1:])
+            candidates = found if candidates is None else found & candidates
+            if not candidates:
+                return {}
+
+        weights = [self.weights[key] for key in self._keys]
+        scores: Dict[int, float] = {}
+        for row_id in self._texts if candidates is None else candidates:
+            texts = self._texts[row_id]
+            score = 0.0
+            for term in terms:
+                matched = sum(weight for text, weight in zip(texts, weights) if term in text)
+                if not matched:
+                    break
+                score += matched
+            else:
+                scores[row_id] = score
+        return scores
+
+    # ------------------------------------------------------------------
+    def clear(self) -> None:
+        self._texts.clear()
+        self._grams.clear()
+
+
+def highlight_spans(value: Any, terms: Sequence[str]) -> List[Span]:
+    """Rangos ``(inicio, fin)`` de ``str(value)`` que contienen algún término.
+
+    ``terms`` debe venir de :func:`split_terms`. Los rangos solapados se
+    funden y se devuelven ordenados.
+    """
+
+    text = normalize_text(value)
+    spans: List[Span] = []
+    for term in terms:
+        start = text.find(term)
+        while start != -1:
+            spans.append((start, start + len(term)))
+            start = text.find(term, start + 1)
+    if not spans:
+        return spans
+    # Los rangos solapados de varios términos se funden en uno.
+    spans.sort()
+    merged = [spans[0]]
+    for start, end in spans[1:]:
+        last_start, last_end = merged[-1]
+        if start <= last_end:
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+__all__ = ["SearchIndex", "highlight_spans", "normalize_text", "split_terms"]
@@ -0,0 +1,317 @@
+"""Almacenamiento columnar para las consultas de ``SmartTable``.
+
+Cada columna consultada se guarda como un diccionario de categorías (los
+valores distintos, internados) más un array compacto de códigos por fila.
+Las columnas numéricas mantienen además un array ``float64``. Los filtros
+se evalúan una vez por categoría, o de forma vectorizada sobre el array
+numérico, y se proyectan a las filas mediante los códigos; los
+ordenamientos multi-columna usan el rango de cada categoría como clave.
+Con NumPy instalado las proyecciones y el ``lexsort`` son vectorizados; sin
+él se usa un fallback en Python puro con el mismo resultado.
+
+:meth:`ColumnarStore.detach` copia solo las columnas de una consulta en un
+almacén sin filas que puede serializarse y resolverse en otro proceso con
+:func:`run_query`.
+"""
+
+from __future__ import annotations
+
+import operator
+from array import array
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+try:  # pragma: no cover - dependencia opcional
+    import numpy as _np
+except Exception:  # pragma: no cover - fallback limpio
+    _np = None
+
+NUMPY_AVAILABLE = _np is not None
+
+# Enteros mayores pierden precisión al convertirse a ``float64``.
+_MAX_EXACT_INT = 2**53
+
+_NUMERIC_OPS: Dict[str, Callable[[Any, Any], Any]] = {
+    "eq": operator.eq,
+    "neq": operator.ne,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+}
+
+
+def _as_number(value: Any) -> Optional[float]:
+    """Convierte ``value`` a ``float`` sin pérdida o devuelve ``None``."""
+
+    if value is None:
+        return float("nan")
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return float(value) if -_MAX_EXACT_INT < value < _MAX_EXACT_INT else None
+    if isinstance(value, float):
+        return value
+    return None
+
+
+def _sort_key(value: Any) -> Tuple[bool, Any]:
+    # Mismo criterio que el fallback por registros: ``None`` al final.
+    return (value is None, value)
+
+
+class _Column:
+    __slots__ = ("categories", "lookup", "codes", "numbers", "numeric", "_ranks")
+
+    def __init__(self) -> None:
+        self.categories: List[Any] = []
+        self.lookup: Dict[Tuple[type, Any], int] = {}
+        self.codes = array("i")
+        self.numbers = array("d")
+        self.numeric = True
+        self._ranks: Optional[List[int]] = None
+
+    def encode(self, value: Any) -> int:
+        # El tipo forma parte de la clave: ``1``, ``1.0`` y ``True`` se
+        # filtran distinto con ``contains_ci`` aunque sean iguales.
+        key = (type(value), value)
+        code = self.lookup.get(key)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(value)
+            self.lookup[key] = code
+            self._ranks = None
+        return code
+
+    def append(self, value: Any) -> None:
+        self.codes.append(self.encode(value))
+        if self.numeric:
+            number = _as_number(value)
+            if number is None:
+                self.numeric = False
+                self.numbers = array("d")
+            else:
+                self.numbers.append(number)
+
+    def set(self, position: int, value: Any) -> None:
+        self.codes[position] = self.encode(value)
+        if self.numeric:
+            number = _as_number(value)
+            if number is None:
+                self.numeric = False
+                self.numbers = array("d")
+            else:
+                self.numbers[position] = number
+
+    def ranks(self) -> List[int]:
+        """Rango denso de cada categoría; lanza ``TypeError`` si no son comparables."""
+
+        if self._ranks is None:
+            categories = self.categories
+            order = sorted(range(len(categories)), key=lambda code: _sort_key(categories[code]))
+            ranks = [0] * len(categories)
+            rank = 0
+            previous: Optional[Tuple[bool, Any]] = None
+            for code in order:
+                current = _sort_key(categories[code])
+                if previous is not None and previous < current:
+                    rank += 1
+                ranks[code] = rank
+                previous = current
+            self._ranks = ranks
+        return self._ranks
+
+
+class ColumnarStore:
+    """Índice columnar de las filas de una ``SmartTable``.
+
+    Las columnas se construyen de forma perezosa la primera vez que un
+    filtro u ordenamiento las usa y después se mantienen al añadir o editar
+    filas. Una columna con valores no *hashables* queda deshabilitada y las
+    consultas que la usan devuelven ``None`` para que la tabla aplique su
+    fallback por registros.
+    """
+
+    def __init__(self) -> None:
+        self._rows: List[Mapping[str, Any]] = []
+        self._positions: Dict[int, int] = {}
+        self._columns: Dict[str, _Column] = {}
+        self._disabled: set[str] = set()
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ------------------------------------------------------------------
+    def append(self, row_id: int, values: Mapping[str, Any]) -> None:
+        """Añade una fila al final del almacén."""
+
+        self._positions[row_id] = len(self._rows)
+        self._rows.append(values)
+        self._count += 1
+        for key, column in list(self._columns.items()):
+            try:
+                column.append(values.get(key))
+            except TypeError:
+                self._disable(key)
+
+    # ------------------------------------------------------------------
+    def update(self, row_id: int, values: Optional[Mapping[str, Any]] = None) -> None:
+        """Recodifica la fila ``row_id`` tras editarla."""
+
+        position = self._positions.get(row_id)
+        if position is None:
+            return
+        if values is not None:
+            self._rows[position] = values
+        row = self._rows[position]
+        for key, column in list(self._columns.items()):
+            try:
+                column.set(position, row.get(key))
+            except TypeError:
+                self._disable(key)
+
+    # ------------------------------------------------------------------
+    def query(
+        self,
+        filters: Sequence[Tuple[Any, Optional[str]]],
+        sorts: Sequence[Any],
+    ) -> Optional[List[int]]:
+        """Devuelve las posiciones que cumplen ``filters`` ordenadas por ``sorts``.
+
+        ``filters`` es una secuencia de ``(SmartTableFilter, op)`` donde
+        ``op`` es el nombre del operador integrado (``"lt"``, ``"eq"``…) o
+        ``None`` para predicados propios. Devuelve ``None`` si alguna
+        columna no puede indexarse o sus valores no son ordenables.
+        """
+
+        columns: List[_Column] = []
+        for flt, _op in filters:
+            column = self._column(flt.key)
+            if column is None:
+                return None
+            columns.append(column)
+        sort_columns: List[Tuple[_Column, bool, List[int]]] = []
+        for sort in sorts:
+            column = self._column(sort.key)
+            if column is None:
+                return None
+            try:
+                ranks = column.ranks()
+            except TypeError:
+                return None
+            sort_columns.append((column, sort.ascending, ranks))
+
+        if not self._count:
+            return []
+        if _np is not None:
+            return self._query_numpy(filters, columns, sort_columns)
+        return self._query_py(filters, columns, sort_columns)
+
+    # ------------------------------------------------------------------
+    def detach(self, keys: Sequence[str]) -> Optional["ColumnarStore"]:
+        """Copia las columnas ``keys`` en un almacén independiente y sin filas.
+
+        El resultado solo sirve para :meth:`query` sobre esas columnas y se
+        serializa con ``pickle`` sin arrastrar los valores originales de las
+        filas. Devuelve ``None`` si alguna columna no puede indexarse.
+        """
+
+        detached = ColumnarStore()
+        detached._count = self._count
+        for key in dict.fromkeys(keys):
+            column = self._column(key)
+            if column is None:
+                return None
+            copy = _Column()
+            copy.categories = list(column.categories)
+            copy.codes = array("i", column.codes)
+            copy.numbers = array("d", column.numbers)
+            copy.numeric = column.numeric
+            detached._columns[key] = copy
+        return detached
+
+    # ------------------------------------------------------------------
+    def _query_numpy(
+        self,
+        filters: Sequence[Tuple[Any, Optional[str]]],
+        columns: Sequence[_Column],
+        sort_columns: Sequence[Tuple[_Column, bool, List[int]]],
+    ) -> List[int]:
+        np = _np
+        mask = np.ones(self._count, dtype=bool)
+        for (flt, op), column in zip(filters, columns):
+            if flt.value in (None, ""):
+                continue
+            if op in _NUMERIC_OPS and column.numeric and _as_number(flt.value) is not None:
+                numbers = np.frombuffer(column.numbers, dtype=np.float64)
+                mask &= _NUMERIC_OPS[op](numbers, float(flt.value))
+                continue
+            matches = np.fromiter(
+                (flt.matches(value) for value in column.categories),
+                dtype=bool,
+                count=len(column.categories),
+            )
+            mask &= matches[np.frombuffer(column.codes, dtype=np.intc)]
+        positions = np.flatnonzero(mask)
+        if sort_columns and len(positions) > 1:
+            keys = []
+            # ``lexsort`` usa la última clave como principal.
+            for column, ascending, ranks in reversed(sort_columns):
+                codes = np.frombuffer(column.codes, dtype=np.intc)[positions]
+                key = np.asarray(ranks, dtype=np.int64)[codes]
+                keys.append(key if ascending else -key)
+            positions = positions[np.lexsort(keys)]
+        return positions.tolist()
+
+    # ------------------------------------------------------------------
+    def _query_py(
+        self,
+        filters: Sequence[Tuple[Any, Optional[str]]],
+        columns: Sequence[_Column],
+        sort_columns: Sequence[Tuple[_Column, bool, List[int]]],
+    ) -> List[int]:
+        positions = list(range(self._count))
+        for (flt, _op), column in zip(filters, columns):
+            if flt.value in (None, ""):
+                continue
+            matches = [flt.matches(value) for value in column.categories]
+            codes = column.codes
+            positions = [position for position in positions if matches[codes[position]]]
+        for column, ascending, ranks in reversed(sort_columns):
+            codes = column.codes
+            positions.sort(key=lambda position: ranks[codes[position]], reverse=not ascending)
+        return positions
+
+    # ------------------------------------------------------------------
+    def _column(self, key: str) -> Optional[_Column]:
+        if key in self._disabled:
+            return None
+        column = self._columns.get(key)
+        if column is None and len(self._rows) == self._count:
+            column = _Column()
+            try:
+                for row in self._rows:
+                    column.append(row.get(key))
+            except TypeError:
+                self._disable(key)
+                return None
+            self._columns[key] = column
+        return column
+
+    # ------------------------------------------------------------------
+    def _disable(self, key: str) -> None:
+        self._columns.pop(key, None)
+        self._disabled.add(key)
+
+
+def run_query(
+    store: ColumnarStore,
+    filters: Sequence[Tuple[Any, Optional[str]]],
+    sorts: Sequence[Any],
+) -> Optional[List[int]]:
+    """Resuelve ``store.query`` como función de módulo para los pools de procesos."""
+
+    return store.query(filters, sorts)
+
+
+__all__ = ["ColumnarStore", "NUMPY_AVAILABLE", "run_query"]
@@ -6,28 +6,55 @@ import importlib
 from typing import TYPE_CHECKING, Any
 
 LAZY_IMPORTS = {
+    "BatchResult": "fletplus.http.client",
     "DiskCache": "fletplus.http.client",
+    "DiskCacheMigration": "fletplus.http.disk_cache_py",
+    "DiskCacheStats": "fletplus.http.disk_cache_py",
     "HttpClient": "fletplus.http.client",
     "HttpInterceptor": "fletplus.http.client",
+    "HttpMetrics": "fletplus.http.metrics",
+    "HttpMetricsSnapshot": "fletplus.http.metrics",
+    "HttpResource": "fletplus.http.resource",
+    "RequestCancelledError": "fletplus.http.scheduler",
     "RequestEvent": "fletplus.http.client",
+    "RequestScheduler": "fletplus.http.scheduler",
     "ResponseEvent": "fletplus.http.client",
+    "SchedulerStats": "fletplus.http.scheduler",
 }
 
 if TYPE_CHECKING:
     from fletplus.http.client import (
+        BatchResult,
         DiskCache,
         HttpClient,
         HttpInterceptor,
         RequestEvent,
         ResponseEvent,
     )
+    from fletplus.http.disk_cache_py import DiskCacheMigration, DiskCacheStats
+    from fletplus.http.metrics import HttpMetrics, HttpMetricsSnapshot
+    from fletplus.http.resource import HttpResource
+    from fletplus.http.scheduler import (
+        RequestCancelledError,
+        RequestScheduler,
+        SchedulerStats,
+    )
 
 __all__ = [
+    "BatchResult",
     "DiskCache",
+    "DiskCacheMigration",
+    "DiskCacheStats",
     "HttpClient",
     "HttpInterceptor",
+    "HttpMetrics",
+    "HttpMetricsSnapshot",
+    "HttpResource",
+    "RequestCancelledError",
     "RequestEvent",
+    "RequestScheduler",
     "ResponseEvent",
+    "SchedulerStats",
 ]
 
 
@@ -2,27 +2,34 @@
 
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import email.utils
 import importlib
 import inspect
 import logging
 import time
+import weakref
 from dataclasses import dataclass, field
 from datetime import timezone
 from types import MappingProxyType
-from typing import Any, Awaitable, Callable, Iterable, MutableMapping
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Literal, Mapping, MutableMapping
 
 import httpx
 
 from fletplus.state import Signal
 
 from .disk_cache_py import DiskCache as _PyDiskCache
+from .metrics import CacheOutcome, HttpMetrics, HttpMetricsSnapshot
+from .resource import HttpResource, ResourceKey, _build_resource_key
+from .scheduler import RequestCancelledError, RequestPriority, RequestScheduler, SchedulerStats
 
 RequestHook = Callable[["RequestEvent"], Awaitable[None] | None]
 ResponseHook = Callable[["ResponseEvent"], Awaitable[None] | None]
 RequestInterceptor = Callable[[httpx.Request], Awaitable[httpx.Request | None] | httpx.Request | None]
 ResponseInterceptor = Callable[[httpx.Response], Awaitable[httpx.Response | None] | httpx.Response | None]
+BatchRequest = str | Mapping[str, Any]
+BatchErrorPolicy = Literal["raise", "return", "skip"]
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +44,9 @@ _WS_UNSUPPORTED_HTTPX_KWARGS = {
     "url",
 }
 
+# Métodos que pueden repetirse sin efectos adicionales (RFC 9110, 9.2.2).
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
 _DEFAULT_SENSITIVE_QUERY_PARAMS = frozenset(
     {
         "token",
@@ -105,6 +115,36 @@ def _parse_cache_control_tokens(*header_values: str) -> set[str]:
     return tokens
 
 
+def _request_size(request: httpx.Request) -> int:
+    try:
+        return len(request.content)
+    except httpx.RequestNotRead:
+        return int(request.headers.get("content-length") or 0)
+
+
+def _cache_tier(cache: Any) -> str:
+    """Nivel de caché con el que se etiquetan las métricas de ``cache``."""
+
+    tier = getattr(cache, "metrics_tier", None)
+    if isinstance(tier, str) and tier:
+        return tier
+    return type(cache).__name__
+
+
+def _response_size(response: httpx.Response) -> int:
+    """Bytes recibidos por la red, antes de descomprimir el cuerpo."""
+
+    if response.num_bytes_downloaded:
+        return response.num_bytes_downloaded
+    length = response.headers.get("content-length", "")
+    if length.isdigit():
+        return int(length)
+    try:
+        return len(response.content)
+    except httpx.ResponseNotRead:
+        return 0
+
+
 def _parse_expires_timestamp(expires: str) -> float | None:
     if not expires:
         return None
@@ -163,6 +203,21 @@ class ResponseEvent:
         return self.response.elapsed.total_seconds() if self.response.elapsed else None
 
 
+@dataclass(slots=True)
+class BatchResult:
+    """Resultado de una petición lanzada con :meth:`HttpClient.map`."""
+
+    index: int
+    method: str
+    url: str
+    response: httpx.Response | None = None
+    error: Exception | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
 @dataclass(slots=True)
 class HttpInterceptor:
     """Interceptor configurable para peticiones HTTP."""
@@ -198,7 +253,9 @@ def _load_disk_cache() -> type[_PyDiskCache]:
     except Exception:
         return _PyDiskCache
     cache_cls = getattr(module, "DiskCache", None)
-    if cache_cls is None:
+    if cache_cls is None or not hasattr(cache_cls, "migrate"):
+        # La variante compilada no admite ``layout``, ``compression`` ni
+        # ``expires_at``: la API pública no debe depender de si se compiló.
         return _PyDiskCache
     return cache_cls
 
@@ -377,7 +434,15 @@ class HttpClient:
         sensitive_query_params: Iterable[str] | None = None,
         interceptors: Iterable[HttpInterceptor] | None = None,
         transport: httpx.AsyncBaseTransport | None = None,
+        scheduler: RequestScheduler | None = None,
+        metrics: HttpMetrics | None = None,
+        retries: int = 0,
+        retry_backoff: float = 0.1,
     ) -> None:
+        if not isinstance(retries, int) or isinstance(retries, bool) or retries < 0:
+            raise ValueError("retries debe ser un entero mayor o igual a 0.")
+        if not isinstance(retry_backoff, (int, float)) or isinstance(retry_backoff, bool) or retry_backoff < 0:
+            raise ValueError("retry_backoff debe ser un número mayor o igual a 0.")
         client_kwargs: dict[str, Any] = {
             "timeout": timeout,
             "transport": transport,
@@ -386,7 +451,17 @@ class HttpClient:
             client_kwargs["base_url"] = base_url
         self._client = httpx.AsyncClient(**client_kwargs)
         self._cache = cache
+        self._cache_tier = _cache_tier(cache) if cache is not None else None
+        self._retries = retries
+        self._retry_backoff = float(retry_backoff)
+        self._scheduler = scheduler
+        self._metrics = metrics
+        if metrics is not None:
+            metrics.register_pool_probe(self._pool_usage)
         self._hooks = _HookManager()
+        self._resources: weakref.WeakValueDictionary[ResourceKey, HttpResource[Any]] = (
+            weakref.WeakValueDictionary()
+        )
         self._interceptors: list[HttpInterceptor] = list(interceptors or [])
         if sensitive_query_params is None:
             self._sensitive_query_params = frozenset(
@@ -409,6 +484,16 @@ class HttpClient:
     def after_request(self) -> Signal[ResponseEvent | None]:
         return self._hooks.after_signal
 
+    # ------------------------------------------------------------------
+    @property
+    def scheduler(self) -> RequestScheduler | None:
+        return self._scheduler
+
+    # ------------------------------------------------------------------
+    @property
+    def metrics(self) -> HttpMetrics | None:
+        return self._metrics
+
     # ------------------------------------------------------------------
     def add_before_hook(self, callback: RequestHook) -> Callable[[], None]:
         return self._hooks.add_before(callback)
@@ -431,10 +516,21 @@ class HttpClient:
         allow_sensitive_cache: bool = False,
         context: MutableMapping[str, Any] | None = None,
         stream: bool = False,
+        priority: RequestPriority = "normal",
         **kwargs: Any,
     ) -> httpx.Response:
         """Construye y envía una petición HTTP.
 
+        Si el cliente tiene un :class:`RequestScheduler`, el envío por red
+        espera un hueco según ``priority`` (``"critical"``, ``"normal"`` o
+        ``"background"``). Las respuestas servidas desde caché no consumen
+        huecos. Con ``stream=True`` el hueco se libera al recibir las
+        cabeceras.
+
+        Si el cliente se creó con ``retries``, los errores de transporte de
+        los métodos idempotentes se reintentan con espera exponencial y cada
+        reintento se registra en las métricas.
+
         Contrato de errores de hooks:
         - Si `emit_after` falla y ya existe un error principal de la petición,
           se conserva ese error principal y el fallo del hook solo se registra en logs.
@@ -481,6 +577,15 @@ class HttpClient:
         from_cache = False
         error: Exception | None = None
         cached_for_revalidation: httpx.Response | None = None
+        metrics = self._metrics if self._metrics is not None and self._metrics.enabled else None
+        cache_outcome: CacheOutcome | None = None
+        bytes_in = 0
+        bytes_out = 0
+        cancelled = False
+        started_at = 0.0
+        if metrics is not None:
+            started_at = time.perf_counter()
+            metrics.request_started()
 
         try:
             for interceptor in self._interceptors:
@@ -541,8 +646,14 @@ class HttpClient:
                             cached = await interceptor.apply_response(cached)
                         response = cached
                         from_cache = True
+                        cache_outcome = "hit"
             if response is None:
-                response = await self._client.send(request, stream=stream)
+                response = await self._send(request, stream=stream, priority=priority, metrics=metrics)
+                if cache_key:
+                    cache_outcome = "miss"
+                if metrics is not None:
+                    bytes_in = _response_size(response)
+                    bytes_out = _request_size(request)
                 if (
                     response.status_code == 304
                     and cache_key
@@ -560,6 +671,7 @@ class HttpClient:
                         extensions=dict(cached_for_revalidation.extensions),
                     )
                     from_cache = True
+                    cache_outcome = "revalidate"
                 for interceptor in reversed(self._interceptors):
                     response = await interceptor.apply_response(response)
                 if cache_key and self._cache and not stream:
@@ -591,7 +703,22 @@ class HttpClient:
         except Exception as exc:  # pragma: no cover - rutas excepcionales
             error = exc
             raise
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
         finally:
+            if metrics is not None:
+                metrics.request_finished(
+                    request.method,
+                    request.url.path,
+                    elapsed=time.perf_counter() - started_at,
+                    bytes_in=bytes_in,
+                    bytes_out=bytes_out,
+                    error=error is not None,
+                    cancelled=cancelled,
+                    cache_outcome=cache_outcome,
+                    cache_tier=self._cache_tier,
+                )
             response_event = ResponseEvent(
                 request_event=event,
                 response=response,
@@ -604,6 +731,74 @@ class HttpClient:
             raise RuntimeError("La respuesta HTTP es None después de ejecutar la petición.")
         return response
 
+    # ------------------------------------------------------------------
+    async def _send(
+        self,
+        request: httpx.Request,
+        *,
+        stream: bool,
+        priority: RequestPriority,
+        metrics: HttpMetrics | None = None,
+    ) -> httpx.Response:
+        """Envía ``request`` reintentando los errores de transporte.
+
+        Solo se reintentan los métodos idempotentes, hasta ``retries`` veces y
+        con espera exponencial desde ``retry_backoff`` segundos. Cada intento
+        ocupa su propio hueco del planificador para no retenerlo durante la
+        espera.
+        """
+
+        retries = self._retries if request.method.upper() in _IDEMPOTENT_METHODS else 0
+        attempt = 0
+        while True:
+            try:
+                return await self._send_once(request, stream=stream, priority=priority)
+            except httpx.TransportError:
+                if attempt >= retries:
+                    raise
+            if metrics is not None:
+                metrics.record_retry(request.method, request.url.path)
+            await asyncio.sleep(self._retry_backoff * (2**attempt))
+            attempt += 1
+
+    # ------------------------------------------------------------------
+    async def _send_once(
+        self,
+        request: httpx.Request,
+        *,
+        stream: bool,
+        priority: RequestPriority,
+    ) -> httpx.Response:
+        scheduler = self._scheduler
+        if scheduler is None:
+            return await self._client.send(request, stream=stream)
+        host = request.url.netloc.decode("ascii")
+        async with scheduler.slot(host, priority):
+            return await self._client.send(request, stream=stream)
+
+    # ------------------------------------------------------------------
+    def _pool_usage(self) -> dict[str, int | None] | None:
+        # httpx no expone el pool públicamente: lectura defensiva del transporte.
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            return None
+        idle = sum(1 for connection in connections if connection.is_idle())
+        return {
+            "connections": len(connections),
+            "active": len(connections) - idle,
+            "idle": idle,
+            "max": getattr(pool, "_max_connections", None),
+        }
+
+    # ------------------------------------------------------------------
+    def cancel_queued(self, priority: RequestPriority = "background", *, host: str | None = None) -> int:
+        """Cancela peticiones en cola del planificador (por defecto las de fondo)."""
+
+        if self._scheduler is None:
+            return 0
+        return self._scheduler.cancel_queued(priority, host=host)
+
     # ------------------------------------------------------------------
     async def _emit_after_with_guard(
         self,
@@ -629,6 +824,7 @@ class HttpClient:
         allow_sensitive_cache: bool = False,
         context: MutableMapping[str, Any] | None = None,
         stream: bool = False,
+        priority: RequestPriority = "normal",
         **kwargs: Any,
     ) -> httpx.Response:
         """Atajo para peticiones GET con soporte opcional de streaming."""
@@ -641,6 +837,7 @@ class HttpClient:
             allow_sensitive_cache=allow_sensitive_cache,
             context=context,
             stream=stream,
+            priority=priority,
             **kwargs,
         )
 
@@ -655,6 +852,7 @@ class HttpClient:
         allow_sensitive_cache: bool = False,
         context: MutableMapping[str, Any] | None = None,
         stream: bool = False,
+        priority: RequestPriority = "normal",
         **kwargs: Any,
     ) -> httpx.Response:
         """Atajo para peticiones POST con soporte opcional de streaming."""
@@ -672,9 +870,192 @@ class HttpClient:
             allow_sensitive_cache=allow_sensitive_cache,
             context=context,
             stream=stream,
+            priority=priority,
             **payload,
         )
 
+    # ------------------------------------------------------------------
+    async def map(
+        self,
+        requests: Iterable[BatchRequest],
+        *,
+        concurrency: int = 8,
+        ordered: bool = False,
+        on_error: BatchErrorPolicy = "raise",
+        priority: RequestPriority = "normal",
+    ) -> AsyncIterator[BatchResult]:
+        """Lanza ``requests`` con concurrencia acotada y produce resultados.
+
+        Cada elemento es una URL (petición ``GET``) o un mapeo con ``url`` y,
+        opcionalmente, ``method`` y cualquier argumento de :meth:`request`
+        (``params``, ``headers``, ``cache``, ``priority``...). Las peticiones
+        pasan por :meth:`request`, así que respetan caché, hooks, interceptores
+        y el planificador del cliente.
+
+        Con ``ordered=False`` los resultados se producen según terminan; con
+        ``ordered=True`` se respetan las posiciones de entrada. ``on_error``
+        decide qué hacer ante un fallo: ``"raise"`` cancela el resto y propaga
+        la excepción, ``"return"`` produce el :class:`BatchResult` con
+        ``error`` y ``"skip"`` lo descarta.
+
+        La entrada se consume de forma perezosa: solo se lanzan peticiones
+        nuevas mientras el consumidor sigue iterando. Al cerrar el generador
+        (``break`` dentro de ``contextlib.aclosing``) se cancelan las que siguen
+        en vuelo.
+        """
+
+        if not isinstance(concurrency, int) or isinstance(concurrency, bool) or concurrency < 1:
+            raise ValueError("concurrency debe ser un entero mayor o igual a 1.")
+        if on_error not in {"raise", "return", "skip"}:
+            raise ValueError("on_error debe ser 'raise', 'return' o 'skip'.")
+
+        source = iter(enumerate(requests))
+        pending: set[asyncio.Task[BatchResult]] = set()
+        buffered: dict[int, BatchResult] = {}
+        next_index = 0
+        exhausted = False
+        # En modo ordenado se acota lo que espera en buffer detrás de una
+        # petición lenta para no acumular memoria sin límite.
+        window = concurrency * 2
+
+        def schedule() -> None:
+            nonlocal exhausted
+            while not exhausted and len(pending) < concurrency:
+                if ordered and len(pending) + len(buffered) >= window:
+                    return
+                try:
+                    index, spec = next(source)
+                except StopIteration:
+                    exhausted = True
+                    return
+                pending.add(asyncio.create_task(self._run_batch_item(index, spec, priority)))
+
+        try:
+            schedule()
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.difference_update(done)
+                completed = sorted((task.result() for task in done), key=lambda item: item.index)
+                ready: list[BatchResult] = []
+                if ordered:
+                    for result in completed:
+                        buffered[result.index] = result
+                    while next_index in buffered:
+                        ready.append(buffered.pop(next_index))
+                        next_index += 1
+                else:
+                    ready = completed
+                for result in ready:
+                    if result.error is not None:
+                        if on_error == "raise":
+                            raise result.error
+                        if on_error == "skip":
+                            continue
+                    yield result
+                schedule()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    async def gather(
+        self,
+        requests: Iterable[BatchRequest],
+        *,
+        concurrency: int = 8,
+        on_error: BatchErrorPolicy = "raise",
+        priority: RequestPriority = "normal",
+    ) -> list[BatchResult]:
+        """Ejecuta :meth:`map` hasta el final y devuelve los resultados en orden."""
+
+        results: list[BatchResult] = []
+        iterator = self.map(
+            requests,
+            concurrency=concurrency,
+            ordered=True,
+            on_error=on_error,
+            priority=priority,
+        )
+        async with contextlib.aclosing(iterator):
+            async for result in iterator:
+                results.append(result)
+        return results
+
+    # ------------------------------------------------------------------
+    async def _run_batch_item(
+        self,
+        index: int,
+        spec: BatchRequest,
+        priority: RequestPriority,
+    ) -> BatchResult:
+        if isinstance(spec, str):
+            method, url, kwargs = "GET", spec, {}
+        else:
+            kwargs = dict(spec)
+            try:
+                url = kwargs.pop("url")
+            except KeyError:
+                raise ValueError(f"La petición {index} de map() no define 'url'.") from None
+            method = str(kwargs.pop("method", "GET")).upper()
+        kwargs.setdefault("priority", priority)
+        result = BatchResult(index=index, method=method, url=str(url))
+        try:
+            result.response = await self.request(method, url, **kwargs)
+        except Exception as exc:
+            result.error = exc
+        return result
+
+    # ------------------------------------------------------------------
+    def resource(
+        self,
+        url: str,
+        *,
+        params: MutableMapping[str, Any] | None = None,
+        headers: MutableMapping[str, str] | None = None,
+        interval: float | None = None,
+        ttl: float = 30.0,
+        parser: Callable[[httpx.Response], Any] | None = None,
+        priority: RequestPriority = "normal",
+    ) -> HttpResource[Any]:
+        """Devuelve el :class:`HttpResource` compartido para una petición ``GET``.
+
+        Las llamadas equivalentes (misma URL normalizada, mismos parámetros y
+        cabeceras, el mismo ``parser`` y la misma ``priority``) reciben la
+        misma instancia, así que varios componentes
+        comparten una única carga y un único sondeo. ``interval`` activa el
+        sondeo mientras haya suscriptores y ``ttl`` indica cuántos segundos se
+        considera fresco el valor al aparecer un suscriptor nuevo. Las
+        peticiones pasan por :meth:`request` y se emiten en
+        :attr:`before_request`/:attr:`after_request` con
+        ``context["resource"]``.
+        """
+
+        if interval is not None and (not isinstance(interval, (int, float)) or interval <= 0):
+            raise ValueError("interval debe ser None o un número positivo.")
+        if not isinstance(ttl, (int, float)) or ttl < 0:
+            raise ValueError("ttl debe ser un número mayor o igual a 0.")
+        request = self._client.build_request("GET", url, params=params)
+        key = _build_resource_key(request.url, dict(headers) if headers else None, parser, priority)
+        existing = self._resources.get(key)
+        if existing is not None:
+            if interval is not None and (existing.interval is None or interval < existing.interval):
+                existing.interval = interval
+            existing.ttl = min(existing.ttl, ttl)
+            return existing
+        created: HttpResource[Any] = HttpResource(
+            self,
+            key,
+            headers=dict(headers) if headers else None,
+            interval=interval,
+            ttl=ttl,
+            parser=parser,
+            priority=priority,
+        )
+        self._resources[key] = created
+        return created
+
     # ------------------------------------------------------------------
     async def ws_connect(self, url: str, *, context: MutableMapping[str, Any] | None = None, **kwargs: Any):
         unsupported_httpx_kwargs = sorted(key for key in kwargs if key in _WS_UNSUPPORTED_HTTPX_KWARGS)
@@ -789,6 +1170,8 @@ class HttpClient:
 
     # ------------------------------------------------------------------
     async def aclose(self) -> None:
+        for resource in list(self._resources.values()):
+            resource.close()
         await self._client.aclose()
 
     # ------------------------------------------------------------------
@@ -798,13 +1181,23 @@ class HttpClient:
 
     # ------------------------------------------------------------------
     async def __aexit__(self, *exc_info: Any) -> None:
+        for resource in list(self._resources.values()):
+            resource.close()
         await self._client.__aexit__(*exc_info)
 
 
 __all__ = [
+    "BatchResult",
     "DiskCache",
     "HttpClient",
     "HttpInterceptor",
+    "HttpMetrics",
+    "HttpMetricsSnapshot",
+    "HttpResource",
+    "RequestCancelledError",
     "RequestEvent",
+    "RequestPriority",
+    "RequestScheduler",
     "ResponseEvent",
+    "SchedulerStats",
 ]
@@ -2,9 +2,8 @@
 from __future__ import annotations
 
 try:  # pragma: no cover - extensión opcional
-    from .disk_cache_pr_rs import build_key, cleanup
+    from .disk_cache_pr_rs import build_key
 except Exception:  # pragma: no cover - fallback limpio
     build_key = None
-    cleanup = None
 
-__all__ = ["build_key", "cleanup"]
+__all__ = ["build_key"]
@@ -8,9 +8,7 @@ except Exception:  # pragma: no cover - fallback limpio
 
 if _native is not None:
     build_key = _native.build_key
-    cleanup = _native.cleanup
 else:  # pragma: no cover - backend ausente
     build_key = None
-    cleanup = None
 
-__all__ = ["build_key", "cleanup"]
+__all__ = ["build_key"]
@@ -1,9 +1,6 @@
 use pyo3::prelude::*;
 use pyo3::types::{PyBytes, PyIterator, PyString};
 use sha2::{Digest, Sha256};
-use std::fs;
-use std::path::Path;
-use std::time::{Duration, SystemTime};
 
 fn bytes_from_any(py: Python<'_>, obj: &PyAny) -> PyResult<Vec<u8>> {
     if obj.is_none() {
@@ -61,57 +58,8 @@ fn build_key(py: Python<'_>, request: &PyAny) -> PyResult<String> {
     Ok(format!("{:x}", hasher.finalize()))
 }
 
-fn cutoff_time(max_age: Option<f64>) -> Option<SystemTime> {
-    max_age.map(|age| SystemTime::now() - Duration::from_secs_f64(age))
-}
-
-#[pyfunction]
-fn cleanup(directory: &str, max_entries: usize, max_age: Option<f64>) -> PyResult<usize> {
-    let dir = Path::new(directory);
-    if !dir.exists() {
-        return Ok(0);
-    }
-
-    let mut entries: Vec<(std::path::PathBuf, SystemTime)> = Vec::new();
-    for entry in fs::read_dir(dir)? {
-        let entry = entry?;
-        let path = entry.path();
-        if path.extension().and_then(|ext| ext.to_str()) != Some("json") {
-            continue;
-        }
-        let modified = entry
-            .metadata()
-            .and_then(|m| m.modified())
-            .unwrap_or(SystemTime::UNIX_EPOCH);
-        entries.push((path, modified));
-    }
-
-    entries.sort_by(|a, b| b.1.cmp(&a.1));
-    let cutoff = cutoff_time(max_age);
-    let mut kept = 0usize;
-    let mut removed = 0usize;
-
-    for (path, modified) in entries {
-        if let Some(limit) = cutoff {
-            if modified < limit {
-                let _ = fs::remove_file(&path);
-                removed += 1;
-                continue;
-            }
-        }
-        kept += 1;
-        if kept > max_entries {
-            let _ = fs::remove_file(&path);
-            removed += 1;
-        }
-    }
-
-    Ok(removed)
-}
-
 #[pymodule]
 fn _native(_py: Python<'_>, m: &PyModule) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(build_key, m)?)?;
-    m.add_function(wrap_pyfunction!(cleanup, m)?)?;
     Ok(())
 }
@@ -12,6 +12,9 @@ import stat
 import tempfile
 import time
 import warnings
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Literal
 
@@ -19,10 +22,101 @@ import httpx
 
 try:  # pragma: no cover - acelerador opcional
     from .disk_cache_pr import build_key as _build_key_rs
-    from .disk_cache_pr import cleanup as _cleanup_rs
 except Exception:  # pragma: no cover - fallback limpio
     _build_key_rs = None
-    _cleanup_rs = None
+
+try:  # pragma: no cover - dependencia opcional (Python >= 3.14)
+    from compression import zstd as _zstd_stdlib  # type: ignore[import-not-found]
+except Exception:  # pragma: no cover - fallback limpio
+    _zstd_stdlib = None
+
+try:  # pragma: no cover - dependencia opcional
+    import zstandard as _zstandard  # type: ignore[import-not-found]
+except Exception:  # pragma: no cover - fallback limpio
+    _zstandard = None
+
+ZSTD_AVAILABLE = _zstd_stdlib is not None or _zstandard is not None
+
+_COMPRESSIBLE_TYPES = frozenset(
+    {
+        "application/json",
+        "application/xml",
+        "application/javascript",
+        "application/x-javascript",
+        "application/ecmascript",
+        "application/x-ndjson",
+        "application/graphql",
+        "image/svg+xml",
+    }
+)
+_MIN_COMPRESS_SIZE = 512
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if not media_type:
+        return False
+    return (
+        media_type.startswith("text/")
+        or media_type in _COMPRESSIBLE_TYPES
+        or media_type.endswith("+json")
+        or media_type.endswith("+xml")
+    )
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "zlib":
+        return zlib.compress(data, 6)
+    if _zstd_stdlib is not None:
+        return _zstd_stdlib.compress(data)
+    if _zstandard is not None:
+        return _zstandard.ZstdCompressor().compress(data)
+    raise RuntimeError("zstd no está disponible.")
+
+
+def _decompress(data: bytes, encoding: str) -> bytes:
+    if encoding == "zlib":
+        return zlib.decompress(data)
+    if encoding == "zstd":
+        if _zstd_stdlib is not None:
+            return _zstd_stdlib.decompress(data)
+        if _zstandard is not None:
+            return _zstandard.ZstdDecompressor().decompress(data)
+        raise RuntimeError("zstd no está disponible para leer la entrada.")
+    raise ValueError(f"Codificación de caché desconocida: {encoding!r}")
+
+
+@dataclass(frozen=True, slots=True)
+class DiskCacheStats:
+    """Resumen del espacio que ocupa el caché en disco.
+
+    ``content_bytes`` es el tamaño de los cuerpos sin comprimir y
+    ``stored_content_bytes`` lo que ocupan tras la compresión (antes de la
+    codificación base64 del JSON); ``disk_bytes`` es el tamaño real de los
+    ficheros.
+    """
+
+    entries: int = 0
+    compressed_entries: int = 0
+    disk_bytes: int = 0
+    content_bytes: int = 0
+    stored_content_bytes: int = 0
+
+    @property
+    def compression_ratio(self) -> float:
+        if not self.stored_content_bytes:
+            return 1.0
+        return self.content_bytes / self.stored_content_bytes
+
+
+@dataclass(frozen=True, slots=True)
+class DiskCacheMigration:
+    """Resultado de :meth:`DiskCache.migrate`."""
+
+    moved: int
+    recompressed: int
+    before: DiskCacheStats
+    after: DiskCacheStats
 
 
 class DiskCache:
@@ -33,8 +127,30 @@ class DiskCache:
     ``warn`` se crea un subdirectorio privado (``0700``) para mantener la
     compatibilidad, con ``error`` se falla de forma explícita y con ``ignore``
     se omite la validación.
+
+    Con ``layout="sharded"`` cada entrada se guarda en
+    ``<aa>/<bb>/<clave>.json`` (dos niveles de prefijo del hash) para que
+    ningún directorio acumule decenas de miles de ficheros; las entradas del
+    formato plano existentes se mueven a su shard la primera vez que se leen
+    salvo que ``migrate=False`` (:meth:`migrate` las mueve todas de una vez).
+    ``compression`` comprime de forma transparente los
+    cuerpos de tipos textuales (``text/*``, JSON, XML...) a partir de
+    ``512`` bytes: ``"zlib"``, ``"zstd"`` (requiere ``zstandard`` o Python
+    3.14) o ``"auto"`` (zstd si está disponible, si no zlib). La lectura
+    acepta cualquier entrada con independencia de la configuración actual.
+
+    El límite de ``max_entries`` y ``max_age`` se aplica con un índice en
+    memoria ordenado por recencia que se construye al primer ``set()`` con
+    una sola lectura del directorio; después cada escritura solo toca las
+    entradas que expulsa. Para que el límite siga acotando el directorio
+    aunque escriban otras instancias o procesos, el índice se reconstruye
+    cuando cambia la fecha de modificación del directorio (layout plano) y,
+    en cualquier layout, cada ``max_entries`` escrituras propias.
     """
 
+    #: Nivel con el que :class:`~fletplus.http.HttpMetrics` agrupa sus aciertos.
+    metrics_tier = "disk"
+
     def __init__(
         self,
         directory: str | os.PathLike[str],
@@ -42,6 +158,9 @@ class DiskCache:
         max_entries: int = 128,
         max_age: float | None = None,
         world_writable_policy: Literal["warn", "error", "ignore"] = "error",
+        layout: Literal["flat", "sharded"] = "flat",
+        compression: Literal["none", "zlib", "zstd", "auto"] = "none",
+        migrate: bool = True,
     ) -> None:
         if not isinstance(max_entries, int) or isinstance(max_entries, bool) or max_entries < 1:
             raise ValueError("max_entries debe ser un entero mayor o igual a 1.")
@@ -50,6 +169,17 @@ class DiskCache:
                 raise ValueError("max_age debe ser None o un número positivo.")
         if world_writable_policy not in {"warn", "error", "ignore"}:
             raise ValueError("world_writable_policy debe ser 'warn', 'error' o 'ignore'.")
+        if layout not in {"flat", "sharded"}:
+            raise ValueError("layout debe ser 'flat' o 'sharded'.")
+        if compression not in {"none", "zlib", "zstd", "auto"}:
+            raise ValueError("compression debe ser 'none', 'zlib', 'zstd' o 'auto'.")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ValueError(
+                "compression='zstd' requiere la dependencia opcional 'zstandard' "
+                "(o Python 3.14+). Usa 'auto' para recurrir a zlib."
+            )
+        if compression == "auto":
+            compression = "zstd" if ZSTD_AVAILABLE else "zlib"
         self.directory = Path(directory)
         self.directory.mkdir(parents=True, exist_ok=True)
         if os.name == "posix":
@@ -93,6 +223,16 @@ class DiskCache:
                         warnings.warn(message, RuntimeWarning, stacklevel=2)
         self.max_entries = max_entries
         self.max_age = max_age
+        self.layout = layout
+        self.compression = compression
+        # Entradas planas pendientes de mover a su shard al leerlas.
+        self._migrate_legacy = layout == "sharded" and migrate
+        # Ruta -> fecha de escritura, de la menos a la más recientemente usada.
+        self._index: OrderedDict[Path, float] | None = None
+        self._oldest_timestamp = float("inf")
+        # Estado del directorio visto por el índice, para detectar escrituras ajenas.
+        self._index_mtime: int | None = None
+        self._writes_since_scan = 0
 
     # ------------------------------------------------------------------
     def build_key(self, request: httpx.Request) -> str:
@@ -123,9 +263,95 @@ class DiskCache:
         return hasher.hexdigest()
 
     # ------------------------------------------------------------------
-    def _path_for(self, key: str) -> Path:
+    def _path_for(self, key: str, *, layout: str | None = None) -> Path:
         safe_key = key.replace("/", "_").replace("\\", "_")
-        return self.directory / f"{safe_key}.json"
+        if (layout or self.layout) == "flat":
+            return self.directory / f"{safe_key}.json"
+        prefix = safe_key.lower()
+        if len(prefix) < 4 or any(char not in "0123456789abcdef" for char in prefix[:4]):
+            # Claves personalizadas: se reparte por el hash para mantener la fan-out.
+            prefix = hashlib.sha256(safe_key.encode("utf-8")).hexdigest()
+        return self.directory / prefix[:2] / prefix[2:4] / f"{safe_key}.json"
+
+    # ------------------------------------------------------------------
+    def _entry_paths(self) -> list[Path]:
+        if self.layout == "flat":
+            return list(self.directory.glob("*.json"))
+        return list(self.directory.glob("*/*/*.json"))
+
+    # ------------------------------------------------------------------
+    def _directory_mtime(self) -> int | None:
+        try:
+            return self.directory.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _index_is_stale(self) -> bool:
+        if self._writes_since_scan >= self.max_entries:
+            return True
+        # En el layout plano cualquier alta o baja ajena cambia el directorio.
+        return self.layout == "flat" and self._directory_mtime() != self._index_mtime
+
+    def _ensure_index(self) -> OrderedDict[Path, float]:
+        index = self._index
+        if index is not None and not self._index_is_stale():
+            return index
+        self._index_mtime = self._directory_mtime()
+        self._writes_since_scan = 0
+        paths = self._entry_paths()
+        if self._migrate_legacy:
+            paths.extend(self.directory.glob("*.json"))
+        entries: list[tuple[float, Path, float]] = []
+        for path in paths:
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            timestamp = mtime
+            if self.max_age is not None:
+                try:
+                    timestamp = float(json.loads(path.read_text("utf-8"))["timestamp"])
+                except Exception:
+                    with contextlib.suppress(OSError):
+                        path.unlink()
+                    continue
+            entries.append((mtime, path, timestamp))
+        entries.sort(key=lambda item: item[0])
+        index = OrderedDict((path, timestamp) for _, path, timestamp in entries)
+        self._oldest_timestamp = min(index.values(), default=float("inf"))
+        self._index = index
+        return index
+
+    def _touch(self, path: Path, timestamp: float | None = None) -> None:
+        index = self._index
+        if index is None:
+            return
+        if timestamp is not None:
+            index[path] = timestamp
+            self._oldest_timestamp = min(self._oldest_timestamp, timestamp)
+        if path in index:
+            index.move_to_end(path)
+
+    def _forget(self, path: Path) -> None:
+        if self._index is not None:
+            self._index.pop(path, None)
+
+    # ------------------------------------------------------------------
+    def _adopt_legacy(self, key: str, path: Path) -> bool:
+        """Mueve a ``path`` la entrada plana de ``key`` si existe."""
+
+        legacy = self._path_for(key, layout="flat")
+        try:
+            path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            os.replace(legacy, path)
+        except FileNotFoundError:
+            return False
+        except OSError:
+            logging.getLogger(__name__).warning("No se pudo migrar la entrada %s", legacy, exc_info=True)
+            return False
+        if self._index is not None and legacy in self._index:
+            self._index[path] = self._index.pop(legacy)
+        return True
 
     # ------------------------------------------------------------------
     def _is_expired(self, timestamp: float) -> bool:
@@ -136,7 +362,7 @@ class DiskCache:
     # ------------------------------------------------------------------
     def get(self, key: str, *, request: httpx.Request | None = None) -> httpx.Response | None:
         path = self._path_for(key)
-        if not path.exists():
+        if not path.exists() and not (self._migrate_legacy and self._adopt_legacy(key, path)):
             return None
 
         try:
@@ -145,14 +371,20 @@ class DiskCache:
             expires_at = data.get("expires_at")
             if expires_at is not None and float(expires_at) <= time.time():
                 path.unlink(missing_ok=True)
+                self._forget(path)
                 return None
             if self._is_expired(timestamp):
                 path.unlink(missing_ok=True)
+                self._forget(path)
                 return None
             headers_data = data["headers"]
             content = base64.b64decode(data["content"])
+            content_encoding = data.get("content_encoding")
+            if content_encoding:
+                content = _decompress(content, content_encoding)
         except Exception:
             path.unlink(missing_ok=True)
+            self._forget(path)
             return None
 
         headers = [
@@ -176,6 +408,7 @@ class DiskCache:
             os.utime(path, None)
         except OSError:
             pass
+        self._touch(path)
         return response
 
     # ------------------------------------------------------------------
@@ -211,15 +444,48 @@ class DiskCache:
                 "Llama a response.read() o await response.aread() antes de invocarlo."
             ) from exc
 
+        timestamp = time.time()
         entry: dict[str, Any] = {
             "status_code": response.status_code,
             "headers": headers,
-            "content": base64.b64encode(content).decode("ascii"),
+            **self._encode_content(content, response.headers.get("content-type", "")),
             "http_version": http_version,
             "reason_phrase": reason_phrase,
-            "timestamp": time.time(),
+            "timestamp": timestamp,
             "expires_at": expires_at,
         }
+        self._ensure_index()
+        self._writes_since_scan += 1
+        self._write_entry(path, entry)
+        if self._migrate_legacy:
+            legacy = self._path_for(key, layout="flat")
+            if legacy in self._index:  # type: ignore[operator]
+                legacy.unlink(missing_ok=True)
+                self._forget(legacy)
+        self._touch(path, timestamp)
+        self._cleanup()
+
+    # ------------------------------------------------------------------
+    def _encode_content(self, content: bytes, content_type: str) -> dict[str, Any]:
+        fields: dict[str, Any] = {"content_length": len(content)}
+        stored = content
+        if (
+            self.compression != "none"
+            and len(content) >= _MIN_COMPRESS_SIZE
+            and _is_compressible(content_type)
+        ):
+            compressed = _compress(content, self.compression)
+            if len(compressed) < len(content):
+                stored = compressed
+                fields["content_encoding"] = self.compression
+        fields["content"] = base64.b64encode(stored).decode("ascii")
+        return fields
+
+    # ------------------------------------------------------------------
+    def _write_entry(self, path: Path, entry: dict[str, Any]) -> None:
+        parent = path.parent
+        if parent != self.directory:
+            parent.mkdir(mode=0o700, parents=True, exist_ok=True)
         payload = json.dumps(entry, separators=(",", ":"))
         tmp_path: Path | None = None
         try:
@@ -227,7 +493,7 @@ class DiskCache:
                 mode="w",
                 encoding="utf-8",
                 delete=False,
-                dir=self.directory,
+                dir=parent,
             ) as fh:
                 tmp_path = Path(fh.name)
                 fh.write(payload)
@@ -239,48 +505,128 @@ class DiskCache:
             if tmp_path is not None:
                 with contextlib.suppress(OSError):
                     tmp_path.unlink()
-        self._cleanup()
 
     # ------------------------------------------------------------------
-    def _cleanup(self) -> None:
-        if _cleanup_rs is not None:
+    def stats(self) -> DiskCacheStats:
+        """Calcula el espacio ocupado por todas las entradas, en cualquier layout."""
+
+        entries = compressed = disk_bytes = content_bytes = stored_bytes = 0
+        for path in [*self.directory.glob("*.json"), *self.directory.glob("*/*/*.json")]:
             try:
-                _cleanup_rs(str(self.directory), self.max_entries, self.max_age)
-                return
+                size = path.stat().st_size
+                data = json.loads(path.read_text("utf-8"))
+                encoded = data["content"]
             except Exception:
-                logging.getLogger(__name__).warning("DiskCache._cleanup acelerador falló", exc_info=True)
+                continue
+            # Longitud decodificada de base64 sin materializar el cuerpo.
+            stored = len(encoded) * 3 // 4 - encoded.count("=", len(encoded) - 2)
+            entries += 1
+            disk_bytes += size
+            stored_bytes += stored
+            content_bytes += int(data.get("content_length", stored))
+            if data.get("content_encoding"):
+                compressed += 1
+        return DiskCacheStats(
+            entries=entries,
+            compressed_entries=compressed,
+            disk_bytes=disk_bytes,
+            content_bytes=content_bytes,
+            stored_content_bytes=stored_bytes,
+        )
 
-        cutoff = (time.time() - self.max_age) if self.max_age is not None else None
-        files: list[tuple[Path, float]] = []
-        # Orden por recencia: usamos mtime actualizado en hits.
-        for path in self.directory.glob("*.json"):
+    # ------------------------------------------------------------------
+    def migrate(self, *, recompress: bool = True) -> DiskCacheMigration:
+        """Mueve las entradas del otro layout al configurado.
+
+        Con ``recompress=True`` todas las entradas se reescriben según la
+        compresión actual. Se conserva la fecha de modificación de cada
+        fichero para no alterar el orden de expulsión. Devuelve las
+        estadísticas de disco antes y después.
+        """
+
+        before = self.stats()
+        source_layout = "sharded" if self.layout == "flat" else "flat"
+        sources = (
+            list(self.directory.glob("*.json"))
+            if source_layout == "flat"
+            else list(self.directory.glob("*/*/*.json"))
+        )
+        moved = recompressed = 0
+        for path in [*sources, *(self._entry_paths() if recompress else [])]:
+            target = self._path_for(path.stem)
             try:
-                mtime = path.stat().st_mtime
-            except (FileNotFoundError, OSError):
+                times = path.stat()
+                if recompress:
+                    recompressed += self._recompress(path, target)
+                elif target != path:
+                    target.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+                    os.replace(path, target)
+                os.utime(target, ns=(times.st_atime_ns, times.st_mtime_ns))
+            except Exception:
+                logging.getLogger(__name__).warning("No se pudo migrar la entrada %s", path, exc_info=True)
                 continue
-            if cutoff is not None:
-                try:
-                    data = json.loads(path.read_text("utf-8"))
-                    timestamp = float(data["timestamp"])
-                except Exception:
-                    with contextlib.suppress(OSError):
-                        path.unlink()
-                    continue
-                if timestamp < cutoff:
+            if target != path:
+                moved += 1
+        if source_layout == "sharded":
+            self._remove_empty_shards()
+        self._index = None
+        return DiskCacheMigration(moved=moved, recompressed=recompressed, before=before, after=self.stats())
+
+    # ------------------------------------------------------------------
+    def _recompress(self, path: Path, target: Path) -> int:
+        data = json.loads(path.read_text("utf-8"))
+        content = base64.b64decode(data["content"])
+        encoding = data.pop("content_encoding", None)
+        if encoding:
+            content = _decompress(content, encoding)
+        content_type = next(
+            (str(value) for name, value in data["headers"] if str(name).lower() == "content-type"),
+            "",
+        )
+        data.update(self._encode_content(content, content_type))
+        self._write_entry(target, data)
+        if target != path:
+            path.unlink(missing_ok=True)
+        return 1 if data.get("content_encoding") != encoding else 0
+
+    # ------------------------------------------------------------------
+    def _remove_empty_shards(self) -> None:
+        for shard in sorted(self.directory.glob("*/*"), reverse=True):
+            with contextlib.suppress(OSError):
+                shard.rmdir()
+        for shard in self.directory.glob("*"):
+            if shard.is_dir():
+                with contextlib.suppress(OSError):
+                    shard.rmdir()
+
+    # ------------------------------------------------------------------
+    def _cleanup(self) -> None:
+        """Expulsa las entradas caducadas y las que exceden ``max_entries``."""
+
+        # ``set()`` ya validó el índice; la escritura propia cambia la fecha del directorio.
+        index = self._index if self._index is not None else self._ensure_index()
+        if self.max_age is not None:
+            cutoff = time.time() - self.max_age
+            if self._oldest_timestamp < cutoff:
+                for path in [path for path, timestamp in index.items() if timestamp < cutoff]:
                     with contextlib.suppress(OSError):
                         path.unlink()
-                    continue
-            files.append((path, mtime))
-        files.sort(key=lambda item: item[1], reverse=True)
-        kept = 0
-        for file_path, _mtime in files:
-            kept += 1
-            if kept > self.max_entries:
-                with contextlib.suppress(OSError):
-                    file_path.unlink()
+                    del index[path]
+                self._oldest_timestamp = min(index.values(), default=float("inf"))
+        while len(index) > self.max_entries:
+            path, _ = index.popitem(last=False)
+            with contextlib.suppress(OSError):
+                path.unlink()
+        if self.layout == "flat":
+            self._index_mtime = self._directory_mtime()
 
     # ------------------------------------------------------------------
     def clear(self) -> None:
-        for file in self.directory.glob("*.json"):
+        paths = self._entry_paths()
+        if self.layout == "sharded":
+            # Las entradas planas sin mover también son del caché: si no, get() las recuperaría.
+            paths.extend(self.directory.glob("*.json"))
+        for file in paths:
             with contextlib.suppress(OSError):
                 file.unlink()
+        self._index = None
@@ -0,0 +1,443 @@
+"""Métricas de rendimiento agregadas para :class:`HttpClient`."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import json
+import re
+import time
+import weakref
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Iterable, Literal, Mapping
+
+from fletplus.state import Signal
+
+CacheOutcome = Literal["hit", "miss", "revalidate"]
+PoolProbe = Callable[[], "Mapping[str, int | None] | None"]
+
+_CACHE_OUTCOMES = ("hit", "miss", "revalidate")
+_MAX_ROUTE_CACHE = 1024
+_ID_SEGMENT = re.compile(
+    r"^(?:\d+|[0-9a-fA-F]{16,}|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$"
+)
+_TEMPLATE_PARAM = re.compile(r"\{[^/{}]+\}")
+
+
+def _build_bucket_bounds() -> tuple[float, ...]:
+    bounds: list[float] = []
+    value = 0.001
+    while value < 120.0:
+        bounds.append(round(value, 6))
+        value *= 1.5
+    return tuple(bounds)
+
+
+# Cubos exponenciales de 1 ms a ~2 min: memoria constante por ruta y error
+# relativo acotado (<50 %) en los percentiles estimados.
+_BUCKET_BOUNDS = _build_bucket_bounds()
+
+
+class _LatencyHistogram:
+    __slots__ = ("counts", "count", "total", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(_BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(_BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.minimum:
+            self.minimum = seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    def percentile(self, quantile: float) -> float | None:
+        if not self.count:
+            return None
+        rank = quantile * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            if cumulative + bucket_count >= rank:
+                lower = _BUCKET_BOUNDS[index - 1] if index > 0 else 0.0
+                upper = _BUCKET_BOUNDS[index] if index < len(_BUCKET_BOUNDS) else self.maximum
+                fraction = (rank - cumulative) / bucket_count
+                estimate = lower + (upper - lower) * fraction
+                return min(max(estimate, self.minimum), self.maximum)
+            cumulative += bucket_count
+        return self.maximum
+
+
+@dataclass(slots=True)
+class _RouteStats:
+    latency: _LatencyHistogram = field(default_factory=_LatencyHistogram)
+    errors: int = 0
+    cancelled: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    retries: int = 0
+    coalesced: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        latency = self.latency
+        return {
+            "count": latency.count,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "retries": self.retries,
+            "coalesced": self.coalesced,
+            "mean": (latency.total / latency.count) if latency.count else None,
+            "max": latency.maximum if latency.count else None,
+            "p50": latency.percentile(0.50),
+            "p95": latency.percentile(0.95),
+            "p99": latency.percentile(0.99),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class HttpMetricsSnapshot:
+    """Instantánea inmutable de las métricas HTTP agregadas.
+
+    Las latencias se expresan en segundos.
+    """
+
+    requests: int = 0
+    errors: int = 0
+    cancelled: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    retries: int = 0
+    coalesced: int = 0
+    routes: Mapping[str, Mapping[str, Any]] = field(default_factory=dict)
+    cache: Mapping[str, Mapping[str, int]] = field(default_factory=dict)
+    pool: Mapping[str, int | None] | None = None
+    timestamp: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "cancelled": self.cancelled,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "retries": self.retries,
+            "coalesced": self.coalesced,
+            "routes": {route: dict(stats) for route, stats in self.routes.items()},
+            "cache": {tier: dict(counts) for tier, counts in self.cache.items()},
+            "pool": dict(self.pool) if self.pool is not None else None,
+            "timestamp": self.timestamp,
+        }
+
+
+class HttpMetrics:
+    """Colector de métricas para uno o varios :class:`HttpClient`.
+
+    Agrupa las latencias por plantilla de ruta (``"GET /items/{id}"``). Las
+    rutas que no coinciden con ``route_templates`` se normalizan sustituyendo
+    segmentos numéricos, UUID o hexadecimales largos por ``{id}``.
+
+    ``stats`` es una :class:`Signal` con la última :class:`HttpMetricsSnapshot`
+    publicada; para no recalcular percentiles en cada petición se publica como
+    máximo una vez cada ``publish_interval`` segundos (``publish()`` fuerza la
+    actualización). Los cambios que llegan dentro de ese intervalo se publican
+    al terminar mediante el bucle de eventos que los registró, así que
+    ``stats`` refleja el final de cada ráfaga sin esperar a la siguiente
+    petición y sus suscriptores nunca se ejecutan en otro hilo. Sin bucle en
+    marcha no se programa nada: el cambio se publica con el siguiente registro
+    o con ``publish()``. Un cliente sin colector no ejecuta nada de este
+    módulo.
+    """
+
+    def __init__(
+        self,
+        *,
+        route_templates: Iterable[str] | None = None,
+        publish_interval: float = 0.5,
+    ) -> None:
+        if not isinstance(publish_interval, (int, float)) or isinstance(publish_interval, bool) or publish_interval < 0:
+            raise ValueError("publish_interval debe ser un número mayor o igual a 0.")
+        self.enabled = True
+        self.publish_interval = float(publish_interval)
+        self._templates: list[tuple[re.Pattern[str], str]] = []
+        self._route_cache: dict[tuple[str, str], str] = {}
+        for template in route_templates or ():
+            self.add_route_template(template)
+        self._routes: dict[str, _RouteStats] = {}
+        self._cache: dict[str, dict[str, int]] = {}
+        self._pool_probes: list[weakref.WeakMethod[Any] | Callable[[], Any]] = []
+        self._requests = 0
+        self._errors = 0
+        self._cancelled = 0
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._retries = 0
+        self._coalesced = 0
+        self._last_publish = 0.0
+        self._pending_publish: tuple[asyncio.AbstractEventLoop, asyncio.TimerHandle] | None = None
+        self.stats: Signal[HttpMetricsSnapshot] = Signal(HttpMetricsSnapshot())
+
+    # ------------------------------------------------------------------
+    def add_route_template(self, template: str) -> None:
+        """Registra una plantilla como ``/users/{id}/posts``."""
+
+        parts = _TEMPLATE_PARAM.split(template)
+        pattern = "[^/]+".join(re.escape(part) for part in parts)
+        self._templates.append((re.compile(f"^{pattern}/?$"), template))
+        self._route_cache.clear()
+
+    # ------------------------------------------------------------------
+    def route_for(self, method: str, path: str) -> str:
+        key = (method, path)
+        route = self._route_cache.get(key)
+        if route is not None:
+            return route
+        template = None
+        for pattern, candidate in self._templates:
+            if pattern.match(path):
+                template = candidate
+                break
+        if template is None:
+            template = "/".join(
+                "{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")
+            )
+        route = f"{method.upper()} {template or '/'}"
+        if len(self._route_cache) >= _MAX_ROUTE_CACHE:
+            self._route_cache.clear()
+        self._route_cache[key] = route
+        return route
+
+    # ------------------------------------------------------------------
+    def register_pool_probe(self, probe: PoolProbe) -> None:
+        """Añade una función que informa del uso del pool de conexiones."""
+
+        if _is_bound_method(probe):
+            self._pool_probes.append(weakref.WeakMethod(probe))  # type: ignore[arg-type]
+        else:
+            self._pool_probes.append(probe)
+
+    # ------------------------------------------------------------------
+    def request_started(self) -> None:
+        self._in_flight += 1
+        if self._in_flight > self._peak_in_flight:
+            self._peak_in_flight = self._in_flight
+
+    # ------------------------------------------------------------------
+    def request_finished(
+        self,
+        method: str,
+        path: str,
+        *,
+        elapsed: float,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+        error: bool = False,
+        cancelled: bool = False,
+        cache_outcome: CacheOutcome | None = None,
+        cache_tier: str | None = None,
+    ) -> None:
+        """Cierra una petición iniciada con :meth:`request_started`.
+
+        ``cancelled`` marca las peticiones interrumpidas con
+        :class:`asyncio.CancelledError`, que se cuentan aparte de los errores.
+        ``cache_tier`` es obligatorio cuando se indica ``cache_outcome``.
+        """
+
+        if cache_outcome is not None and not cache_tier:
+            raise ValueError("cache_tier es obligatorio cuando se indica cache_outcome.")
+        self._in_flight = max(0, self._in_flight - 1)
+        stats = self._route_stats(method, path)
+        stats.latency.observe(elapsed)
+        stats.bytes_in += bytes_in
+        stats.bytes_out += bytes_out
+        self._requests += 1
+        self._bytes_in += bytes_in
+        self._bytes_out += bytes_out
+        if error:
+            stats.errors += 1
+            self._errors += 1
+        if cancelled:
+            stats.cancelled += 1
+            self._cancelled += 1
+        if cache_outcome is not None:
+            self.record_cache(cache_outcome, tier=cache_tier)  # type: ignore[arg-type]
+        self._maybe_publish()
+
+    # ------------------------------------------------------------------
+    def record_cache(self, outcome: CacheOutcome, *, tier: str) -> None:
+        """Cuenta un acierto, fallo o revalidación del nivel de caché ``tier``."""
+
+        if outcome not in _CACHE_OUTCOMES:
+            raise ValueError("outcome debe ser 'hit', 'miss' o 'revalidate'.")
+        counts = self._cache.get(tier)
+        if counts is None:
+            counts = self._cache[tier] = {name: 0 for name in _CACHE_OUTCOMES}
+        counts[outcome] += 1
+
+    # ------------------------------------------------------------------
+    def record_retry(self, method: str, path: str) -> None:
+        self._route_stats(method, path).retries += 1
+        self._retries += 1
+        self._maybe_publish()
+
+    # ------------------------------------------------------------------
+    def record_coalesced(self, method: str, path: str) -> None:
+        """Cuenta una petición servida compartiendo otra ya en curso o activa."""
+
+        self._route_stats(method, path).coalesced += 1
+        self._coalesced += 1
+        self._maybe_publish()
+
+    # ------------------------------------------------------------------
+    def snapshot(self) -> HttpMetricsSnapshot:
+        return HttpMetricsSnapshot(
+            requests=self._requests,
+            errors=self._errors,
+            cancelled=self._cancelled,
+            in_flight=self._in_flight,
+            peak_in_flight=self._peak_in_flight,
+            bytes_in=self._bytes_in,
+            bytes_out=self._bytes_out,
+            retries=self._retries,
+            coalesced=self._coalesced,
+            routes=MappingProxyType(
+                {route: MappingProxyType(stats.as_dict()) for route, stats in self._routes.items()}
+            ),
+            cache=MappingProxyType(
+                {tier: MappingProxyType(dict(counts)) for tier, counts in self._cache.items()}
+            ),
+            pool=self._pool_usage(),
+            timestamp=time.time(),
+        )
+
+    # ------------------------------------------------------------------
+    def publish(self) -> HttpMetricsSnapshot:
+        """Recalcula la instantánea y la publica en :attr:`stats`."""
+
+        self._cancel_pending_publish()
+        self._last_publish = time.monotonic()
+        return self.stats.set(self.snapshot())
+
+    # ------------------------------------------------------------------
+    def to_json(self) -> str:
+        """Serializa las métricas como mensaje de snapshot para ``DevToolsServer``.
+
+        El tipo ``http_metrics_snapshot`` hace que el servidor lo conserve y lo
+        reenvíe a los clientes que se conecten más tarde.
+        """
+
+        return json.dumps(
+            {"type": "http_metrics_snapshot", "payload": self.snapshot().as_dict()},
+            separators=(",", ":"),
+        )
+
+    # ------------------------------------------------------------------
+    def reset(self) -> None:
+        self._routes.clear()
+        self._cache.clear()
+        self._requests = 0
+        self._errors = 0
+        self._cancelled = 0
+        self._peak_in_flight = self._in_flight
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._retries = 0
+        self._coalesced = 0
+        self.publish()
+
+    # ------------------------------------------------------------------
+    def _route_stats(self, method: str, path: str) -> _RouteStats:
+        route = self.route_for(method, path)
+        stats = self._routes.get(route)
+        if stats is None:
+            stats = self._routes[route] = _RouteStats()
+        return stats
+
+    # ------------------------------------------------------------------
+    def _maybe_publish(self) -> None:
+        remaining = self.publish_interval - (time.monotonic() - self._last_publish)
+        if remaining <= 0:
+            self.publish()
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Sin bucle no hay dónde programar el final de la ventana: se
+            # publica con el siguiente registro o con ``publish()``.
+            return
+        pending = self._pending_publish
+        if pending is not None:
+            if pending[0] is loop:
+                return
+            # El temporizador pertenece a otro bucle (quizá ya cerrado).
+            self._cancel_pending_publish()
+        self._pending_publish = (loop, loop.call_later(remaining, self._publish_pending))
+
+    # ------------------------------------------------------------------
+    def _publish_pending(self) -> None:
+        self._pending_publish = None
+        self.publish()
+
+    def _cancel_pending_publish(self) -> None:
+        pending = self._pending_publish
+        self._pending_publish = None
+        if pending is None:
+            return
+        loop, handle = pending
+        if loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            handle.cancel()
+        else:
+            # ``TimerHandle.cancel`` no es seguro entre hilos.
+            try:
+                loop.call_soon_threadsafe(handle.cancel)
+            except RuntimeError:  # el bucle se cerró mientras tanto
+                pass
+
+    # ------------------------------------------------------------------
+    def _pool_usage(self) -> Mapping[str, int | None] | None:
+        alive: list[weakref.WeakMethod[Any] | Callable[[], Any]] = []
+        usages: list[Mapping[str, int | None]] = []
+        for entry in self._pool_probes:
+            probe = entry() if isinstance(entry, weakref.WeakMethod) else entry
+            if probe is None:
+                continue
+            alive.append(entry)
+            usage = probe()
+            if usage:
+                usages.append(usage)
+        self._pool_probes = alive
+        if not usages:
+            return None
+        totals: dict[str, int | None] = {}
+        for key in ("connections", "active", "idle", "max"):
+            values = [usage.get(key) for usage in usages]
+            totals[key] = None if any(value is None for value in values) else sum(int(v) for v in values)  # type: ignore[arg-type]
+        return MappingProxyType(totals)
+
+
+def _is_bound_method(value: object) -> bool:
+    return getattr(value, "__self__", None) is not None and getattr(value, "__func__", None) is not None
+
+
+__all__ = ["HttpMetrics", "HttpMetricsSnapshot"]
@@ -0,0 +1,302 @@
+"""Recursos HTTP reactivos compartidos entre componentes."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable, Generic, TypeVar
+
+import httpx
+
+from fletplus.state import Signal
+
+from .scheduler import RequestPriority
+
+if TYPE_CHECKING:  # pragma: no cover - solo para tipado
+    from .client import HttpClient
+
+_T = TypeVar("_T")
+
+# URL normalizada, cabeceras, parser (``None`` para JSON) y prioridad.
+ResourceKey = tuple[str, tuple[tuple[str, str], ...], "Callable[[httpx.Response], Any] | None", str]
+
+logger = logging.getLogger(__name__)
+
+
+def _default_parser(response: httpx.Response) -> Any:
+    return response.json()
+
+
+class HttpResource(Generic[_T]):
+    """Valor remoto compartido que se comporta como una :class:`Signal`.
+
+    Se obtiene con :meth:`HttpClient.resource`. Expone ``get()``,
+    ``subscribe()`` y ``bind_control()`` como cualquier señal, por lo que
+    funciona con ``use_signal`` y ``watch``. Cuenta sus suscriptores: el
+    primero lanza la carga (si el valor es más antiguo que ``ttl``) y, con
+    ``interval``, el sondeo periódico; al irse el último, el sondeo se
+    detiene.
+
+    Las recargas envían ``If-None-Match``/``If-Modified-Since``; si el
+    servidor responde ``304`` o devuelve el mismo ``ETag`` no se vuelve a
+    parsear el cuerpo ni se notifica a los suscriptores. ``loading`` y
+    ``error`` son señales con el estado de la última petición.
+    """
+
+    def __init__(
+        self,
+        client: "HttpClient",
+        key: ResourceKey,
+        *,
+        headers: dict[str, str] | None = None,
+        interval: float | None = None,
+        ttl: float = 30.0,
+        parser: Callable[[httpx.Response], _T] | None = None,
+        priority: RequestPriority = "normal",
+        initial: _T | None = None,
+    ) -> None:
+        self._client = client
+        self.key = key
+        self.url = key[0]
+        self._path = httpx.URL(self.url).path
+        self._headers = dict(headers or {})
+        self._interval = interval
+        self.ttl = ttl
+        self._parser: Callable[[httpx.Response], Any] = parser or _default_parser
+        self._priority: RequestPriority = priority
+        self._value: Signal[_T | None] = Signal(initial)
+        self.loading: Signal[bool] = Signal(False)
+        self.error: Signal[Exception | None] = Signal(None)
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._fetched_at: float | None = None
+        self._observers = 0
+        self._poll_task: asyncio.Task[None] | None = None
+        self._inflight: asyncio.Task[_T | None] | None = None
+        self._inflight_forced = False
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    def get(self) -> _T | None:
+        return self._value.get()
+
+    # ------------------------------------------------------------------
+    def __call__(self) -> _T | None:
+        return self.get()
+
+    # ------------------------------------------------------------------
+    @property
+    def value(self) -> _T | None:
+        return self.get()
+
+    # ------------------------------------------------------------------
+    @property
+    def interval(self) -> float | None:
+        """Segundos entre sondeos mientras haya suscriptores (``None`` sin sondeo)."""
+
+        return self._interval
+
+    @interval.setter
+    def interval(self, value: float | None) -> None:
+        previous = self._interval
+        self._interval = value
+        if value == previous or self._observers == 0 or self._closed:
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # Fuera del bucle, el sondeo toma el valor nuevo en su siguiente vuelta.
+            return
+        # El sondeo en curso duerme con el intervalo anterior: se reinicia.
+        self._deactivate()
+        self._activate()
+
+    # ------------------------------------------------------------------
+    @property
+    def observers(self) -> int:
+        return self._observers
+
+    # ------------------------------------------------------------------
+    @property
+    def polling(self) -> bool:
+        return self._poll_task is not None and not self._poll_task.done()
+
+    # ------------------------------------------------------------------
+    def subscribe(self, callback: Callable[[_T | None], None], *, immediate: bool = False) -> Callable[[], None]:
+        """Suscribe ``callback`` al valor y activa la carga/sondeo si procede."""
+
+        unsubscribe_value = self._value.subscribe(callback, immediate=immediate)
+        self._observers += 1
+        if self._observers == 1:
+            self._activate()
+        released = False
+
+        def unsubscribe() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            unsubscribe_value()
+            self._observers -= 1
+            if self._observers == 0:
+                self._deactivate()
+
+        return unsubscribe
+
+    # ------------------------------------------------------------------
+    def bind_control(
+        self,
+        control: Any,
+        *,
+        attr: str = "value",
+        transform: Callable[[_T | None], object] | None = None,
+        update: bool = True,
+        immediate: bool = True,
+    ) -> Callable[[], None]:
+        def apply(value: _T | None) -> None:
+            setattr(control, attr, transform(value) if transform else value)
+            if update and hasattr(control, "update"):
+                control.update()
+
+        return self.subscribe(apply, immediate=immediate)
+
+    # ------------------------------------------------------------------
+    def is_stale(self) -> bool:
+        if self._fetched_at is None:
+            return True
+        return (time.monotonic() - self._fetched_at) >= self.ttl
+
+    # ------------------------------------------------------------------
+    async def refresh(self, *, force: bool = False) -> _T | None:
+        """Recarga el recurso y devuelve el valor actual.
+
+        Las llamadas concurrentes comparten la misma petición. Con
+        ``force=True`` y una recarga condicional en curso, la recarga forzada
+        se encadena detrás de ella en lugar de compartirla. Los errores no se
+        propagan: quedan publicados en :attr:`error`.
+        """
+
+        inflight = self._inflight
+        if inflight is not None and not inflight.done():
+            if force and not self._inflight_forced:
+                self._inflight = asyncio.ensure_future(self._fetch_after(inflight))
+                self._inflight_forced = True
+                return await asyncio.shield(self._inflight)
+            metrics = self._client.metrics
+            if metrics is not None and metrics.enabled:
+                metrics.record_coalesced("GET", self._path)
+            return await asyncio.shield(inflight)
+        self._inflight = asyncio.ensure_future(self._fetch(force=force))
+        self._inflight_forced = force
+        return await asyncio.shield(self._inflight)
+
+    # ------------------------------------------------------------------
+    def close(self) -> None:
+        """Detiene el sondeo y las cargas pendientes."""
+
+        self._closed = True
+        self._deactivate()
+        if self._inflight is not None and not self._inflight.done():
+            self._inflight.cancel()
+
+    # ------------------------------------------------------------------
+    async def _fetch(self, *, force: bool) -> _T | None:
+        headers = dict(self._headers)
+        conditional = not force and self._fetched_at is not None
+        if conditional:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            elif self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+        self.loading.set(True)
+        try:
+            response = await self._client.get(
+                self.url,
+                headers=headers,
+                # El recurso guarda su propio valor: las recargas van a la red
+                # para revalidar en lugar de servir la copia de disco.
+                cache=False if conditional else None,
+                context={"resource": self.url},
+                priority="background" if conditional else self._priority,
+            )
+            etag = response.headers.get("etag")
+            unchanged = response.status_code == 304 or (
+                conditional and etag is not None and etag == self._etag
+            )
+            if not unchanged:
+                response.raise_for_status()
+                self._value.set(self._parser(response))
+                self._etag = etag
+                self._last_modified = response.headers.get("last-modified")
+            self._fetched_at = time.monotonic()
+            self.error.set(None)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.debug("Fallo al recargar el recurso %s", self.url, exc_info=True)
+            self.error.set(exc)
+        finally:
+            self.loading.set(False)
+        return self._value.get()
+
+    # ------------------------------------------------------------------
+    async def _fetch_after(self, previous: asyncio.Future[Any]) -> _T | None:
+        try:
+            await asyncio.wait([previous])
+        except asyncio.CancelledError:
+            previous.cancel()
+            raise
+        return await self._fetch(force=True)
+
+    # ------------------------------------------------------------------
+    def _activate(self) -> None:
+        if self._closed:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Sin bucle activo no hay sondeo automático; ``refresh()`` sigue disponible.
+            return
+        if self.interval is not None:
+            if not self.polling:
+                self._poll_task = loop.create_task(self._poll())
+        elif self.is_stale() and (self._inflight is None or self._inflight.done()):
+            self._inflight = loop.create_task(self._fetch(force=False))
+            self._inflight_forced = False
+
+    # ------------------------------------------------------------------
+    def _deactivate(self) -> None:
+        task = self._poll_task
+        self._poll_task = None
+        if task is not None and not task.done():
+            task.cancel()
+
+    # ------------------------------------------------------------------
+    async def _poll(self) -> None:
+        if self.is_stale():
+            await self.refresh()
+        while self._observers > 0 and not self._closed and self._interval is not None:
+            await asyncio.sleep(self._interval)
+            await self.refresh()
+
+
+def _build_resource_key(
+    url: httpx.URL,
+    headers: dict[str, str] | None,
+    parser: Callable[[httpx.Response], Any] | None = None,
+    priority: RequestPriority = "normal",
+) -> ResourceKey:
+    """Normaliza la petición para que las llamadas equivalentes compartan recurso.
+
+    El parser forma parte de la clave por identidad: dos parsers distintos
+    producen valores distintos y no pueden compartir la misma señal.
+    """
+
+    params = sorted(url.params.multi_items())
+    normalized = url.copy_with(params=params) if params else url
+    header_items = tuple(sorted((name.lower(), value) for name, value in (headers or {}).items()))
+    return (str(normalized), header_items, parser, priority)
+
+
+__all__ = ["HttpResource"]
@@ -0,0 +1,288 @@
+"""Planificador de concurrencia y prioridades para :class:`HttpClient`."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Literal, Mapping
+
+from fletplus.state import Signal
+
+RequestPriority = Literal["critical", "normal", "background"]
+
+_PRIORITIES: tuple[RequestPriority, ...] = ("critical", "normal", "background")
+
+
+class RequestCancelledError(RuntimeError):
+    """Se lanza cuando una petición en cola se cancela antes de enviarse."""
+
+
+@dataclass(slots=True)
+class _Waiter:
+    host: str
+    priority: RequestPriority
+    future: asyncio.Future[None]
+    sequence: int
+
+
+@dataclass(frozen=True, slots=True)
+class SchedulerStats:
+    """Instantánea inmutable del estado del planificador."""
+
+    active: int = 0
+    queued: int = 0
+    active_by_priority: Mapping[str, int] = field(default_factory=dict)
+    queued_by_priority: Mapping[str, int] = field(default_factory=dict)
+    active_by_host: Mapping[str, int] = field(default_factory=dict)
+    queued_by_host: Mapping[str, int] = field(default_factory=dict)
+    dispatched: int = 0
+    cancelled: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "active_by_priority": dict(self.active_by_priority),
+            "queued_by_priority": dict(self.queued_by_priority),
+            "active_by_host": dict(self.active_by_host),
+            "queued_by_host": dict(self.queued_by_host),
+            "dispatched": self.dispatched,
+            "cancelled": self.cancelled,
+        }
+
+
+class RequestScheduler:
+    """Limita la concurrencia global y por host aplicando prioridades.
+
+    Las peticiones ``critical`` se despachan antes que las ``normal`` y estas
+    antes que las ``background``. Dentro de cada prioridad la cola rota entre
+    hosts para que un único origen no acapare los huecos libres. Las
+    peticiones ``background`` nunca ocupan más de ``max_background`` huecos,
+    de modo que siempre queda capacidad para las interactivas.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = 16,
+        max_per_host: int = 6,
+        max_background: int | None = None,
+    ) -> None:
+        for name, value in (("max_concurrency", max_concurrency), ("max_per_host", max_per_host)):
+            if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                raise ValueError(f"{name} debe ser un entero mayor o igual a 1.")
+        if max_background is None:
+            max_background = max(1, max_concurrency // 2)
+        if not isinstance(max_background, int) or isinstance(max_background, bool) or max_background < 1:
+            raise ValueError("max_background debe ser None o un entero mayor o igual a 1.")
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self.max_background = min(max_background, max_concurrency)
+        self._queues: dict[RequestPriority, OrderedDict[str, deque[_Waiter]]] = {
+            priority: OrderedDict() for priority in _PRIORITIES
+        }
+        self._active = 0
+        self._active_by_priority: dict[str, int] = {priority: 0 for priority in _PRIORITIES}
+        self._active_by_host: dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._dispatched = 0
+        self._cancelled = 0
+        self.stats: Signal[SchedulerStats] = Signal(SchedulerStats())
+
+    # ------------------------------------------------------------------
+    @property
+    def active(self) -> int:
+        return self._active
+
+    # ------------------------------------------------------------------
+    @property
+    def queued(self) -> int:
+        return sum(len(waiters) for queue in self._queues.values() for waiters in queue.values())
+
+    # ------------------------------------------------------------------
+    def queue_depth(self, priority: RequestPriority | None = None, *, host: str | None = None) -> int:
+        """Devuelve cuántas peticiones esperan, filtrando por prioridad y host."""
+
+        priorities = _PRIORITIES if priority is None else (_validate_priority(priority),)
+        total = 0
+        for name in priorities:
+            queue = self._queues[name]
+            if host is None:
+                total += sum(len(waiters) for waiters in queue.values())
+            else:
+                total += len(queue.get(host, ()))
+        return total
+
+    # ------------------------------------------------------------------
+    @contextlib.asynccontextmanager
+    async def slot(self, host: str, priority: RequestPriority = "normal") -> AsyncIterator[None]:
+        """Reserva un hueco para ``host`` durante la vida del contexto."""
+
+        await self.acquire(host, priority)
+        try:
+            yield
+        finally:
+            self.release(host, priority)
+
+    # ------------------------------------------------------------------
+    async def acquire(self, host: str, priority: RequestPriority = "normal") -> None:
+        """Espera hasta obtener un hueco; debe emparejarse con :meth:`release`."""
+
+        priority = _validate_priority(priority)
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            host=host,
+            priority=priority,
+            future=loop.create_future(),
+            sequence=next(self._sequence),
+        )
+        self._queues[priority].setdefault(host, deque()).append(waiter)
+        self._dispatch()
+        self._publish()
+        if waiter.future.done():
+            waiter.future.result()
+            return
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled() and waiter.future.exception() is None:
+                # El hueco se concedió justo antes de cancelar: se devuelve.
+                self.release(host, priority)
+            else:
+                self._discard(waiter)
+            raise
+
+    # ------------------------------------------------------------------
+    def release(self, host: str, priority: RequestPriority = "normal") -> None:
+        self._active = max(0, self._active - 1)
+        self._active_by_priority[priority] = max(0, self._active_by_priority[priority] - 1)
+        remaining = self._active_by_host.get(host, 0) - 1
+        if remaining > 0:
+            self._active_by_host[host] = remaining
+        else:
+            self._active_by_host.pop(host, None)
+        self._dispatch()
+        self._publish()
+
+    # ------------------------------------------------------------------
+    def cancel_queued(
+        self,
+        priority: RequestPriority = "background",
+        *,
+        host: str | None = None,
+    ) -> int:
+        """Cancela las peticiones aún en cola y devuelve cuántas se descartaron.
+
+        Las peticiones afectadas terminan con :class:`RequestCancelledError`;
+        las que ya se están enviando no se interrumpen.
+        """
+
+        queue = self._queues[_validate_priority(priority)]
+        hosts = list(queue) if host is None else [host]
+        cancelled = 0
+        for name in hosts:
+            waiters = queue.pop(name, None)
+            if not waiters:
+                continue
+            for waiter in waiters:
+                if not waiter.future.done():
+                    waiter.future.set_exception(
+                        RequestCancelledError(f"Petición {priority} a '{name}' cancelada en cola.")
+                    )
+                    cancelled += 1
+        self._cancelled += cancelled
+        if cancelled:
+            self._publish()
+        return cancelled
+
+    # ------------------------------------------------------------------
+    def snapshot(self) -> SchedulerStats:
+        queued_by_priority = {priority: self.queue_depth(priority) for priority in _PRIORITIES}
+        queued_by_host: dict[str, int] = {}
+        for queue in self._queues.values():
+            for host, waiters in queue.items():
+                queued_by_host[host] = queued_by_host.get(host, 0) + len(waiters)
+        return SchedulerStats(
+            active=self._active,
+            queued=sum(queued_by_priority.values()),
+            active_by_priority=MappingProxyType(dict(self._active_by_priority)),
+            queued_by_priority=MappingProxyType(queued_by_priority),
+            active_by_host=MappingProxyType(dict(self._active_by_host)),
+            queued_by_host=MappingProxyType(queued_by_host),
+            dispatched=self._dispatched,
+            cancelled=self._cancelled,
+        )
+
+    # ------------------------------------------------------------------
+    def _has_capacity(self, host: str, priority: RequestPriority) -> bool:
+        if self._active >= self.max_concurrency:
+            return False
+        if self._active_by_host.get(host, 0) >= self.max_per_host:
+            return False
+        if priority == "background" and self._active_by_priority["background"] >= self.max_background:
+            return False
+        return True
+
+    # ------------------------------------------------------------------
+    def _dispatch(self) -> None:
+        for priority in _PRIORITIES:
+            queue = self._queues[priority]
+            progressed = True
+            while progressed and queue and self._active < self.max_concurrency:
+                progressed = False
+                # Round-robin entre hosts: el host servido pasa al final.
+                for host in list(queue):
+                    if not self._has_capacity(host, priority):
+                        continue
+                    waiters = queue[host]
+                    waiter = waiters.popleft()
+                    if waiters:
+                        queue.move_to_end(host)
+                    else:
+                        del queue[host]
+                    if waiter.future.done():
+                        progressed = True
+                        break
+                    self._active += 1
+                    self._active_by_priority[priority] += 1
+                    self._active_by_host[host] = self._active_by_host.get(host, 0) + 1
+                    self._dispatched += 1
+                    waiter.future.set_result(None)
+                    progressed = True
+                    break
+            if queue and self._active >= self.max_concurrency:
+                return
+
+    # ------------------------------------------------------------------
+    def _discard(self, waiter: _Waiter) -> None:
+        queue = self._queues[waiter.priority]
+        waiters = queue.get(waiter.host)
+        if waiters is None:
+            return
+        with contextlib.suppress(ValueError):
+            waiters.remove(waiter)
+        if not waiters:
+            del queue[waiter.host]
+        self._publish()
+
+    # ------------------------------------------------------------------
+    def _publish(self) -> None:
+        self.stats.set(self.snapshot())
+
+
+def _validate_priority(priority: str) -> RequestPriority:
+    if priority not in _PRIORITIES:
+        raise ValueError("priority debe ser 'critical', 'normal' o 'background'.")
+    return priority  # type: ignore[return-value]
+
+
+__all__ = [
+    "RequestCancelledError",
+    "RequestPriority",
+    "RequestScheduler",
+    "SchedulerStats",
+]
@@ -18,6 +18,8 @@ LAZY_IMPORTS = {
     "responsive_text": "fletplus.utils.responsive_typography",
     "responsive_spacing": "fletplus.utils.responsive_typography",
     "ResponsiveManager": "fletplus.utils.responsive_manager",
+    "ResponsiveDispatcher": "fletplus.utils.responsive_dispatcher",
+    "request_page_update": "fletplus.utils.responsive_dispatcher",
     "BreakpointRegistry": "fletplus.utils.responsive_breakpoints",
     "ShortcutManager": "fletplus.utils.shortcut_manager",
     "FileDropZone": "fletplus.utils.dragdrop",
@@ -52,6 +54,10 @@ if TYPE_CHECKING:
     )
     from fletplus.utils.dragdrop import FileDropZone
     from fletplus.utils.responsive_breakpoints import BreakpointRegistry
+    from fletplus.utils.responsive_dispatcher import (
+        ResponsiveDispatcher,
+        request_page_update,
+    )
     from fletplus.utils.responsive_manager import ResponsiveManager
     from fletplus.utils.responsive_style import ResponsiveStyle
     from fletplus.utils.responsive_typography import (
@@ -79,6 +85,8 @@ __all__ = [
     "responsive_text",
     "responsive_spacing",
     "ResponsiveManager",
+    "ResponsiveDispatcher",
+    "request_page_update",
     "BreakpointRegistry",
     "ShortcutManager",
     "FileDropZone",
@@ -0,0 +1,211 @@
+"""Despachador único de ``page.on_resize`` por página.
+
+Cada :class:`~fletplus.utils.responsive_manager.ResponsiveManager` se
+suscribe al despachador de su página en lugar de encadenar su propio
+``on_resize``. Por cada evento, el despachador calcula
+:class:`~fletplus.utils.viewport.ViewportInfo` una vez por catálogo de
+perfiles y resuelve el breakpoint activo una vez por conjunto de
+breakpoints. Después avisa solo a los suscriptores afectados y pide un
+único refresco de la página. Los refrescos solicitados con
+:func:`request_page_update` durante el despacho se agrupan en ese refresco
+final.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+import flet as ft
+
+from fletplus.utils.device_profiles import DEFAULT_DEVICE_PROFILES, DeviceProfile
+from fletplus.utils.flet_compat import safe_request_page_update
+from fletplus.utils.viewport import ViewportInfo, viewport_info
+
+_PAGE_ATTR = "_fletplus_responsive_dispatcher"
+
+ResizeCallback = Callable[[ViewportInfo, Optional[ft.ControlEvent]], None]
+ResizeFilter = Callable[[ViewportInfo, Optional[int], Optional[int]], bool]
+
+
+def _select(keys: Tuple[int, ...], value: int) -> Optional[int]:
+    # ``keys`` está ordenado de mayor a menor.
+    for bp in keys:
+        if value >= bp:
+            return bp
+    return None
+
+
+class _Subscription:
+    __slots__ = ("callback", "width_keys", "height_keys", "profiles", "should_dispatch", "active")
+
+    def __init__(
+        self,
+        callback: ResizeCallback,
+        width_keys: Tuple[int, ...],
+        height_keys: Tuple[int, ...],
+        profiles: Tuple[DeviceProfile, ...],
+        should_dispatch: Optional[ResizeFilter],
+    ) -> None:
+        self.callback = callback
+        self.width_keys = width_keys
+        self.height_keys = height_keys
+        self.profiles = profiles
+        self.should_dispatch = should_dispatch
+        self.active = True
+
+
+class ResponsiveDispatcher:
+    """Reparte los eventos de resize de una página entre sus suscriptores.
+
+    Se obtiene con :meth:`for_page`, que crea uno por página y lo instala en
+    ``page.on_resize`` con la primera suscripción. El handler que hubiera
+    antes se sigue llamando después de cada despacho y se restaura al
+    cancelar la última suscripción.
+    """
+
+    def __init__(self, page: ft.Page) -> None:
+        self.page = page
+        self.dispatch_count = 0
+        self._subscriptions: Dict[int, _Subscription] = {}
+        self._next_id = 0
+        self._depth = 0
+        self._installed = False
+        self._previous_on_resize: Any = None
+        # Referencia estable para comprobar si sigue instalado en la página.
+        self._handler = self.dispatch
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def for_page(cls, page: ft.Page) -> "ResponsiveDispatcher":
+        """Devuelve el despachador de ``page``, creándolo si no existe."""
+
+        dispatcher = getattr(page, _PAGE_ATTR, None)
+        if isinstance(dispatcher, cls):
+            return dispatcher
+        dispatcher = cls(page)
+        try:
+            setattr(page, _PAGE_ATTR, dispatcher)
+        except AttributeError:  # pragma: no cover - páginas sin atributos dinámicos
+            pass
+        return dispatcher
+
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    # ------------------------------------------------------------------
+    @property
+    def dispatching(self) -> bool:
+        """``True`` mientras se reparte un evento."""
+
+        return self._depth > 0
+
+    # ------------------------------------------------------------------
+    def subscribe(
+        self,
+        callback: ResizeCallback,
+        *,
+        width_breakpoints: Iterable[int] = (),
+        height_breakpoints: Iterable[int] = (),
+        profiles: Sequence[DeviceProfile] | None = None,
+        should_dispatch: ResizeFilter | None = None,
+    ) -> Callable[[], None]:
+        """Registra ``callback(info, event)`` y devuelve la función para cancelarlo.
+
+        Si se indica ``should_dispatch(info, breakpoint_ancho,
+        breakpoint_alto)``, ``callback`` solo se llama cuando devuelve
+        ``True``. Los breakpoints activos se resuelven una vez por evento
+        para cada conjunto ``(width_breakpoints, height_breakpoints)``
+        distinto.
+        """
+
+        subscription = _Subscription(
+            callback,
+            tuple(sorted(set(width_breakpoints), reverse=True)),
+            tuple(sorted(set(height_breakpoints), reverse=True)),
+            tuple(profiles) if profiles else DEFAULT_DEVICE_PROFILES,
+            should_dispatch,
+        )
+        key = self._next_id
+        self._next_id += 1
+        self._subscriptions[key] = subscription
+        self._install()
+
+        def unsubscribe() -> None:
+            removed = self._subscriptions.pop(key, None)
+            if removed is None:
+                return
+            removed.active = False
+            if not self._subscriptions:
+                self._uninstall()
+
+        return unsubscribe
+
+    # ------------------------------------------------------------------
+    def dispatch(self, event: ft.ControlEvent | None = None) -> None:
+        """Reparte un evento de resize y refresca la página una vez."""
+
+        self.dispatch_count += 1
+        infos: Dict[int, ViewportInfo] = {}
+        breakpoints: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], Tuple[Optional[int], Optional[int]]] = {}
+        self._depth += 1
+        try:
+            for subscription in list(self._subscriptions.values()):
+                if not subscription.active:
+                    continue
+                info = infos.get(id(subscription.profiles))
+                if info is None:
+                    info = viewport_info(self.page, profiles=subscription.profiles)
+                    infos[id(subscription.profiles)] = info
+                if subscription.should_dispatch is not None:
+                    group = (subscription.width_keys, subscription.height_keys)
+                    active = breakpoints.get(group)
+                    if active is None:
+                        active = (
+                            _select(subscription.width_keys, info.width),
+                            _select(subscription.height_keys, info.height),
+                        )
+                        breakpoints[group] = active
+                    if not subscription.should_dispatch(info, *active):
+                        continue
+                subscription.callback(info, event)
+        finally:
+            self._depth -= 1
+
+        if self._subscriptions:
+            safe_request_page_update(self.page)
+        previous = self._previous_on_resize
+        if callable(previous):
+            previous(event)
+
+    # ------------------------------------------------------------------
+    def _install(self) -> None:
+        if self._installed:
+            return
+        self._previous_on_resize = getattr(self.page, "on_resize", None)
+        self.page.on_resize = self._handler
+        self._installed = True
+
+    def _uninstall(self) -> None:
+        if getattr(self.page, "on_resize", None) is self._handler:
+            self.page.on_resize = self._previous_on_resize
+        self._previous_on_resize = None
+        self._installed = False
+
+
+def request_page_update(
+    page: ft.Page, update: Callable[[ft.Page], None] | None = None
+) -> None:
+    """Refresca ``page`` salvo durante un despacho, que ya refresca al terminar.
+
+    ``update`` es la función de refresco a usar fuera del despacho (por
+    defecto, :func:`~fletplus.utils.flet_compat.safe_request_page_update`).
+    """
+
+    dispatcher = getattr(page, _PAGE_ATTR, None)
+    if isinstance(dispatcher, ResponsiveDispatcher) and dispatcher.dispatching:
+        return
+    (update or safe_request_page_update)(page)
+
+
+__all__ = ["ResponsiveDispatcher", "request_page_update"]
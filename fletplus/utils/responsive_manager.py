@@ -1,8 +1,11 @@
 """Gestor de breakpoints para responder a cambios de tamaño de la página."""
 from __future__ import annotations
 
+import asyncio
 import importlib
 import importlib.util
+import threading
+import time
 from typing import Callable, Dict, Mapping, Sequence
 
 import flet as ft
@@ -11,12 +14,16 @@ from fletplus.styles import Style
 from fletplus.utils.device_profiles import (
     DEFAULT_DEVICE_PROFILES,
     DeviceProfile,
+    get_device_profile,
 )
-from fletplus.utils.flet_compat import safe_request_page_update
 from fletplus.utils.responsive_breakpoints import BreakpointRegistry
+from fletplus.utils.responsive_dispatcher import ResponsiveDispatcher, request_page_update
 from fletplus.utils.responsive_manager_rs import apply_styles as _apply_styles_rs
 from fletplus.utils.responsive_style import ResponsiveStyle
 from fletplus.utils.viewport import (
+    ViewportInfo,
+    orientation_from_size,
+    safe_page_size,
     viewport_info,
 )
 
@@ -46,6 +53,50 @@ _STYLE_ATTRS = (
 
 MISSING = object()
 
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class _LoopTimer:
+    """Temporizador de un solo disparo sobre el bucle de eventos de la página.
+
+    Puede armarse y cancelarse desde cualquier hilo; ``callback`` se ejecuta
+    siempre en el hilo del bucle, como los manejadores de eventos de Flet.
+    """
+
+    __slots__ = ("_loop", "_handle", "_cancelled")
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, delay: float, callback: Callable[[], None]
+    ) -> None:
+        self._loop = loop
+        self._handle: asyncio.TimerHandle | None = None
+        self._cancelled = False
+
+        def arm() -> None:
+            if not self._cancelled:
+                self._handle = loop.call_later(delay, callback)
+
+        if _running_loop() is loop:
+            arm()
+        else:
+            loop.call_soon_threadsafe(arm)
+
+    def cancel(self) -> None:
+        self._cancelled = True
+        handle = self._handle
+        if handle is None:
+            return
+        if _running_loop() is self._loop:
+            handle.cancel()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(handle.cancel)
+
+
 _spec = importlib.util.find_spec("fletplus.utils._native")
 if _spec is None:
     _native = None
@@ -68,10 +119,32 @@ else:
         También permite aplicar estilos diferentes a controles según el breakpoint
         actual del ancho de la página.
 
+        Durante el arrastre de una ventana Flet emite ráfagas de
+        ``on_resize``. ``resize_debounce`` (segundos sin eventos) y
+        ``resize_throttle`` (intervalo mínimo entre procesamientos, p. ej.
+        ``1 / 60`` para alinearse con los fotogramas) permiten saltarse los
+        tamaños intermedios; con ambos, ``resize_throttle`` es la espera
+        máxima durante un arrastre continuo. ``resize_leading`` procesa el
+        primer evento de cada ráfaga y ``resize_trailing`` el último al
+        terminar la espera.
+        Con ``immediate_on_breakpoint`` un evento que cruza un breakpoint,
+        la orientación o el dispositivo se procesa siempre en el acto.
+        :attr:`resize_stats` cuenta los eventos recibidos, procesados y
+        agrupados. Los eventos diferidos se procesan en el bucle de eventos
+        de la página, el mismo hilo que los manejadores de Flet; solo una
+        página sin sesión (sin ``page.loop``) recurre a un temporizador en
+        otro hilo.
+
+        Los gestores de una misma página comparten un
+        :class:`~fletplus.utils.responsive_dispatcher.ResponsiveDispatcher`:
+        cada evento calcula el viewport una vez, solo se procesan los
+        gestores con algún cambio relevante y la página se refresca una vez.
+
         Nota:
             Cuando una vista se desmonta o deja de usar esta instancia, se debe
-            llamar a :meth:`dispose` para restaurar el handler previo de
-            ``page.on_resize`` y liberar estado interno.
+            llamar a :meth:`dispose` para cancelar su suscripción (y restaurar
+            el handler previo de ``page.on_resize`` si era la última) y liberar
+            estado interno.
         """
 
         def __init__(
@@ -82,8 +155,19 @@ else:
             orientation_callbacks: Dict[str, Callable[[str], None]] | None = None,
             device_callbacks: Dict[str, Callable[[str], None]] | None = None,
             device_profiles: Sequence[DeviceProfile] | None = None,
+            *,
+            resize_debounce: float = 0.0,
+            resize_throttle: float = 0.0,
+            resize_leading: bool = True,
+            resize_trailing: bool = True,
+            immediate_on_breakpoint: bool = True,
         ) -> None:
             self.page = page
+            self.resize_debounce = max(0.0, float(resize_debounce))
+            self.resize_throttle = max(0.0, float(resize_throttle))
+            self.resize_leading = resize_leading
+            self.resize_trailing = resize_trailing
+            self.immediate_on_breakpoint = immediate_on_breakpoint
             self.breakpoints = {
                 BreakpointRegistry.resolve(bp): callback
                 for bp, callback in (breakpoints or {}).items()
@@ -113,28 +197,36 @@ else:
             self._style_state: dict[ft.Control, dict[str, dict[str, object]]] = {}
             self._disposed = False
 
-            self._previous_on_resize = getattr(self.page, "on_resize", None)
-
-            def _combined_resize(event: ft.ControlEvent | None = None) -> None:
-                if self._disposed:
-                    return
-                self._handle_resize(event)
-                if callable(self._previous_on_resize):
-                    self._previous_on_resize(event)
-
-            self._on_resize_wrapper = _combined_resize
-            self.page.on_resize = self._on_resize_wrapper
+            self._resize_lock = threading.RLock()
+            self._resize_timer: _LoopTimer | threading.Timer | None = None
+            self._pending_event: ft.ControlEvent | None = None
+            self._has_pending = False
+            self._last_handled = float("-inf")
+            self._resize_counts = {"received": 0, "handled": 0, "coalesced": 0, "immediate": 0}
+
+            self._dispatcher = ResponsiveDispatcher.for_page(self.page)
+            self._unsubscribe = self._dispatcher.subscribe(
+                self._dispatch_resize,
+                width_breakpoints=self._width_bp_keys,
+                height_breakpoints=self._height_bp_keys,
+                profiles=self.device_profiles,
+                should_dispatch=self._needs_resize,
+            )
             self._handle_resize()
 
         # ------------------------------------------------------------------
         def dispose(self) -> None:
-            """Libera recursos internos y restaura ``page.on_resize`` si aplica."""
+            """Cancela la suscripción al despachador y libera recursos internos."""
 
             if self._disposed:
                 return
 
-            if getattr(self.page, "on_resize", None) is self._on_resize_wrapper:
-                self.page.on_resize = self._previous_on_resize
+            self._unsubscribe()
+
+            with self._resize_lock:
+                self._cancel_resize_timer()
+                self._has_pending = False
+                self._pending_event = None
 
             self._styles.clear()
             self._style_state.clear()
@@ -147,6 +239,184 @@ else:
 
             self._disposed = True
 
+        # ------------------------------------------------------------------
+        @property
+        def resize_stats(self) -> dict[str, int]:
+            """Contadores de eventos de resize.
+
+            ``received`` son los eventos recibidos, ``handled`` las veces que
+            se procesó un resize, ``coalesced`` los eventos absorbidos por un
+            procesamiento posterior o descartados, e ``immediate`` los que se
+            procesaron en el acto por cruzar un breakpoint.
+            """
+
+            with self._resize_lock:
+                return dict(self._resize_counts)
+
+        # ------------------------------------------------------------------
+        def flush_resize(self) -> None:
+            """Procesa ya el evento de resize pendiente, si lo hay."""
+
+            with self._resize_lock:
+                self._cancel_resize_timer()
+                if self._has_pending and not self._disposed:
+                    self._run_resize(self._pending_event, pending=True)
+
+        # ------------------------------------------------------------------
+        def _needs_resize(
+            self, info: ViewportInfo, width_bp: int | None, height_bp: int | None
+        ) -> bool:
+            """Filtro del despachador: descarta los eventos que no cambian nada.
+
+            Con debounce, throttle o estilos registrados todos los eventos
+            pasan. Los descartados solo actualizan :attr:`current_viewport`.
+            """
+
+            if self._disposed:
+                return False
+            if (
+                self.resize_debounce
+                or self.resize_throttle
+                or self._styles
+                or width_bp != self._current_width_bp
+                or height_bp != self._current_height_bp
+                or (self.orientation_callbacks and info.orientation != self._current_orientation)
+                or (self.device_callbacks and info.profile.name != self._current_device)
+            ):
+                return True
+            self.current_viewport = info
+            return False
+
+        def _dispatch_resize(self, info: ViewportInfo, event: ft.ControlEvent | None) -> None:
+            if not self._disposed:
+                self._schedule_resize(event, info)
+
+        # ------------------------------------------------------------------
+        def _schedule_resize(
+            self, event: ft.ControlEvent | None, info: ViewportInfo | None = None
+        ) -> None:
+            with self._resize_lock:
+                counts = self._resize_counts
+                counts["received"] += 1
+                if not self.resize_debounce and not self.resize_throttle:
+                    self._run_resize(event, info=info)
+                    return
+
+                if self.immediate_on_breakpoint and self._crosses_breakpoint(info):
+                    counts["immediate"] += 1
+                    self._cancel_resize_timer()
+                    self._run_resize(event, info=info)
+                    return
+
+                now = time.monotonic()
+                since_last = now - self._last_handled
+                burst_start = self._resize_timer is None
+                if (
+                    burst_start
+                    and self.resize_leading
+                    and since_last >= self.resize_throttle
+                ):
+                    self._run_resize(event, info=info)
+                    if self.resize_debounce:
+                        # Marca la ráfaga: los eventos siguientes esperan al final.
+                        self._arm_resize_timer(self.resize_debounce)
+                    return
+
+                if self._has_pending:
+                    counts["coalesced"] += 1
+                self._has_pending = True
+                self._pending_event = event
+
+                delay = self.resize_debounce
+                if self.resize_throttle:
+                    remaining = max(0.0, self.resize_throttle - since_last)
+                    delay = min(delay, remaining) if delay else remaining
+                    if self._resize_timer is not None and not self.resize_debounce:
+                        # Con throttle puro el temporizador en curso ya marca el límite.
+                        return
+                self._arm_resize_timer(delay)
+
+        # ------------------------------------------------------------------
+        def _arm_resize_timer(self, delay: float) -> None:
+            self._cancel_resize_timer()
+            loop = self._page_loop()
+            timer: _LoopTimer | threading.Timer
+            if loop is not None:
+                timer = _LoopTimer(loop, delay, lambda: self._resize_timer_fired(timer))
+            else:
+                timer = threading.Timer(delay, lambda: self._resize_timer_fired(timer))
+                timer.daemon = True
+                timer.start()
+            self._resize_timer = timer
+
+        def _page_loop(self) -> asyncio.AbstractEventLoop | None:
+            try:
+                loop = self.page.loop
+            except (AttributeError, RuntimeError):
+                return None
+            if not isinstance(loop, asyncio.AbstractEventLoop) or loop.is_closed():
+                return None
+            return loop
+
+        def _cancel_resize_timer(self) -> None:
+            if self._resize_timer is not None:
+                self._resize_timer.cancel()
+                self._resize_timer = None
+
+        def _resize_timer_fired(self, timer: _LoopTimer | threading.Timer) -> None:
+            with self._resize_lock:
+                if self._resize_timer is not timer:
+                    # Cancelado o sustituido mientras esperaba.
+                    return
+                self._resize_timer = None
+                if not self._has_pending or self._disposed:
+                    return
+                if self.resize_trailing:
+                    self._run_resize(self._pending_event, pending=True)
+                else:
+                    self._resize_counts["coalesced"] += 1
+                    self._has_pending = False
+                    self._pending_event = None
+
+        def _run_resize(
+            self,
+            event: ft.ControlEvent | None,
+            *,
+            pending: bool = False,
+            info: ViewportInfo | None = None,
+        ) -> None:
+            if self._has_pending:
+                # Un evento pendiente que no es el procesado queda absorbido.
+                if not pending:
+                    self._resize_counts["coalesced"] += 1
+                self._has_pending = False
+                self._pending_event = None
+            self._resize_counts["handled"] += 1
+            self._last_handled = time.monotonic()
+            self._handle_resize(event, info)
+
+        # ------------------------------------------------------------------
+        def _crosses_breakpoint(self, info: ViewportInfo | None = None) -> bool:
+            """Indica si el tamaño actual cambia algún breakpoint activo."""
+
+            if info is not None:
+                width, height = info.width, info.height
+            else:
+                width, height = safe_page_size(self.page)
+            bp_w = next((bp for bp in self._width_bp_keys if width >= bp), None)
+            if bp_w != self._current_width_bp:
+                return True
+            bp_h = next((bp for bp in self._height_bp_keys if height >= bp), None)
+            if bp_h != self._current_height_bp:
+                return True
+            if orientation_from_size(width, height) != self._current_orientation:
+                return True
+            if self.device_callbacks and self.device_profiles:
+                profile = get_device_profile(width, self.device_profiles)
+                if profile.name != self._current_device:
+                    return True
+            return False
+
         # ------------------------------------------------------------------
         @staticmethod
         def normalize_breakpoints(
@@ -190,6 +460,23 @@ else:
                 pass
             self._apply_style(control)
 
+        # ------------------------------------------------------------------
+        def update_base_attributes(self, control: ft.Control, **attrs: object) -> None:
+            """Cambia los atributos base de ``control`` y reaplica su estilo.
+
+            Sirve para que un layout ajuste, por ejemplo, el ``padding`` de un
+            control con estilos registrados sin pisar el valor que impone el
+            estilo activo. Si ``control`` no tiene estilos se asignan tal cual.
+            """
+
+            state = self._style_state.get(control)
+            if state is None or control not in self._styles:
+                for attr, value in attrs.items():
+                    self._safe_setattr(control, attr, value)
+                return
+            state["base"].update(attrs)
+            self._apply_style(control)
+
         # ------------------------------------------------------------------
         def _apply_style(self, control: ft.Control) -> None:
             state = self._style_state.get(control)
@@ -202,24 +489,65 @@ else:
                 state = {"base": self._capture_base_attributes(control)}
                 self._style_state[control] = state
 
+            state["selection"] = self._style_selection(rstyle)
+            updates: list[tuple[ft.Control, str, object]] = []
             base = state["base"]
             for attr in _STYLE_ATTRS:
                 value = base.get(attr, MISSING)
                 if value is not MISSING:
-                    self._safe_setattr(control, attr, value)
+                    updates.append((control, attr, value))
 
             style = rstyle.get_style(self.page)
-            if not style:
-                return
+            if style:
+                styled_container = style.apply(control)
 
-            styled_container = style.apply(control)
+                for attr in _STYLE_ATTRS:
+                    if hasattr(control, attr):
+                        value = getattr(styled_container, attr, None)
+                        # Si el Style declara el campo, se aplica incluso si es None.
+                        if style.declares_container_attr(attr) or value is not None:
+                            updates.append((control, attr, value))
 
-            for attr in _STYLE_ATTRS:
-                if hasattr(control, attr):
-                    value = getattr(styled_container, attr, None)
-                    # Si el Style declara el campo, se aplica incluso si es None.
-                    if style.declares_container_attr(attr) or value is not None:
-                        self._safe_setattr(control, attr, value)
+            self._apply_attr_updates(updates)
+
+        # ------------------------------------------------------------------
+        def _style_selection(self, rstyle: ResponsiveStyle) -> object:
+            """Clave de los estilos que ``rstyle`` elige para la página actual."""
+
+            selection_key = getattr(rstyle, "selection_key", None)
+            if not callable(selection_key):
+                # Sin clave no se puede saber si cambió: se resuelve siempre.
+                return object()
+            return selection_key(self.page)
+
+        # ------------------------------------------------------------------
+        def _apply_attr_updates(
+            self, updates: Sequence[tuple[ft.Control, str, object]]
+        ) -> int:
+            """Asigna solo los atributos cuyo valor final difiere del actual.
+
+            ``updates`` puede repetir ``(control, atributo)``, por ejemplo al
+            restaurar la base y aplicar después el estilo; gana el último
+            valor. Devuelve el número de atributos asignados.
+            """
+
+            final: dict[tuple[int, str], tuple[ft.Control, str, object]] = {}
+            for control, attr, value in updates:
+                final[(id(control), attr)] = (control, attr, value)
+
+            changed = 0
+            for control, attr, value in final.values():
+                current = getattr(control, attr, MISSING)
+                if current is value:
+                    continue
+                try:
+                    if current is not MISSING and current == value:
+                        continue
+                except Exception:  # pragma: no cover - comparación defensiva
+                    pass
+                self._safe_setattr(control, attr, value)
+                changed += 1
+            return changed
 
         # ------------------------------------------------------------------
         def _capture_base_attributes(self, control: ft.Control) -> dict[str, object]:
@@ -239,9 +567,14 @@ else:
                 pass
 
         # ------------------------------------------------------------------
-        def _handle_resize(self, _event: ft.ControlEvent | None = None) -> None:
+        def _handle_resize(
+            self,
+            _event: ft.ControlEvent | None = None,
+            info: ViewportInfo | None = None,
+        ) -> None:
             page = self.page
-            info = viewport_info(page, profiles=self.device_profiles)
+            if info is None:
+                info = viewport_info(page, profiles=self.device_profiles)
             self.current_viewport = info
             width = info.width
             height = info.height
@@ -290,22 +623,32 @@ else:
                     if device_callback:
                         device_callback(profile.name)
 
-            # Aplicar estilos
+            # Aplicar estilos solo a los controles cuya selección cambió
             if self._styles:
-                base_attrs_map = {
-                    control: state["base"]
-                    for control, state in self._style_state.items()
-                    if not state.get("dynamic_attrs", True)
-                }
-                updates = _apply_styles_rs(
-                    list(self._styles.items()),
-                    list(_STYLE_ATTRS),
-                    base_attrs_map=base_attrs_map or None,
-                )
-                for control, attr, value in updates:
-                    self._safe_setattr(control, attr, value)
-
-            safe_request_page_update(page)
+                transitions: list[tuple[ft.Control, ResponsiveStyle]] = []
+                for control, rstyle in self._styles.items():
+                    state = self._style_state.setdefault(
+                        control, {"base": self._capture_base_attributes(control)}
+                    )
+                    selection = self._style_selection(rstyle)
+                    if state.get("selection", MISSING) != selection:
+                        state["selection"] = selection
+                        transitions.append((control, rstyle))
+
+                if transitions:
+                    base_attrs_map = {
+                        control: self._style_state[control]["base"]
+                        for control, _ in transitions
+                        if not self._style_state[control].get("dynamic_attrs", True)
+                    }
+                    updates = _apply_styles_rs(
+                        transitions,
+                        list(_STYLE_ATTRS),
+                        base_attrs_map=base_attrs_map or None,
+                    )
+                    self._apply_attr_updates(updates)
+
+            request_page_update(page)
 
 
 __all__ = ["ResponsiveManager"]
@@ -143,6 +143,40 @@ class ResponsiveStyle:
                 data[field] = value
         return Style(**data)
 
+    # ------------------------------------------------------------------
+    def _device_key(self, page: ft.Page) -> Optional[str]:
+        if not self.device:
+            return None
+        if _is_mobile(page) and "mobile" in self.device:
+            return "mobile"
+        if _is_tablet(page) and "tablet" in self.device:
+            return "tablet"
+        if _is_web(page) and "web" in self.device:
+            return "web"
+        if _is_large_desktop(page) and "large_desktop" in self.device:
+            return "large_desktop"
+        if _is_desktop(page) and "desktop" in self.device:
+            return "desktop"
+        return None
+
+    # ------------------------------------------------------------------
+    def selection_key(self, page: ft.Page) -> tuple[object, ...]:
+        """Identifica qué estilos parciales elige :meth:`get_style` para ``page``.
+
+        Devuelve ``(dispositivo, breakpoint_ancho, breakpoint_alto,
+        orientación)``; mientras la clave no cambie, ``get_style`` devuelve
+        un estilo equivalente.
+        """
+
+        width_bp = select_breakpoint(self._width_keys, page.width or 0) if self.width else None
+        height_bp = (
+            select_breakpoint(self._height_keys, page.height or 0) if self.height else None
+        )
+        orientation = None
+        if self.orientation:
+            orientation = "landscape" if (page.width or 0) >= (page.height or 0) else "portrait"
+        return (self._device_key(page), width_bp, height_bp, orientation)
+
     # ------------------------------------------------------------------
     def get_style(self, page: ft.Page) -> Optional[Style]:
         """Devuelve el :class:`Style` adecuado para ``page``."""
@@ -150,19 +184,11 @@ class ResponsiveStyle:
         style = self.base
 
         # Dispositivo
-        if self.device:
-            if _is_mobile(page) and "mobile" in self.device:
-                style = self._merge(style, self.device["mobile"])
-            elif _is_tablet(page) and "tablet" in self.device:
-                style = self._merge(style, self.device["tablet"])
-            elif _is_web(page) and "web" in self.device:
-                style = self._merge(style, self.device["web"])
-            elif _is_large_desktop(page) and "large_desktop" in self.device:
-                if "desktop" in self.device:
-                    style = self._merge(style, self.device["desktop"])
-                style = self._merge(style, self.device["large_desktop"])
-            elif _is_desktop(page) and "desktop" in self.device:
-                style = self._merge(style, self.device["desktop"])
+        device = self._device_key(page)
+        if device == "large_desktop" and "desktop" in self.device:
+            style = self._merge(style, self.device["desktop"])
+        if device is not None:
+            style = self._merge(style, self.device[device])
 
         # Breakpoints por ancho
         if self.width:
@@ -48,6 +48,7 @@ class ResponsiveTypography:
     def _register_cleanup(self) -> None:
         def _cleanup(_: ft.ControlEvent) -> None:
             _INSTANCES.pop(self.page, None)
+            self._manager.dispose()
 
         for attr in ("on_close", "on_disconnect"):
             existing = getattr(self.page, attr, None)
@@ -6,6 +6,7 @@ import flet as ft
 
 from fletplus.utils.breakpoint_rs import select_breakpoint
 from fletplus.utils.responsive_breakpoints import BreakpointRegistry
+from fletplus.utils.responsive_dispatcher import request_page_update
 from fletplus.utils.responsive_manager import ResponsiveManager
 
 
@@ -54,19 +55,23 @@ class ResponsiveVisibility:
             return None
         return mapping.get(bp)
 
+    def _refresh(self) -> None:
+        # Durante un despacho de resize el refresco se agrupa en el del despachador.
+        request_page_update(self.page, lambda page: page.update())
+
     def _update_width(self, width: int) -> None:
         vis = self._select_visibility(self._width_vis, self._width_keys, width)
         if vis is not None:
             self.control.visible = vis
-            self.page.update()
+            self._refresh()
 
     def _update_height(self, height: int) -> None:
         vis = self._select_visibility(self._height_vis, self._height_keys, height)
         if vis is not None:
             self.control.visible = vis
-            self.page.update()
+            self._refresh()
 
     def _update_orientation(self, orientation: str) -> None:
         if orientation in self._orientation_vis:
             self.control.visible = self._orientation_vis[orientation]
-            self.page.update()
+            self._refresh()
@@ -0,0 +1,178 @@
+"""Benchmarks de ``SmartTable`` con conjuntos sintéticos de 10k, 100k y 1M filas.
+
+Cada caso escribe sus métricas en ``smart_table_<backend>_<filas>.json``
+dentro de ``FLETPLUS_PERF_DIR`` (o del directorio temporal del test) para
+comparar resultados entre versiones. El caso de 1M filas solo se ejecuta
+con ``FLETPLUS_PERF_LARGE=1``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+import pytest
+
+import fletplus.components.smart_table as smart_table_module
+from fletplus.components.smart_table import SmartTable, SmartTableColumn
+
+_SIZES = [
+    10_000,
+    100_000,
+    pytest.param(
+        1_000_000,
+        marks=pytest.mark.skipif(
+            os.environ.get("FLETPLUS_PERF_LARGE") != "1",
+            reason="1M filas solo con FLETPLUS_PERF_LARGE=1",
+        ),
+    ),
+]
+# Por encima de este tamaño no se construye la tabla completa sin ventana.
+_FULL_BUILD_LIMIT = 100_000
+
+
+def _available_backends() -> Iterable[str]:
+    backends = ["python", "columnar"]
+    if getattr(smart_table_module._SMART_TABLE_RS, "apply_query", None) is not None:
+        backends.append("rust")
+    return backends
+
+
+def _columns() -> List[SmartTableColumn]:
+    return [
+        SmartTableColumn("id", "ID"),
+        SmartTableColumn("name", "Nombre", filterable=True, editable=True),
+        SmartTableColumn("dept", "Departamento", filterable=True),
+        SmartTableColumn("score", "Puntos", filterable=True),
+        SmartTableColumn("joined", "Alta"),
+    ]
+
+
+def _rows(size: int) -> List[Dict[str, Any]]:
+    rng = random.Random(size)
+    depts = [f"Dept {idx}" for idx in range(50)]
+    return [
+        {
+            "id": idx,
+            "name": f"Persona {rng.randint(0, size)}",
+            "dept": rng.choice(depts),
+            "score": rng.random() * 1000,
+            "joined": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        }
+        for idx in range(size)
+    ]
+
+
+def _timed(action: Callable[[], Any]) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = action()
+    return time.perf_counter() - start, result
+
+
+def _storage(backend: str) -> str:
+    return "columnar" if backend == "columnar" else "records"
+
+
+def _run(backend: str, size: int, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    metrics: Dict[str, Any] = {}
+
+    metrics["ingest_s"], table = _timed(
+        lambda: SmartTable(_columns(), rows, window_size=50, storage=_storage(backend))
+    )
+    metrics["build_s"], _ = _timed(table.build)
+
+    metrics["filter_s"], _ = _timed(lambda: table.set_filter("name", "7"))
+    metrics["filtered_rows"] = len(table._view_records)
+
+    def multi_sort() -> None:
+        table.toggle_sort("dept")
+        table.toggle_sort("score", multi=True)
+
+    metrics["multi_sort_s"], _ = _timed(multi_sort)
+
+    table._query_cache.clear()
+    metrics["refresh_cold_s"], _ = _timed(table.refresh)
+    metrics["refresh_warm_s"], _ = _timed(table.refresh)
+    metrics["window_controls"] = len(table._table.rows)
+    metrics["window_cells"] = sum(len(row.cells) for row in table._table.rows)
+
+    edited = [record.row_id for record in table._view_records[:100]]
+
+    def edit_and_save() -> None:
+        table.start_edits(edited)
+        for row_id in edited:
+            table._edit_buffers[row_id]["name"] = f"Editada {row_id}"
+        table.save_rows(edited)
+
+    metrics["edit_save_100_s"], _ = _timed(edit_and_save)
+
+    if size <= _FULL_BUILD_LIMIT:
+        full = SmartTable(_columns(), rows[:size], storage=_storage(backend))
+        metrics["full_build_s"], _ = _timed(full.build)
+        metrics["full_controls"] = len(full._table.rows)
+
+    def provider(query, start, end):
+        return rows[start:end]
+
+    def page_through() -> int:
+        paged = SmartTable(_columns(), data_provider=provider, page_size=1000, total_rows=size)
+        while not paged._exhausted:
+            paged.load_more(sync=True)
+        return len(paged._records)
+
+    metrics["paging_s"], loaded = _timed(page_through)
+    assert loaded == size
+    return metrics
+
+
+def _peak_memory(backend: str, rows: List[Dict[str, Any]]) -> int:
+    """Pico de memoria de la ingesta y la primera consulta, medido aparte."""
+
+    tracemalloc.start()
+    try:
+        table = SmartTable(_columns(), rows, window_size=50, storage=_storage(backend))
+        table.build()
+        table.toggle_sort("score")
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("size", _SIZES)
+@pytest.mark.parametrize("backend", _available_backends())
+def test_smart_table_benchmarks(
+    backend: str, size: int, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if backend != "rust":
+        monkeypatch.setattr(smart_table_module, "_SMART_TABLE_RS", None)
+    rows = _rows(size)
+
+    metrics = _run(backend, size, rows)
+    metrics["peak_memory_bytes"] = _peak_memory(backend, rows)
+
+    assert metrics["filtered_rows"] > 0
+    assert metrics["window_controls"] <= 50 + 2 * 10 + 1
+    assert all(value >= 0 for value in metrics.values())
+
+    output_dir = Path(os.environ.get("FLETPLUS_PERF_DIR") or tmp_path)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    result = {
+        "benchmark": "smart_table",
+        "backend": backend,
+        "rows": size,
+        "python": platform.python_version(),
+        "timestamp": time.time(),
+        "metrics": {
+            key: round(value, 6) if isinstance(value, float) else value
+            for key, value in metrics.items()
+        },
+    }
+    (output_dir / f"smart_table_{backend}_{size}.json").write_text(
+        json.dumps(result, indent=2), "utf-8"
+    )
@@ -178,3 +178,128 @@ def test_disk_cache_sets_permissions(tmp_path: Path):
     mode = stat.S_IMODE(files[0].stat().st_mode)
     assert mode == 0o600
     assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_disk_cache_sharded_layout_and_compression_roundtrip(tmp_path: Path):
+    cache = DiskCache(tmp_path, layout="sharded", compression="zlib")
+    request = _make_request("https://example.org/large.json")
+    body = b'{"items": [' + b",".join(b'{"id": %d, "name": "item"}' % idx for idx in range(200)) + b"]}"
+    response = httpx.Response(200, headers={"Content-Type": "application/json"}, content=body, request=request)
+    image = httpx.Response(200, headers={"Content-Type": "image/png"}, content=b"\x89PNG" * 400)
+
+    key = cache.build_key(request)
+    cache.set(key, response)
+    cache.set("imagen", image)
+
+    assert not list(tmp_path.glob("*.json"))
+    sharded = tmp_path / key[:2] / key[2:4] / f"{key}.json"
+    assert sharded.exists()
+    assert cache.get(key, request=request).read() == body
+    assert cache.get("imagen").read() == b"\x89PNG" * 400
+
+    stats = cache.stats()
+    assert stats.entries == 2
+    assert stats.compressed_entries == 1
+    assert stats.content_bytes == len(body) + 1600
+    assert stats.stored_content_bytes < stats.content_bytes
+    assert stats.compression_ratio > 1
+
+    cache.clear()
+    assert cache.stats().entries == 0
+
+
+def test_disk_cache_migrates_flat_entries_to_sharded(tmp_path: Path):
+    flat = DiskCache(tmp_path)
+    keys = []
+    for idx in range(4):
+        request = _make_request(f"https://example.org/items/{idx}")
+        key = flat.build_key(request)
+        flat.set(key, httpx.Response(200, headers={"Content-Type": "text/plain"}, content=b"x" * 2048))
+        keys.append(key)
+
+    before = flat.stats()
+    migrated = DiskCache(tmp_path, layout="sharded", compression="zlib", migrate=False).migrate()
+
+    assert migrated.moved == 4
+    assert migrated.recompressed == 4
+    assert migrated.before == before
+    assert migrated.after.entries == 4
+    assert migrated.after.disk_bytes < migrated.before.disk_bytes
+    assert not list(tmp_path.glob("*.json"))
+
+    reopened = DiskCache(tmp_path, layout="sharded")
+    assert all(reopened.get(key).read() == b"x" * 2048 for key in keys)
+
+
+def test_disk_cache_sharded_moves_flat_entries_on_read(tmp_path: Path):
+    flat = DiskCache(tmp_path)
+    keys = [flat.build_key(_make_request(f"https://example.org/items/{idx}")) for idx in range(3)]
+    for key in keys:
+        flat.set(key, httpx.Response(200, content=b"plano"))
+
+    sharded = DiskCache(tmp_path, layout="sharded")
+    assert len(list(tmp_path.glob("*.json"))) == 3
+
+    assert sharded.get(keys[0]).read() == b"plano"
+    assert not (tmp_path / f"{keys[0]}.json").exists()
+    assert (tmp_path / keys[0][:2] / keys[0][2:4] / f"{keys[0]}.json").exists()
+    assert len(list(tmp_path.glob("*.json"))) == 2
+
+
+def test_disk_cache_cleanup_does_not_rescan_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cache = DiskCache(tmp_path, max_entries=8, max_age=60)
+    cache.set("inicial", httpx.Response(200, content=b"0"))
+
+    globs = []
+    original = Path.glob
+    monkeypatch.setattr(Path, "glob", lambda self, pattern: (globs.append(pattern), original(self, pattern))[1])
+    for idx in range(6):
+        cache.set(f"k{idx}", httpx.Response(200, content=b"x"))
+    cache.get("k5")
+    cache.set("k6", httpx.Response(200, content=b"x"))
+
+    assert globs == []
+    monkeypatch.undo()
+    assert len(list(tmp_path.glob("*.json"))) == 8
+
+
+def test_disk_cache_rescans_amortized_and_bounds_shared_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    first = DiskCache(tmp_path, max_entries=3)
+    second = DiskCache(tmp_path, max_entries=3)
+    for idx in range(6):
+        first.set(f"a{idx}", httpx.Response(200, content=b"x"))
+        second.set(f"b{idx}", httpx.Response(200, content=b"x"))
+        assert len(list(tmp_path.glob("*.json"))) <= 3
+
+    sharded = tmp_path / "sharded"
+    one = DiskCache(sharded, max_entries=3, layout="sharded")
+    other = DiskCache(sharded, max_entries=3, layout="sharded")
+    globs = []
+    original = Path.glob
+    monkeypatch.setattr(Path, "glob", lambda self, pattern: (globs.append(pattern), original(self, pattern))[1])
+    for idx in range(9):
+        one.set(f"s{idx}", httpx.Response(200, content=b"x"))
+        other.set(f"t{idx}", httpx.Response(200, content=b"x"))
+    monkeypatch.undo()
+    # Como mucho una relectura por cada ``max_entries`` escrituras de cada instancia.
+    assert globs.count("*/*/*.json") <= 2 * (9 // 3)
+    # Sin fecha de directorio fiable, el exceso se limita a una ronda de escrituras ajenas.
+    assert len(list(sharded.glob("*/*/*.json"))) <= 6
+
+
+def test_disk_cache_clear_removes_unmigrated_flat_entries(tmp_path: Path):
+    flat = DiskCache(tmp_path)
+    flat.set("legado", httpx.Response(200, content=b"plano"))
+
+    sharded = DiskCache(tmp_path, layout="sharded")
+    sharded.clear()
+
+    assert not list(tmp_path.glob("*.json"))
+    assert sharded.get("legado") is None
+
+
+def test_disk_cache_rejects_invalid_layout_and_compression(tmp_path: Path):
+    with pytest.raises(ValueError, match="layout"):
+        DiskCache(tmp_path, layout="nested")  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="compression"):
+        DiskCache(tmp_path, compression="gzip")  # type: ignore[arg-type]
@@ -1,11 +1,22 @@
+import asyncio
+import contextlib
+import gzip
 import importlib
+import json
 from pathlib import Path
 from typing import Any
 
 import httpx
 import pytest
 
-from fletplus.http import DiskCache, HttpClient, HttpInterceptor
+from fletplus.http import (
+    DiskCache,
+    HttpClient,
+    HttpInterceptor,
+    HttpMetrics,
+    RequestCancelledError,
+    RequestScheduler,
+)
 from fletplus.http.client import _build_websocket_response, _WebSocketConnection
 
 
@@ -1148,3 +1159,490 @@ async def test_http_client_allows_configuring_sensitive_query_params(tmp_path: P
     assert respuesta1.json() == {"value": 1}
     assert respuesta2.json() == {"value": 1}
     assert call_count == 1
+
+
+@pytest.mark.anyio
+async def test_http_client_scheduler_limits_concurrency_per_host():
+    in_flight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await release.wait()
+        in_flight[host] -= 1
+        return httpx.Response(200)
+
+    scheduler = RequestScheduler(max_concurrency=3, max_per_host=2)
+    client = HttpClient(transport=httpx.MockTransport(handler), scheduler=scheduler)
+
+    tasks = [
+        asyncio.create_task(client.get(f"https://{host}.example.org/items", cache=False))
+        for host in ("a", "a", "a", "b", "b")
+    ]
+    await asyncio.sleep(0.01)
+    assert scheduler.active == 3
+    assert scheduler.queue_depth() == 2
+    assert scheduler.stats.get().queued == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    await client.aclose()
+
+    assert peak["a.example.org"] == 2
+    assert scheduler.active == 0
+    assert scheduler.stats.get().dispatched == 5
+
+
+@pytest.mark.anyio
+async def test_http_client_scheduler_prioritizes_and_cancels_background():
+    order: list[str] = []
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        order.append(request.url.path)
+        if request.url.path == "/blocker":
+            await release.wait()
+        return httpx.Response(200)
+
+    scheduler = RequestScheduler(max_concurrency=1, max_per_host=1)
+    client = HttpClient(transport=httpx.MockTransport(handler), scheduler=scheduler)
+
+    blocker = asyncio.create_task(client.get("https://example.org/blocker"))
+    await asyncio.sleep(0.01)
+    background = asyncio.create_task(client.get("https://example.org/prefetch", priority="background"))
+    normal = asyncio.create_task(client.get("https://example.org/normal"))
+    critical = asyncio.create_task(client.get("https://example.org/critical", priority="critical"))
+    await asyncio.sleep(0.01)
+    assert scheduler.queue_depth("background") == 1
+
+    assert client.cancel_queued() == 1
+    release.set()
+    await asyncio.gather(blocker, normal, critical)
+    with pytest.raises(RequestCancelledError):
+        await background
+    await client.aclose()
+
+    assert order == ["/blocker", "/critical", "/normal"]
+    assert scheduler.stats.get().cancelled == 1
+
+
+def test_request_scheduler_rejects_invalid_limits():
+    with pytest.raises(ValueError, match="max_concurrency"):
+        RequestScheduler(max_concurrency=0)
+    with pytest.raises(ValueError, match="max_per_host"):
+        RequestScheduler(max_per_host=0)
+
+
+@pytest.mark.anyio
+async def test_http_client_map_bounds_concurrency_and_preserves_order():
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        item = int(request.url.path.rsplit("/", 1)[-1])
+        await asyncio.sleep(0.001 * (10 - item))
+        in_flight -= 1
+        return httpx.Response(200, json={"item": item})
+
+    client = HttpClient(transport=httpx.MockTransport(handler))
+    urls = [f"https://example.org/items/{idx}" for idx in range(10)]
+
+    unordered = [result async for result in client.map(urls, concurrency=3)]
+    ordered = await client.gather(urls, concurrency=3)
+    await client.aclose()
+
+    assert peak == 3
+    assert sorted(result.index for result in unordered) == list(range(10))
+    assert [result.response.json()["item"] for result in ordered] == list(range(10))
+
+
+@pytest.mark.anyio
+async def test_http_client_map_error_policies_and_cache(tmp_path: Path):
+    calls: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path == "/boom":
+            raise httpx.ConnectError("boom", request=request)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    client = HttpClient(cache=DiskCache(tmp_path), transport=httpx.MockTransport(handler))
+    specs = [
+        "https://example.org/a",
+        {"url": "https://example.org/boom"},
+        {"method": "get", "url": "https://example.org/a"},
+    ]
+
+    returned = await client.gather(specs, concurrency=1, on_error="return")
+    skipped = [result async for result in client.map(specs, concurrency=1, on_error="skip")]
+    with pytest.raises(httpx.ConnectError):
+        await client.gather(specs, concurrency=1)
+    await client.aclose()
+
+    assert [result.ok for result in returned] == [True, False, True]
+    assert isinstance(returned[1].error, httpx.ConnectError)
+    assert [result.index for result in skipped] == [0, 2]
+    assert calls.count("/a") == 1  # Las repeticiones se sirven desde caché
+
+
+@pytest.mark.anyio
+async def test_http_client_map_stops_scheduling_when_consumer_stops():
+    started: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        started.append(request.url.path)
+        return httpx.Response(200)
+
+    client = HttpClient(transport=httpx.MockTransport(handler))
+
+    def urls():
+        for idx in range(100):
+            yield f"https://example.org/items/{idx}"
+
+    iterator = client.map(urls(), concurrency=2)
+    async with contextlib.aclosing(iterator):
+        async for _result in iterator:
+            break
+    await client.aclose()
+
+    assert len(started) <= 2
+    with pytest.raises(ValueError, match="concurrency"):
+        await client.gather(["https://example.org"], concurrency=0)
+
+
+@pytest.mark.anyio
+async def test_http_client_metrics_aggregate_routes_and_cache(tmp_path: Path):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/fail":
+            raise httpx.ConnectError("boom", request=request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        if request.url.path == "/config":
+            return httpx.Response(200, headers={"ETag": '"v1"', "Cache-Control": "no-cache"}, content=b"{}")
+        return httpx.Response(200, content=b"0123456789")
+
+    metrics = HttpMetrics(route_templates=["/users/{name}"], publish_interval=0)
+    client = HttpClient(cache=DiskCache(tmp_path), transport=httpx.MockTransport(handler), metrics=metrics)
+
+    await client.get("https://example.org/items/1")
+    await client.get("https://example.org/items/2")
+    await client.get("https://example.org/items/2")
+    await client.get("https://example.org/users/ana")
+    await client.get("https://example.org/config")
+    await client.get("https://example.org/config")
+    await client.post("https://example.org/items/3", content=b"abc")
+    with pytest.raises(httpx.ConnectError):
+        await client.get("https://example.org/fail")
+    await client.aclose()
+
+    snapshot = metrics.stats.get()
+    assert snapshot.requests == 8
+    assert snapshot.errors == 1
+    assert snapshot.retries == 0
+    assert snapshot.in_flight == 0
+    assert snapshot.bytes_out == 3
+    assert snapshot.bytes_in == 10 * 4 + 2
+    assert snapshot.routes["GET /items/{id}"]["count"] == 3
+    assert snapshot.routes["GET /users/{name}"]["count"] == 1
+    assert snapshot.routes["POST /items/{id}"]["p50"] is not None
+    assert dict(snapshot.cache["disk"]) == {"hit": 1, "miss": 4, "revalidate": 1}
+
+    message = json.loads(metrics.to_json())
+    assert message["type"] == "http_metrics_snapshot"
+    assert message["payload"]["routes"]["GET /items/{id}"]["count"] == 3
+
+
+@pytest.mark.anyio
+async def test_http_metrics_publish_trailing_edge_and_wire_bytes():
+    body = gzip.compress(b"x" * 1000)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={"Content-Encoding": "gzip"})
+
+    metrics = HttpMetrics(publish_interval=0.05)
+    client = HttpClient(transport=httpx.MockTransport(handler), metrics=metrics)
+    for _ in range(3):
+        assert len((await client.get("https://example.org/data")).content) == 1000
+    # La primera petición publica; las demás esperan al final de la ventana.
+    assert metrics.stats.get().requests == 1
+
+    await asyncio.sleep(0.1)
+    snapshot = metrics.stats.get()
+    assert snapshot.requests == 3
+    assert snapshot.bytes_in == 3 * len(body)
+    await client.aclose()
+
+
+@pytest.mark.anyio
+async def test_http_client_retries_transport_errors_and_records_them():
+    attempts: dict[str, int] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        key = f"{request.method} {request.url.path}"
+        attempts[key] = attempts.get(key, 0) + 1
+        if request.url.path == "/flaky" and attempts[key] < 3:
+            raise httpx.ConnectError("boom", request=request)
+        if request.url.path == "/down":
+            raise httpx.ConnectError("boom", request=request)
+        return httpx.Response(200, content=b"ok")
+
+    metrics = HttpMetrics(publish_interval=0)
+    client = HttpClient(
+        transport=httpx.MockTransport(handler), metrics=metrics, retries=2, retry_backoff=0
+    )
+
+    assert (await client.get("https://example.org/flaky")).content == b"ok"
+    with pytest.raises(httpx.ConnectError):
+        await client.get("https://example.org/down")
+    # POST no es idempotente: falla al primer intento.
+    with pytest.raises(httpx.ConnectError):
+        await client.post("https://example.org/down", content=b"abc")
+    await client.aclose()
+
+    assert attempts == {"GET /flaky": 3, "GET /down": 3, "POST /down": 1}
+    snapshot = metrics.stats.get()
+    assert snapshot.retries == 4
+    assert snapshot.routes["GET /flaky"]["retries"] == 2
+    assert snapshot.routes["GET /down"]["retries"] == 2
+    assert snapshot.errors == 2
+    # Los bytes solo cuentan tras un envío completado.
+    assert snapshot.bytes_out == 0
+    with pytest.raises(ValueError, match="retries"):
+        HttpClient(retries=-1)
+
+
+@pytest.mark.anyio
+async def test_http_metrics_count_cancellations_and_cache_tier(tmp_path: Path):
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/slow":
+            await release.wait()
+        return httpx.Response(200, content=b"ok")
+
+    class _MemoryCache(DiskCache):
+        metrics_tier = "memory"
+
+    metrics = HttpMetrics(publish_interval=0)
+    client = HttpClient(
+        cache=_MemoryCache(tmp_path), transport=httpx.MockTransport(handler), metrics=metrics
+    )
+    task = asyncio.create_task(client.get("https://example.org/slow", cache=False))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await client.get("https://example.org/fast")
+    await client.aclose()
+
+    snapshot = metrics.stats.get()
+    assert snapshot.cancelled == 1
+    assert snapshot.errors == 0
+    assert snapshot.in_flight == 0
+    assert snapshot.routes["GET /slow"]["cancelled"] == 1
+    assert dict(snapshot.cache) == {"memory": {"hit": 0, "miss": 1, "revalidate": 0}}
+    with pytest.raises(ValueError, match="cache_tier"):
+        metrics.request_finished("GET", "/x", elapsed=0.0, cache_outcome="hit")
+
+
+def test_http_metrics_without_loop_publish_on_next_record_in_same_thread():
+    metrics = HttpMetrics(publish_interval=60)
+    metrics.request_started()
+    metrics.request_finished("GET", "/a", elapsed=0.01)
+    assert metrics.stats.get().requests == 1
+
+    published: list[int] = []
+    metrics.stats.subscribe(lambda snap: published.append(snap.requests))
+    metrics.request_started()
+    metrics.request_finished("GET", "/a", elapsed=0.01)
+    # Sin bucle no se arranca ningún temporizador en otro hilo.
+    assert metrics._pending_publish is None
+    assert metrics.stats.get().requests == 1
+
+    metrics.publish_interval = 0
+    metrics.record_coalesced("GET", "/a")
+    assert metrics.stats.get().requests == 2
+    assert published[-1] == 2
+
+
+def test_http_metrics_histogram_percentiles_are_ordered():
+    metrics = HttpMetrics(publish_interval=0)
+    for idx in range(100):
+        metrics.request_started()
+        metrics.request_finished("GET", "/slow", elapsed=(idx + 1) / 1000)
+
+    route = metrics.snapshot().routes["GET /slow"]
+    assert route["count"] == 100
+    assert 0.03 <= route["p50"] <= 0.07
+    assert route["p50"] <= route["p95"] <= route["p99"] <= route["max"] == 0.1
+
+
+@pytest.mark.anyio
+async def test_http_client_resource_is_shared_and_revalidates_with_etag():
+    calls: list[str | None] = []
+    version = {"etag": '"v1"', "value": 1}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.headers.get("If-None-Match"))
+        if version["etag"] is None:
+            return httpx.Response(503)
+        if request.headers.get("If-None-Match") == version["etag"]:
+            return httpx.Response(304, headers={"ETag": version["etag"]})
+        return httpx.Response(200, headers={"ETag": version["etag"]}, json={"value": version["value"]})
+
+    metrics = HttpMetrics(publish_interval=0)
+    client = HttpClient(transport=httpx.MockTransport(handler), metrics=metrics)
+    resource = client.resource("https://example.org/items?b=2&a=1")
+    assert client.resource("https://example.org/items", params={"a": 1, "b": 2}) is resource
+    # Reutilizar la instancia no es una petición deduplicada.
+    assert metrics.stats.get().coalesced == 0
+
+    received: list[object] = []
+    loading: list[bool] = []
+    resource.loading.subscribe(loading.append)
+    unsubscribe = resource.subscribe(received.append)
+    await asyncio.sleep(0.01)
+    assert resource.get() == {"value": 1}
+    assert loading == [True, False]
+
+    await resource.refresh()
+    assert calls == [None, '"v1"']
+    assert received == [{"value": 1}]  # El 304 no vuelve a notificar
+
+    version.update(etag='"v2"', value=2)
+    await resource.refresh()
+    assert received == [{"value": 1}, {"value": 2}]
+    assert resource.error.get() is None
+
+    version.update(etag=None)
+    assert await resource.refresh() == {"value": 2}
+    assert isinstance(resource.error.get(), httpx.HTTPStatusError)
+
+    unsubscribe()
+    await client.aclose()
+
+
+@pytest.mark.anyio
+async def test_http_client_resource_polls_only_while_observed():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, json={"calls": calls})
+
+    client = HttpClient(transport=httpx.MockTransport(handler))
+    resource = client.resource("https://example.org/status", interval=0.01)
+    assert not resource.polling
+
+    unsubscribe_a = resource.subscribe(lambda _value: None)
+    unsubscribe_b = resource.subscribe(lambda _value: None)
+    assert resource.observers == 2
+    await asyncio.sleep(0.05)
+    assert resource.polling
+    assert calls >= 3
+    assert resource.get() == {"calls": calls}
+
+    unsubscribe_a()
+    unsubscribe_a()
+    assert resource.polling
+    unsubscribe_b()
+    await asyncio.sleep(0)
+    assert not resource.polling
+    observed = calls
+    await asyncio.sleep(0.03)
+    assert calls == observed
+
+    with pytest.raises(ValueError, match="interval"):
+        client.resource("https://example.org/status", interval=0)
+    await client.aclose()
+
+
+@pytest.mark.anyio
+async def test_http_client_resource_applies_smaller_interval_and_counts_shared_refreshes():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"calls": calls})
+
+    metrics = HttpMetrics(publish_interval=0)
+    client = HttpClient(transport=httpx.MockTransport(handler), metrics=metrics)
+    resource = client.resource("https://example.org/feed", interval=60)
+
+    await asyncio.gather(resource.refresh(), resource.refresh(), resource.refresh())
+    assert calls == 1
+    assert metrics.snapshot().coalesced == 2
+
+    unsubscribe = resource.subscribe(lambda _value: None)
+    await asyncio.sleep(0.03)
+    observed = calls
+    assert client.resource("https://example.org/feed", interval=0.01) is resource
+    await asyncio.sleep(0.1)
+    assert calls >= observed + 3
+
+    unsubscribe()
+    await client.aclose()
+
+
+@pytest.mark.anyio
+async def test_http_client_resource_key_includes_parser_and_priority():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"value": 3})
+
+    def as_int(response: httpx.Response) -> int:
+        return response.json()["value"]
+
+    client = HttpClient(transport=httpx.MockTransport(handler))
+    raw = client.resource("https://example.org/value")
+    parsed = client.resource("https://example.org/value", parser=as_int)
+    assert parsed is not raw
+    assert client.resource("https://example.org/value", parser=as_int) is parsed
+    assert client.resource("https://example.org/value", priority="critical") is not raw
+
+    assert await raw.refresh() == {"value": 3}
+    assert await parsed.refresh() == 3
+    await client.aclose()
+
+
+@pytest.mark.anyio
+async def test_http_client_resource_forced_refresh_chains_after_inflight_load():
+    release = asyncio.Event()
+    seen: list[str | None] = []
+    version = {"value": 1}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("If-None-Match"))
+        if len(seen) == 2:
+            await release.wait()
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, headers={"ETag": '"v1"'}, json=version["value"])
+
+    client = HttpClient(transport=httpx.MockTransport(handler))
+    resource = client.resource("https://example.org/value")
+    assert await resource.refresh() == 1
+
+    # Recarga condicional en curso; el servidor cambia el valor sin cambiar el ETag.
+    conditional = asyncio.create_task(resource.refresh())
+    await asyncio.sleep(0.01)
+    version["value"] = 2
+    forced = asyncio.create_task(resource.refresh(force=True))
+    also_forced = asyncio.create_task(resource.refresh(force=True))
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert await conditional == 1
+    assert await forced == 2
+    assert await also_forced == 2
+    # La forzada sale después de la condicional y sin cabeceras condicionales.
+    assert seen == [None, '"v1"', None]
+    await client.aclose()
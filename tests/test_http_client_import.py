@@ -31,3 +31,21 @@ def test_disk_cache_import_error(monkeypatch):
 
         reloaded = importlib.reload(client)
         assert reloaded.DiskCache is reloaded._PyDiskCache
+
+
+def test_disk_cache_ignores_compiled_class_without_layout_options(monkeypatch):
+    client = importlib.import_module("fletplus.http.client")
+
+    class CompiledDiskCache:
+        def __init__(self, directory, max_entries=128, max_age=None):
+            pass
+
+    compiled = types.ModuleType("fletplus.http.disk_cache")
+    compiled.DiskCache = CompiledDiskCache
+    monkeypatch.setattr(client.importlib.util, "find_spec", lambda _: object())
+    monkeypatch.setattr(client.importlib, "import_module", lambda _: compiled)
+
+    assert client._load_disk_cache() is client._PyDiskCache
+
+    CompiledDiskCache.migrate = lambda self: None
+    assert client._load_disk_cache() is CompiledDiskCache
@@ -356,3 +356,114 @@ def test_responsive_grid_section_margin_and_header_adaptations(page_factory):
     assert header_container.gradient is None
     assert header_container.bgcolor == "#123456"
     assert grid._section_actions_row.alignment == ft.MainAxisAlignment.CENTER
+
+
+def test_responsive_grid_reuses_item_containers_on_rebuild(page_factory):
+    page = page_factory(width=1200, height=800)
+    items = [
+        ResponsiveGridItem(ft.Text("Tarjeta"), span_breakpoints={0: 12, 800: 6, 1100: 4}),
+        ResponsiveGridItem(ft.Text("Escritorio"), visible_devices=["desktop"]),
+        ResponsiveGridItem(ft.Text("Móvil"), visible_devices=["mobile"]),
+    ]
+    grid = ResponsiveGrid(items=items, breakpoints={0: 1, 800: 2, 1100: 3})
+
+    layout = grid.init_responsive(page)
+    row = layout.content if isinstance(layout, ft.Container) else layout
+    card, desktop = row.controls
+    assert [card.col, desktop.col] == [4, 4]
+
+    page.width = 400
+    page.on_resize(None)
+
+    assert row.controls[0] is card and row.controls[1] is desktop
+    assert card.col == 12
+    assert desktop.visible is False
+    mobile = row.controls[2]
+    assert mobile.content.value == "Móvil" and mobile.visible
+
+    page.width = 1200
+    page.on_resize(None)
+
+    assert [id(control) for control in row.controls] == [id(card), id(desktop), id(mobile)]
+    assert card.col == 4
+    assert desktop.visible and not mobile.visible
+
+
+def test_responsive_grid_plan_table_matches_direct_resolution():
+    items = [
+        ResponsiveGridItem(ft.Text("A"), span_breakpoints={0: 12, 700: 6, 1300: 3}),
+        ResponsiveGridItem(ft.Text("B"), span_devices={"tablet": 4}, hidden_devices="mobile"),
+        ResponsiveGridItem(ft.Text("C"), min_width=500, max_width=1199),
+    ]
+    grid = ResponsiveGrid(items=items)
+
+    for width in range(0, 2000, 13):
+        columns = grid._resolve_columns(width)
+        device = grid._resolve_device_name(width)
+        expected = tuple(
+            (index, item.resolve_span(width, columns, device))
+            for index, item in enumerate(items)
+            if item.is_visible(width, device)
+        )
+        assert grid._layout_plan(width) == expected
+
+
+def test_responsive_grid_plan_table_recomputes_only_when_items_change(monkeypatch):
+    grid = ResponsiveGrid(items=[ResponsiveGridItem(ft.Text("A"), span=6)])
+    calls = []
+    original = grid._plan_descriptors
+
+    def counting(*args):
+        calls.append(args)
+        return original(*args)
+
+    monkeypatch.setattr(grid, "_plan_descriptors", counting)
+
+    grid.build(400)
+    intervals = len(calls)
+    for width in (800, 1200, 1600, 400):
+        grid.build(width)
+    assert len(calls) == intervals
+
+    grid._items.append(ResponsiveGridItem(ft.Text("B"), min_width=900))
+    row = grid.build(1000)
+    assert len(calls) > intervals
+    assert [container.content.value for container in row.controls] == ["A", "B"]
+
+    grid._items[0].span = 3
+    grid.invalidate_layout_plan()
+    assert grid.build(1000).controls[0].col == 3
+
+
+def test_responsive_grid_keeps_style_padding_when_grid_spacing_changes(page_factory):
+    page = page_factory(width=1600, height=800)
+    style = ResponsiveStyle(
+        width={0: Style(bgcolor="#fff"), 1000: Style(bgcolor="#000", padding=5)}
+    )
+    grid = ResponsiveGrid(
+        items=[
+            ResponsiveGridItem(ft.Text("A"), responsive_style=style),
+            ResponsiveGridItem(ft.Text("B")),
+        ],
+        breakpoints={0: 1, 1100: 2, 1500: 3},
+        spacing=10,
+        adaptive_spacing=True,
+        spacing_scale={"desktop": 2.0, "large_desktop": 3.0},
+    )
+
+    layout = grid.init_responsive(page)
+    row = layout.content if isinstance(layout, ft.Container) else layout
+    styled, plain = row.controls
+    assert (styled.padding, plain.padding) == (5, 30)
+
+    # El grid cambia su espaciado, pero el estilo activo conserva su padding.
+    page.width = 1050
+    page.on_resize(None)
+    assert (styled.padding, plain.padding) == (5, 20)
+    assert styled.bgcolor == "#000"
+
+    # Al salir del estilo se restaura el padding del grid más reciente.
+    page.width = 900
+    page.on_resize(None)
+    assert styled.bgcolor == "#fff"
+    assert styled.padding == plain.padding == 20
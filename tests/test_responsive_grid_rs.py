@@ -5,7 +5,7 @@ import pytest
 
 from fletplus.components import responsive_grid
 from fletplus.components.responsive_grid import ResponsiveGrid, ResponsiveGridItem
-from fletplus.components.responsive_grid_rs import plan_items
+from fletplus.components.responsive_grid_rs import GridPlanCache, plan_items
 from fletplus.styles import Style
 from fletplus.utils.responsive_style import ResponsiveStyle
 
@@ -75,3 +75,61 @@ def test_build_row_uses_native_descriptors(monkeypatch):
     row = grid._build_row(800)
     assert len(row.controls) == 1
     assert row.controls[0].col == 5
+
+
+def test_layout_plan_reuses_native_cache_until_items_change(monkeypatch):
+    created = []
+
+    class FakeCache:
+        def __init__(self, items):
+            created.append(list(items))
+            self.items = list(items)
+
+        def plan_table(self, contexts):
+            return [[(index, 7) for index in range(len(self.items))] for _ in contexts]
+
+    monkeypatch.setattr(responsive_grid, "_GridPlanCache", FakeCache)
+    grid = ResponsiveGrid(items=[ResponsiveGridItem(ft.Text("A"), span=6)])
+
+    assert grid._build_row(800).controls[0].col == 7
+    grid.breakpoints = {0: 1, 500: 2}
+    grid._build_row(600)
+    assert len(created) == 1
+
+    grid._items.append(ResponsiveGridItem(ft.Text("B")))
+    assert [control.col for control in grid._build_row(600).controls] == [7, 7]
+    assert len(created) == 2
+
+
+@pytest.mark.skipif(GridPlanCache is None, reason="Extensión nativa no disponible")
+def test_native_plan_cache_matches_python_plan(monkeypatch):
+    def build_grid():
+        return ResponsiveGrid(
+            items=[
+                ResponsiveGridItem(ft.Text("A"), span=6, visible_devices=["desktop"]),
+                ResponsiveGridItem(ft.Text("B"), span_breakpoints={0: 12, 800: 4}),
+                ResponsiveGridItem(
+                    ft.Text("C"),
+                    span_devices={"mobile": 12, "desktop": 3},
+                    min_width=500,
+                    max_width=1400,
+                ),
+            ],
+            breakpoints={0: 1, 600: 2, 1000: 4},
+        )
+
+    native = build_grid()
+    native._ensure_layout_plan()
+    assert native._native_plan_cache is not None
+    assert len(native._native_plan_cache) == 3
+
+    monkeypatch.setattr(responsive_grid, "_GridPlanCache", None)
+    python = build_grid()
+    python._ensure_layout_plan()
+
+    assert native._plan_bounds == python._plan_bounds
+    assert native._plan_table == python._plan_table
+    for width in (320, 700, 900, 1200, 1600):
+        assert [c.col for c in native._build_row(width).controls] == [
+            c.col for c in python._build_row(width).controls
+        ]
@@ -1,7 +1,13 @@
+import asyncio
+import threading
+import time
+
 import flet as ft
 
 from fletplus.components.responsive_grid import ResponsiveGrid
 from fletplus.styles import Style
+from fletplus.utils import responsive_dispatcher
+from fletplus.utils.responsive_dispatcher import ResponsiveDispatcher
 from fletplus.utils.responsive_manager import ResponsiveManager
 from fletplus.utils.responsive_style import ResponsiveStyle
 
@@ -269,24 +275,62 @@ def test_responsive_manager_dispose_with_sequential_managers():
         },
     )
 
-    assert page.on_resize is manager_b._on_resize_wrapper
+    # Ambos gestores comparten el único handler del despachador de la página.
+    dispatcher = ResponsiveDispatcher.for_page(page)
+    assert page.on_resize == dispatcher.dispatch
+    assert len(dispatcher) == 2
 
     manager_a.dispose()
 
-    # El primer manager quedó encadenado como previous del segundo,
-    # pero al estar dispuesto no debe volver a disparar callbacks.
+    # El gestor dispuesto ya no recibe eventos.
     page.resize(600)
     assert calls == ["a", "b-small", "b-large"]
 
     manager_b.dispose()
-    assert page.on_resize is manager_a._on_resize_wrapper
+    # Sin suscriptores se restaura el handler original.
+    assert page.on_resize is None
 
-    # El wrapper restaurado pertenece a un manager dispuesto, por lo que
-    # no debe ejecutar callbacks adicionales.
     page.resize(700)
     assert calls == ["a", "b-small", "b-large"]
 
 
+def test_responsive_dispatcher_shares_viewport_and_updates_page_once(monkeypatch):
+    page = DummyPage(500, 800)
+    updates: list[int] = []
+    page.update = lambda: updates.append(page.width)
+    computed: list[int] = []
+    original_viewport_info = responsive_dispatcher.viewport_info
+
+    def counting_viewport_info(target, **kwargs):
+        computed.append(target.width)
+        return original_viewport_info(target, **kwargs)
+
+    monkeypatch.setattr(responsive_dispatcher, "viewport_info", counting_viewport_info)
+
+    rebuilt: list[str] = []
+    managers = [
+        ResponsiveManager(page, {0: lambda _w, i=i: rebuilt.append(f"{i}-small"), 600: lambda _w, i=i: rebuilt.append(f"{i}-large")})
+        for i in range(40)
+    ]
+    rebuilt.clear()
+    updates.clear()
+
+    page.resize(550)
+    assert computed == [550]
+    assert rebuilt == []
+    assert updates == [550]
+    assert all(manager.current_viewport.width == 550 for manager in managers)
+
+    page.resize(650)
+    assert computed == [550, 650]
+    assert len(rebuilt) == 40
+    assert updates == [550, 650]
+
+    for manager in managers:
+        manager.dispose()
+    assert page.on_resize is None
+
+
 def test_responsive_manager_exposes_current_viewport_snapshot():
     page = DummyPage(500, 800)
     manager = ResponsiveManager(page)
@@ -301,3 +345,120 @@ def test_responsive_manager_exposes_current_viewport_snapshot():
     assert manager.current_viewport.height == 700
     assert manager.current_viewport.orientation == "landscape"
     assert manager.current_viewport.profile.name == "desktop"
+
+
+def test_responsive_manager_debounce_coalesces_and_crosses_breakpoints_immediately():
+    page = DummyPage(500, 800)
+    calls: list[tuple[str, int]] = []
+    manager = ResponsiveManager(
+        page,
+        {
+            0: lambda w: calls.append(("small", w)),
+            600: lambda w: calls.append(("large", w)),
+        },
+        resize_debounce=60,
+    )
+
+    for width in (510, 520, 530, 540):
+        page.resize(width)
+    # El primer evento se procesa en el acto; el resto espera al final de la ráfaga.
+    assert manager.current_viewport.width == 510
+    assert manager.resize_stats == {"received": 4, "handled": 1, "coalesced": 2, "immediate": 0}
+
+    page.resize(650)
+    assert calls == [("small", 500), ("large", 650)]
+    assert manager.resize_stats == {"received": 5, "handled": 2, "coalesced": 3, "immediate": 1}
+
+    page.resize(660)
+    manager.flush_resize()
+    assert manager.current_viewport.width == 660
+    assert manager.resize_stats["handled"] == 3
+    manager.dispose()
+
+
+def test_responsive_manager_trailing_edge_applies_final_size():
+    page = DummyPage(500, 800)
+    manager = ResponsiveManager(page, resize_debounce=0.02)
+
+    for width in (510, 520, 530):
+        page.resize(width)
+    time.sleep(0.2)
+
+    assert manager.current_viewport.width == 530
+    assert manager.resize_stats == {"received": 3, "handled": 2, "coalesced": 1, "immediate": 0}
+
+
+def test_responsive_manager_throttle_without_trailing_drops_intermediate_sizes():
+    page = DummyPage(500, 800)
+    manager = ResponsiveManager(page, resize_throttle=0.02, resize_trailing=False)
+
+    for width in (510, 520, 530):
+        page.resize(width)
+    time.sleep(0.2)
+
+    assert manager.current_viewport.width == 510
+    assert manager.resize_stats == {"received": 3, "handled": 1, "coalesced": 2, "immediate": 0}
+
+    page.resize(540)
+    assert manager.current_viewport.width == 540
+
+
+def test_responsive_manager_runs_trailing_resize_on_page_loop():
+    async def scenario() -> tuple[list[int], ResponsiveManager]:
+        page = DummyPage(500, 800)
+        page.loop = asyncio.get_running_loop()
+        threads: list[int] = []
+        manager = ResponsiveManager(
+            page,
+            resize_debounce=0.02,
+        )
+        original = manager._handle_resize
+
+        def handle(*args):
+            threads.append(threading.get_ident())
+            original(*args)
+
+        manager._handle_resize = handle
+        for width in (510, 520, 530):
+            page.resize(width)
+        await asyncio.sleep(0.1)
+        return threads, manager
+
+    threads, manager = asyncio.run(scenario())
+    assert manager.current_viewport.width == 530
+    assert manager.resize_stats == {"received": 3, "handled": 2, "coalesced": 1, "immediate": 0}
+    # El evento final se procesa en el hilo del bucle, no en un temporizador aparte.
+    assert set(threads) == {threading.get_ident()}
+    manager.dispose()
+
+
+def test_responsive_manager_reapplies_styles_only_on_transitions():
+    page = DummyPage(500, 800)
+    manager = ResponsiveManager(page)
+    card = ft.Container()
+    banner = ft.Container()
+    manager.register_styles(
+        card,
+        ResponsiveStyle(
+            width={0: Style(bgcolor="#fff", padding=10), 700: Style(bgcolor="#000", padding=10)}
+        ),
+    )
+    manager.register_styles(banner, ResponsiveStyle(width={0: Style(bgcolor="#111")}))
+
+    assigned: list[tuple[ft.Control, str]] = []
+    original = manager._safe_setattr
+
+    def recording(control, attr, value):
+        assigned.append((control, attr))
+        original(control, attr, value)
+
+    manager._safe_setattr = recording
+
+    page.resize(600)
+    assert assigned == []
+
+    page.resize(800)
+    # Solo cambia la selección de ``card`` y, dentro de ella, solo ``bgcolor``.
+    assert assigned == [(card, "bgcolor")]
+    assert card.bgcolor == "#000"
+    assert banner.bgcolor == "#111"
@@ -1,11 +1,15 @@
 import asyncio
+import random
 
 import flet as ft
+import pytest
 
 from fletplus.components.smart_table import (
     SmartTable,
     SmartTableColumn,
     SmartTableQuery,
+    filter_lt,
+    filter_lte,
 )
 
 
@@ -74,6 +78,77 @@ def test_inline_editing_with_validation_and_callback():
     assert table._table.rows[0].selected is False
 
 
+
+def _approval_table(**kwargs):
+    def status_validator(value: str) -> None:
+        if value not in {"pendiente", "aprobado"}:
+            raise ValueError("Estado inválido")
+
+    columns = [
+        SmartTableColumn("id", "ID"),
+        SmartTableColumn("status", "Estado", editable=True, validator=status_validator),
+    ]
+    rows = [{"id": idx, "status": "pendiente"} for idx in range(6)]
+    table = SmartTable(columns, rows=rows, **kwargs)
+    table.build()
+    return table
+
+
+def test_save_rows_uses_single_batch_callback_and_refresh(monkeypatch):
+    batches = []
+    table = _approval_table(on_save_many=lambda rows: batches.append([row["id"] for row in rows]))
+    table.start_edits([1, 3, 4])
+    for row_id in (1, 3):
+        table._edit_buffers[row_id]["status"] = "aprobado"
+
+    refreshes = []
+    original = table.refresh
+    monkeypatch.setattr(table, "refresh", lambda: (refreshes.append(1), original()))
+    table.save_rows()
+
+    assert batches == [[1, 3]]
+    assert len(refreshes) == 1
+    assert not table._editing_rows and not table._edit_buffers
+    assert [record.values["status"] for record in table._records] == [
+        "pendiente",
+        "aprobado",
+        "pendiente",
+        "aprobado",
+        "pendiente",
+        "pendiente",
+    ]
+
+
+def test_save_rows_validates_whole_batch_before_applying():
+    saved = []
+    table = _approval_table(on_save=lambda row: saved.append(row["id"]))
+    table.start_edits([0, 2])
+    table._edit_buffers[0]["status"] = "aprobado"
+    table._edit_buffers[2]["status"] = "rechazado"
+
+    with pytest.raises(ValueError):
+        table.save_rows([0, 2])
+    assert table._records[0].values["status"] == "pendiente"
+
+    table._edit_buffers[2]["status"] = "aprobado"
+    table.save_rows([0, 2])
+    assert saved == [0, 2]
+
+    with pytest.raises(KeyError):
+        table.save_rows([99])
+
+
+def test_display_rows_do_not_allocate_edit_buffers():
+    table = _approval_table()
+    assert table._edit_buffers == {}
+
+    edit_button = table._table.rows[2].cells[-1].content
+    edit_button.on_click(type("Event", (), {"control": edit_button})())
+    assert table._editing_rows == {2}
+    assert list(table._edit_buffers) == [2]
+    assert table._record(2) is table._records[2]
+
+
 def test_toggle_sort_cycle_removes_sort():
     columns = [SmartTableColumn("id", "ID", sortable=True)]
     rows = [{"id": 2}, {"id": 1}]
@@ -133,3 +208,279 @@ def test_virtualized_async_provider_and_manual_refresh():
 
     table.set_filter("value", "Row 5")
     assert len(table._table.rows) == 1
+
+
+def _windowed_table(size: int = 1000, **kwargs) -> SmartTable:
+    columns = [
+        SmartTableColumn("id", "ID", sortable=True),
+        SmartTableColumn("name", "Nombre", filterable=True),
+    ]
+    rows = [{"id": idx, "name": f"Item {idx}"} for idx in range(size)]
+    return SmartTable(columns, rows=rows, window_size=20, overscan=5, row_height=40, **kwargs)
+
+
+def test_windowed_rendering_builds_only_viewport_rows():
+    table = _windowed_table()
+    built = table.build()
+
+    assert isinstance(built, ft.Column)
+    assert len(table._table.rows) == 25
+    assert table.visible_range == (0, 25)
+    assert table._top_spacer.height == 0
+    assert table._bottom_spacer.height == (1000 - 25) * 40
+
+    table.set_scroll_offset(100 * 40)
+
+    assert table.visible_range == (95, 125)
+    assert len(table._table.rows) == 30
+    assert table._table.rows[0].cells[0].content.value == "95"
+    assert table._top_spacer.height == 95 * 40
+    assert table._bottom_spacer.height == (1000 - 125) * 40
+
+
+def test_windowed_scroll_reuses_rows_and_pool():
+    table = _windowed_table()
+    table.build()
+    table.set_scroll_offset(100 * 40)
+    before = {id(row): row.cells[0].content.value for row in table._table.rows}
+
+    table.set_scroll_offset(102 * 40)
+
+    rows = table._table.rows
+    assert rows[0].cells[0].content.value == "97"
+    # Las filas que siguen visibles conservan su control sin reconstruirse.
+    kept = [row for row in rows if before.get(id(row)) == row.cells[0].content.value]
+    assert len(kept) == 28
+    # Las que entran reutilizan controles liberados por la ventana anterior.
+    assert all(id(row) in before for row in rows)
+
+
+def test_windowed_refresh_applies_query_over_all_rows():
+    table = _windowed_table()
+    table.build()
+
+    table.set_filter("name", "Item 99")
+
+    # 99 y 990-999 coinciden: cabe entero en la ventana.
+    assert table.visible_range == (0, 11)
+    assert [row.cells[0].content.value for row in table._table.rows][:2] == ["99", "990"]
+    assert table._bottom_spacer.height == 0
+
+
+def test_windowed_scroll_event_adapts_to_viewport():
+    class ScrollEvent:
+        pixels = 400.0
+        viewport_dimension = 1600.0
+
+    table = _windowed_table()
+    table.build()
+    table._handle_scroll(ScrollEvent())
+
+    assert table.visible_range == (5, 55)
+
+
+def test_refresh_reuses_cached_rows_and_headers():
+    columns = [
+        SmartTableColumn("id", "ID", sortable=True),
+        SmartTableColumn("name", "Nombre", filterable=True, editable=True),
+    ]
+    rows = [{"id": idx, "name": f"Item {idx}"} for idx in range(30)]
+    table = SmartTable(columns, rows=rows)
+    table.build()
+    headers = table._table.columns
+    cells = {row.cells[0].content.value: row.cells for row in table._table.rows}
+
+    table.set_filter("name", "Item 1")
+    table.set_filter("name", "Item 1")
+
+    assert table._table.columns is headers
+    assert [row.cells[0].content.value for row in table._table.rows][:2] == ["1", "10"]
+    assert all(row.cells is cells[row.cells[0].content.value] for row in table._table.rows)
+
+    table.toggle_sort("id")
+    assert table._table.columns is not headers
+    sorted_headers = table._table.columns
+    table.clear_filter("name")
+    assert table._table.columns is sorted_headers
+
+
+def test_edit_state_and_save_rebuild_only_affected_row():
+    columns = [
+        SmartTableColumn("id", "ID"),
+        SmartTableColumn("name", "Nombre", editable=True),
+    ]
+    table = SmartTable(columns, rows=[{"id": 1, "name": "A"}, {"id": 2, "name": "B"}])
+    table.build()
+    first, second = table._table.rows
+    first_cells, second_cells = first.cells, second.cells
+
+    row_id = table._records[0].row_id
+    table.start_edit(row_id)
+    assert table._table.rows[0] is first
+    assert first.cells is not first_cells
+    assert isinstance(first.cells[1].content, ft.TextField)
+    assert second.cells is second_cells
+
+    table._edit_buffers[row_id]["name"] = "Z"
+    table.save_row(row_id)
+    assert first.cells[1].content.value == "Z"
+    assert second.cells is second_cells
+
+
+def test_row_cache_drops_filtered_rows_and_restarts_edit_buffers():
+    columns = [
+        SmartTableColumn("id", "ID"),
+        SmartTableColumn("name", "Nombre", filterable=True, editable=True),
+    ]
+    rows = [{"id": idx, "name": f"Item {idx}"} for idx in range(30)]
+    table = SmartTable(columns, rows=rows)
+    table.build()
+    assert len(table._row_cache) == 30
+
+    table.set_filter("name", "Item 2")
+    visible = {record.row_id for record in table._view_records}
+    assert set(table._row_cache) == visible
+    assert set(table._row_keys) == visible
+
+    row_id = table._view_records[0].row_id
+    table.start_edit(row_id)
+    table._edit_buffers[row_id]["name"] = "Borrador"
+    table._fill_row(table._row_cache[row_id], table._records_by_id[row_id])
+    assert table._table.rows[0].cells[1].content.value == "Borrador"
+
+    table.start_edit(row_id)
+    assert table._table.rows[0].cells[1].content.value == "Item 2"
+
+
+def test_set_columns_invalidates_cached_rows():
+    table = SmartTable([SmartTableColumn("id", "ID")], rows=[{"id": 1, "name": "A"}])
+    table.build()
+
+    table.set_columns([SmartTableColumn("id", "ID"), SmartTableColumn("name", "Nombre")])
+
+    assert len(table._table.columns) == 2
+    assert table._table.rows[0].cells[1].content.value == "A"
+
+
+def test_query_cache_narrows_resorts_and_invalidates():
+    columns = [
+        SmartTableColumn("id", "ID", sortable=True),
+        SmartTableColumn("name", "Nombre", filterable=True, editable=True),
+        SmartTableColumn("age", "Edad", filterable=True, sortable=True),
+    ]
+    rows = [
+        {"id": idx, "name": name, "age": age}
+        for idx, (name, age) in enumerate(
+            [("Acme", 30), ("ACME Corp", 20), ("Acne", 30), ("Beta", 40), ("acmé", 25)]
+        )
+    ]
+    table = SmartTable(columns, rows=rows)
+    table.build()
+    ids = lambda: [row.cells[0].content.value for row in table._table.rows]  # noqa: E731
+
+    table.set_filter("name", "acm")
+    assert ids() == ["0", "1", "4"]
+    table.set_filter("name", "acme")
+    assert ids() == ["0", "1"]
+    # Ambas pulsaciones filtran solo el resultado anterior, más amplio.
+    assert table.query_cache_info()["narrowed"] == 2
+    assert table.query_cache_info()["misses"] == 1
+
+    table.toggle_sort("age")
+    assert ids() == ["1", "0"]
+    assert table.query_cache_info()["resorted"] == 1
+
+    table.start_edit(0)
+    assert table.query_cache_info()["hits"] >= 1
+
+    table._edit_buffers[0]["name"] = "Zeta"
+    table.save_row(0)
+    assert ids() == ["1"]
+    assert table.query_cache_info()["size"] == 1
+
+
+def test_query_cache_narrows_ranges_with_same_result_as_full_query():
+    columns = [
+        SmartTableColumn("id", "ID", sortable=True),
+        SmartTableColumn("age", "Edad", filterable=True, sortable=True),
+    ]
+    rows = [{"id": idx, "age": (idx * 37) % 50} for idx in range(60)]
+    table = SmartTable(columns, rows=rows)
+    table.toggle_sort("age")
+    table.set_filter("age", 40, filter_lte)
+    table._build_rows_view()
+    table.set_filter("age", 20, filter_lt)
+    table._build_rows_view()
+
+    assert table.query_cache_info()["narrowed"] == 1
+    assert table._view_records == table._apply_query(table._records)
+
+
+def _naive_query(table):
+    records = [
+        record
+        for record in table._records
+        if all(flt.matches(record.values.get(key)) for key, flt in table._filters.items())
+    ]
+    for sort in reversed(table._sorts):
+        records.sort(
+            key=lambda record: (record.values.get(sort.key) is None, record.values.get(sort.key)),
+            reverse=not sort.ascending,
+        )
+    return [record.row_id for record in records]
+
+
+def test_sorted_indexes_match_stable_sort_and_update_incrementally():
+    rng = random.Random(3)
+    columns = [
+        SmartTableColumn("id", "ID", sortable=True),
+        SmartTableColumn("age", "Edad", filterable=True, sortable=True),
+        SmartTableColumn("name", "Nombre", filterable=True, sortable=True, editable=True),
+    ]
+
+    def make_rows(count):
+        return [
+            {"id": idx, "age": rng.choice([None, 18, 20, 20.0, 35, 50]), "name": rng.choice(["a", "b", "c", None])}
+            for idx in range(count)
+        ]
+
+    table = SmartTable(columns, rows=make_rows(200))
+    table.toggle_sort("age")
+    table.toggle_sort("age")
+    table.toggle_sort("name", multi=True)
+    assert [r.row_id for r in table._apply_query_py(table._records)] == _naive_query(table)
+    assert set(table._sort_indexes) == {"age", "name"}
+
+    table._ingest_rows(make_rows(50))
+    table._ingest_rows(make_rows(3))
+    row_id = table._records[10].row_id
+    table.start_edit(row_id)
+    table._edit_buffers[row_id]["name"] = "zz"
+    table.save_row(row_id)
+
+    assert len(table._sort_indexes["name"]) == 253
+    assert [r.row_id for r in table._apply_query_py(table._records)] == _naive_query(table)
+
+    table.clear_sorts()
+    table.toggle_sort("age")
+    table.set_filter("age", 35, filter_lte)
+    assert [r.row_id for r in table._apply_query_py(table._records)] == _naive_query(table)
+
+
+def test_range_filters_use_index_bisection_when_column_is_homogeneous():
+    columns = [
+        SmartTableColumn("age", "Edad", filterable=True, sortable=True),
+        SmartTableColumn("code", "Código", filterable=True),
+    ]
+    rows = [{"age": age, "code": code} for age, code in [(30, 1), (None, "x"), (18, 2), (45, 3)]]
+    table = SmartTable(columns, rows=rows)
+    index = table._sort_index("age")
+
+    assert index.range_ids("lt", 30) == {2}
+    assert index.range_ids("gte", 30) == {0, 3}
+    assert index.range_ids("lt", "30") is None
+
+    table.set_filter("code", 2, filter_lt)
+    # Columna mixta: se evalúa con el predicado y los valores no comparables no pasan.
+    assert [r.values["code"] for r in table._apply_query_py(table._records)] == [1]
+    assert table._sort_index("code") is None
@@ -0,0 +1,172 @@
+import enum
+import math
+import random
+
+import pytest
+
+from fletplus.components.smart_table import SmartTable, SmartTableColumn, filter_gt
+from fletplus.components.smart_table_aggregates import AggregateIndex, RunningAggregate
+
+
+def _columns():
+    return [
+        SmartTableColumn("region", "Región", filterable=True),
+        SmartTableColumn("amount", "Importe", filterable=True, editable=True, aggregate="sum"),
+        SmartTableColumn("units", "Unidades", aggregate="avg"),
+        SmartTableColumn("product", "Producto", aggregate="distinct"),
+        SmartTableColumn("price", "Precio", aggregate="max"),
+    ]
+
+
+def _rows():
+    return [
+        {"region": "Norte", "amount": 100, "units": 1, "product": "A", "price": 10},
+        {"region": "Sur", "amount": 50, "units": 3, "product": "B", "price": 30},
+        {"region": "Norte", "amount": 25, "units": 2, "product": "A", "price": 20},
+        {"region": "Este", "amount": 75, "units": None, "product": "C", "price": 15},
+    ]
+
+
+def test_running_aggregate_supports_removals():
+    aggregate = RunningAggregate()
+    for value in (5, 1, 9, 1, None):
+        aggregate.add(value)
+    assert aggregate.result("count") == 4
+    assert aggregate.result("sum") == 16
+    assert aggregate.result("min") == 1
+    assert aggregate.result("max") == 9
+    assert aggregate.result("distinct") == 3
+
+    aggregate.remove(9)
+    aggregate.remove(1)
+    assert aggregate.result("max") == 5
+    assert aggregate.result("min") == 1
+    assert aggregate.result("avg") == 3
+
+
+def test_running_aggregate_keeps_exact_sums_and_typed_distincts():
+    aggregate = RunningAggregate()
+    for _ in range(1000):
+        aggregate.add(0.1)
+        aggregate.add(1e16)
+        aggregate.remove(1e16)
+    # Sumar y restar 1e16 sobre la marcha borraría los 0.1 acumulados.
+    assert aggregate.result("sum") == 100.0
+
+    integers = RunningAggregate()
+    integers.add(2**60)
+    integers.add(1)
+    assert integers.result("sum") == 2**60 + 1
+
+    mixed = RunningAggregate()
+    for value in (True, 1, 1.0):
+        mixed.add(value)
+    assert mixed.result("distinct") == 3
+    assert mixed.result("sum") == 2.0
+    mixed.remove(1)
+    assert mixed.result("distinct") == 2
+
+
+def test_running_aggregate_sum_is_incremental_and_exact():
+    rng = random.Random(7)
+    aggregate = RunningAggregate()
+    alive = []
+    for _ in range(2000):
+        if alive and rng.random() < 0.4:
+            aggregate.remove(alive.pop(rng.randrange(len(alive))))
+        else:
+            value = rng.choice([rng.uniform(-1e12, 1e12), rng.random() * 1e-6, rng.randint(-9, 9)])
+            aggregate.add(value)
+            alive.append(value)
+        assert aggregate.result("sum") == math.fsum(alive)
+    # Las parciales no crecen con el número de altas y bajas.
+    assert len(aggregate._fractional.partials) < 40
+
+    aggregate.add(math.inf)
+    assert aggregate.result("sum") == math.inf
+    aggregate.remove(math.inf)
+    assert aggregate.result("sum") == math.fsum(alive)
+
+
+def test_running_aggregate_sums_number_subclasses():
+    class Level(enum.IntEnum):
+        LOW = 1
+        HIGH = 10
+
+    class Price(float):
+        pass
+
+    aggregate = RunningAggregate()
+    for value in (Level.LOW, Level.HIGH, 4):
+        aggregate.add(value)
+    assert aggregate.result("sum") == 15
+    assert aggregate.result("avg") == 5
+
+    aggregate.add(Price(0.5))
+    assert aggregate.result("sum") == 15.5
+    aggregate.remove(Level.HIGH)
+    assert aggregate.result("avg") == pytest.approx(5.5 / 3)
+
+
+def test_aggregate_index_applies_only_the_delta():
+    index = AggregateIndex({"amount": "sum"})
+    rows = [(idx, {"amount": idx}) for idx in range(10)]
+    index.sync(rows)
+    assert index.totals() == {"amount": 45, "__size__": 10}
+
+    inserted = []
+    original = index._insert
+
+    def tracking_insert(row_id, values):
+        inserted.append(row_id)
+        original(row_id, values)
+
+    index._insert = tracking_insert
+    index.sync(rows[2:] + [(10, {"amount": 10})])
+    assert inserted == [10]
+    assert index.totals() == {"amount": 54, "__size__": 9}
+
+
+def test_footer_reflects_filters_and_edits():
+    table = SmartTable(_columns(), _rows())
+    table.build()
+
+    footer = table._table.rows[-1]
+    assert footer.cells[0].content.value == "Total"
+    assert footer.cells[1].content.value == "Suma: 250"
+    assert footer.cells[2].content.value == "Media: 2.00"
+    assert footer.cells[3].content.value == "Distintos: 3"
+
+    table.set_filter("amount", 40, predicate=filter_gt)
+    assert table.aggregates()["amount"] == 225
+    assert table.aggregates()["__size__"] == 3
+
+    table.start_edit(0)
+    table._edit_buffers[0]["amount"] = 60
+    table.save_row(0)
+    assert table.aggregates()["amount"] == 185
+    assert table._table.rows[-1].cells[1].content.value == "Suma: 185"
+
+
+def test_group_by_inserts_collapsible_headers_with_subtotals():
+    table = SmartTable(_columns(), _rows(), group_by="region")
+    table.build()
+
+    headers = [record for record in table._view_records if record.row_id < 0]
+    assert [header.group for header in headers] == ["Norte", "Sur", "Este"]
+    assert table.aggregates("Norte")["amount"] == 125
+    assert table.aggregates("Norte")["price"] == 20
+    assert len(table._table.rows) == 3 + 4 + 1
+
+    table.toggle_group("Norte")
+    assert len(table._table.rows) == 3 + 2 + 1
+    assert table.aggregates()["amount"] == 250
+
+    table.set_group_by(None)
+    assert len(table._table.rows) == 4 + 1
+
+
+def test_unknown_aggregate_is_rejected():
+    table = SmartTable([SmartTableColumn("a", "A", aggregate="median")], [{"a": 1}])
+    with pytest.raises(ValueError):
+        table.build()
@@ -0,0 +1,136 @@
+import datetime as dt
+import random
+
+import pytest
+
+import fletplus.components.smart_table_store as store_module
+from fletplus.components.smart_table import (
+    SmartTable,
+    SmartTableColumn,
+    filter_eq,
+    filter_gt,
+    filter_gte,
+    filter_lt,
+    filter_lte,
+    filter_neq,
+)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        if not store_module.NUMPY_AVAILABLE:
+            pytest.skip("NumPy no disponible")
+    else:
+        monkeypatch.setattr(store_module, "_np", None)
+    return request.param
+
+
+def _rows(size: int = 400):
+    rng = random.Random(7)
+    base = dt.date(2024, 1, 1)
+    return [
+        {
+            "id": idx,
+            "name": rng.choice(["Ana", "Luis", "Marta", "ana", None, "Óscar"]),
+            "age": rng.choice([None, 18, 25, 25.0, 40, 61, 90]),
+            "score": rng.random() * 100,
+            "joined": base + dt.timedelta(days=rng.randint(0, 30)),
+        }
+        for idx in range(size)
+    ]
+
+
+def _pair():
+    columns = [
+        SmartTableColumn("id", "ID"),
+        SmartTableColumn("name", "Nombre", filterable=True),
+        SmartTableColumn("age", "Edad", filterable=True),
+        SmartTableColumn("score", "Puntaje", filterable=True),
+        SmartTableColumn("joined", "Alta", filterable=True),
+    ]
+    rows = _rows()
+    reference = SmartTable(columns, rows=[dict(row) for row in rows])
+    columnar = SmartTable(columns, rows=[dict(row) for row in rows], storage="columnar")
+    return reference, columnar
+
+
+def _ids(table: SmartTable):
+    return [record.values["id"] for record in table._apply_query_py(table._records)]
+
+
+def _columnar_ids(table: SmartTable):
+    return [record.values["id"] for record in table._apply_query(table._records)]
+
+
+@pytest.mark.parametrize(
+    "key,value,predicate",
+    [
+        ("name", "an", None),
+        ("age", 25, filter_eq),
+        ("age", 25, filter_neq),
+        ("age", 40, filter_lt),
+        ("age", 40, filter_lte),
+        ("score", 50.5, filter_gt),
+        ("score", 50.5, filter_gte),
+        ("age", "2", None),
+        ("joined", dt.date(2024, 1, 15), filter_lt),
+        ("name", "x", lambda cell, value: cell is not None and len(cell) > 3),
+    ],
+)
+def test_columnar_filters_match_record_fallback(backend, key, value, predicate):
+    reference, columnar = _pair()
+    for table in (reference, columnar):
+        table.set_filter(key, value, predicate)
+
+    assert _columnar_ids(columnar) == _ids(reference)
+
+
+def test_columnar_multi_sort_matches_record_fallback(backend):
+    reference, columnar = _pair()
+    for table in (reference, columnar):
+        table.toggle_sort("age")
+        table.toggle_sort("age")
+        table.toggle_sort("joined", multi=True)
+        table.toggle_sort("score", multi=True)
+
+    assert _columnar_ids(columnar) == _ids(reference)
+
+
+def test_columnar_store_tracks_ingest_and_edits(backend):
+    columns = [
+        SmartTableColumn("id", "ID"),
+        SmartTableColumn("name", "Nombre", filterable=True, editable=True),
+    ]
+    table = SmartTable(columns, rows=[{"id": 1, "name": "Ana"}], storage="columnar")
+    table.set_filter("name", "ana")
+    assert [r.values["id"] for r in table._apply_query(table._records)] == [1]
+
+    table._ingest_rows([{"id": 2, "name": "Mariana"}, {"id": 3, "name": "Luis"}])
+    assert [r.values["id"] for r in table._apply_query(table._records)] == [1, 2]
+
+    row_id = table._records[2].row_id
+    table.start_edit(row_id)
+    table._edit_buffers[row_id]["name"] = "Juana"
+    table.save_row(row_id)
+    assert [r.values["id"] for r in table._apply_query(table._records)] == [1, 2, 3]
+
+
+def test_columnar_falls_back_for_unhashable_and_mixed_values(backend):
+    columns = [SmartTableColumn("tags", "Etiquetas", filterable=True)]
+    table = SmartTable(
+        columns,
+        rows=[{"tags": ["b"]}, {"tags": ["a"]}, {"tags": None}],
+        storage="columnar",
+    )
+    table.set_filter("tags", "a")
+    assert [r.values["tags"] for r in table._apply_query(table._records)] == [["a"]]
+
+    mixed = SmartTable([SmartTableColumn("v", "V")], rows=[{"v": 1}, {"v": "a"}], storage="columnar")
+    mixed.toggle_sort("v")
+    assert mixed._store.query([], mixed._sorts) is None
+
+
+def test_storage_must_be_known():
+    with pytest.raises(ValueError):
+        SmartTable([SmartTableColumn("id", "ID")], storage="arrow")
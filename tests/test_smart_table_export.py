@@ -0,0 +1,137 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+from fletplus.components.smart_table import SmartTable, SmartTableColumn, filter_gt
+
+
+def _columns():
+    return [
+        SmartTableColumn("id", "ID"),
+        SmartTableColumn("name", "Nombre", filterable=True),
+        SmartTableColumn("score", "Puntos", filterable=True),
+    ]
+
+
+def _rows(size: int = 10):
+    return [{"id": idx, "name": f"Fila, {idx}", "score": (idx * 7) % 10} for idx in range(size)]
+
+
+def test_export_csv_follows_query_order_and_reports_progress(tmp_path):
+    table = SmartTable(_columns(), _rows())
+    table.set_filter("score", 4, predicate=filter_gt)
+    table.toggle_sort("score")
+    progress = []
+    table.export_progress.subscribe(progress.append)
+
+    path = tmp_path / "tabla.csv"
+    written = table.export(path, chunk_size=2)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "id,name,score"
+    assert lines[1:] == [
+        '5,"Fila, 5",5',
+        '8,"Fila, 8",6',
+        '1,"Fila, 1",7',
+        '4,"Fila, 4",8',
+        '7,"Fila, 7",9',
+    ]
+    assert written == 5
+    assert progress[0] == (0, 5)
+    assert progress[-1] == (5, 5)
+    assert (2, 5) in progress
+
+
+def test_export_jsonl_to_stream_with_selected_columns():
+    table = SmartTable(_columns(), _rows(3))
+    buffer = io.StringIO()
+    table.export(buffer, format="jsonl", columns=["id", "name"])
+
+    rows = [json.loads(line) for line in buffer.getvalue().splitlines()]
+    assert rows == [{"id": idx, "name": f"Fila, {idx}"} for idx in range(3)]
+
+    with pytest.raises(ValueError):
+        table.export(buffer, format="xml")
+
+
+def test_export_pages_through_provider_without_loading_table():
+    calls = []
+
+    def provider(query, start, end):
+        calls.append((start, end))
+        return _rows(25)[start:end]
+
+    table = SmartTable(_columns(), data_provider=provider, page_size=10)
+    table.set_filter("score", 4, predicate=filter_gt)
+    loaded = len(table._records)
+    buffer = io.BytesIO()
+    written = table.export(buffer, format="jsonl")
+
+    exported = [json.loads(line) for line in buffer.getvalue().decode("utf-8").splitlines()]
+    assert written == len(exported) == sum(1 for row in _rows(25) if row["score"] > 4)
+    assert calls[-3:] == [(0, 10), (10, 20), (20, 30)]
+    assert len(table._records) == loaded
+
+
+def test_export_async_provider_and_async_writer():
+    class AsyncWriter:
+        def __init__(self):
+            self.parts = []
+
+        async def write(self, text):
+            self.parts.append(text)
+
+    async def provider(query, start, end):
+        await asyncio.sleep(0)
+        return _rows(7)[start:end]
+
+    async def scenario():
+        table = SmartTable(_columns(), data_provider=provider, page_size=3, pushdown=True)
+        writer = AsyncWriter()
+        pending = table.export(writer, chunk_size=2)
+        assert asyncio.iscoroutine(pending)
+        written = await pending
+        return written, "".join(writer.parts)
+
+    written, text = asyncio.run(scenario())
+    assert written == 7
+    assert text.splitlines()[0] == "id,name,score"
+    assert len(text.splitlines()) == 8
+
+
+def test_export_local_sort_enforces_row_cap(tmp_path):
+    calls = []
+
+    def provider(query, start, end):
+        calls.append((start, end))
+        return _rows(25)[start:end]
+
+    table = SmartTable(_columns(), data_provider=provider, page_size=10)
+    table.toggle_sort("score")
+    with pytest.raises(ValueError, match="max_sort_rows"):
+        table.export(io.StringIO(), max_sort_rows=12)
+
+    # Con el total conocido y sin filtros se falla antes de pedir páginas.
+    table.total_rows = 25
+    calls.clear()
+    with pytest.raises(ValueError, match="max_sort_rows"):
+        table.export(tmp_path / "tabla.csv", max_sort_rows=12)
+    assert calls == []
+    assert not (tmp_path / "tabla.csv").exists()
+
+    # Los filtros locales pueden dejarlo por debajo del límite.
+    table.set_filter("score", 4, predicate=filter_gt)
+    buffer = io.StringIO()
+    written = table.export(buffer, format="jsonl", max_sort_rows=12)
+    scores = [json.loads(line)["score"] for line in buffer.getvalue().splitlines()]
+    assert written == len(scores) <= 12
+    assert scores == sorted(scores)
+
+    # Con pushdown el proveedor ordena y se transmite sin límite.
+    table.pushdown = True
+    table.clear_filter("score")
+    assert table.export(io.StringIO(), max_sort_rows=1) == 25
+    with pytest.raises(ValueError, match="max_sort_rows"):
+        table.export(io.StringIO(), max_sort_rows=0)
@@ -0,0 +1,175 @@
+import asyncio
+import inspect
+import json
+import os
+
+import pytest
+
+from fletplus.components import FileDataProvider
+from fletplus.components.smart_table import (
+    SmartTable,
+    SmartTableColumn,
+    SmartTableFilter,
+    SmartTableQuery,
+    SmartTableSort,
+    filter_gt,
+)
+
+
+def _write_jsonl(path, size=30):
+    with open(path, "w", encoding="utf-8") as handle:
+        for idx in range(size):
+            handle.write(json.dumps({"id": idx, "level": ["INFO", "WARN", "ERROR"][idx % 3]}) + "\n")
+            if idx == 10:
+                handle.write("\n")
+
+
+def test_jsonl_pages_are_decoded_on_demand_and_index_is_persisted(tmp_path):
+    path = tmp_path / "log.jsonl"
+    _write_jsonl(path)
+
+    with FileDataProvider(path) as provider:
+        assert provider(SmartTableQuery(), 9, 13) == [
+            {"id": 9, "level": "INFO"},
+            {"id": 10, "level": "WARN"},
+            {"id": 11, "level": "ERROR"},
+            {"id": 12, "level": "INFO"},
+        ]
+        assert len(provider) == 30
+        assert provider(SmartTableQuery(), 28, 40) == [
+            {"id": 28, "level": "WARN"},
+            {"id": 29, "level": "ERROR"},
+        ]
+    assert os.path.exists(str(path) + ".idx")
+
+    reopened = FileDataProvider(path, background=False)
+    assert reopened.ready
+    assert reopened.indexed_rows == 30
+    reopened.close()
+
+
+def test_stale_index_is_rebuilt_when_file_changes(tmp_path):
+    path = tmp_path / "log.jsonl"
+    _write_jsonl(path, 5)
+    FileDataProvider(path, background=False).close()
+
+    _write_jsonl(path, 8)
+    os.utime(path, ns=(1, 1))
+    with FileDataProvider(path) as provider:
+        assert len(provider) == 8
+
+
+def test_filters_sorts_and_search_are_scanned_incrementally(tmp_path):
+    path = tmp_path / "log.jsonl"
+    _write_jsonl(path)
+    with FileDataProvider(path, persist_index=False) as provider:
+        query = SmartTableQuery(filters={"level": SmartTableFilter("level", "err")})
+        assert [row["id"] for row in provider(query, 0, 3)] == [2, 5, 8]
+        scan = next(iter(provider._scans.values()))
+        assert scan.next_line < 30 and not scan.complete
+        assert [row["id"] for row in provider(query, 3, 5)] == [11, 14]
+
+        ordered = SmartTableQuery(
+            filters={"id": SmartTableFilter("id", 24, filter_gt)},
+            sorts=[SmartTableSort("id", ascending=False)],
+        )
+        # El orden se calcula en otro hilo; mientras tanto llega un awaitable.
+        page = provider(ordered, 0, 10)
+        if inspect.isawaitable(page):
+            page = asyncio.run(page)
+        assert [row["id"] for row in page] == [29, 28, 27, 26, 25]
+        assert [row["id"] for row in provider(ordered, 2, 4)] == [27, 26]
+
+        searched = SmartTableQuery(search="warn 1")
+        assert [row["id"] for row in provider(searched, 0, 10)] == [1, 10, 13, 16, 19]
+        assert not os.path.exists(str(path) + ".idx")
+
+        # Solo se busca en las columnas buscables, como en memoria.
+        restricted = SmartTableQuery(search="warn", search_columns=("id",))
+        assert provider(restricted, 0, 10) == []
+
+
+def test_sorted_table_page_loads_without_blocking_the_loop(tmp_path):
+    path = tmp_path / "log.jsonl"
+    _write_jsonl(path)
+
+    async def scenario():
+        with FileDataProvider(path, persist_index=False) as provider:
+            table = SmartTable(
+                [SmartTableColumn("id", "ID", sortable=True), SmartTableColumn("level", "Nivel")],
+                data_provider=provider,
+                page_size=4,
+                pushdown=True,
+            )
+            await asyncio.sleep(0.05)
+            table.toggle_sort("id")
+            table.toggle_sort("id")
+            for _ in range(100):
+                if [record.values["id"] for record in table._records] == [29, 28, 27, 26]:
+                    break
+                await asyncio.sleep(0.01)
+            assert [record.values["id"] for record in table._records] == [29, 28, 27, 26]
+
+    asyncio.run(scenario())
+
+
+def test_search_uses_the_table_searchable_columns(tmp_path):
+    path = tmp_path / "log.jsonl"
+    _write_jsonl(path, 6)
+    with FileDataProvider(path, persist_index=False) as provider:
+        table = SmartTable(
+            [SmartTableColumn("id", "ID", search_weight=0), SmartTableColumn("level", "Nivel")],
+            data_provider=provider,
+            page_size=10,
+            pushdown=True,
+        )
+        table.set_search("1")
+        assert table._records == []
+        table.set_search("warn")
+        assert [record.values["id"] for record in table._records] == [1, 4]
+
+
+def test_file_is_closed_when_setup_fails(tmp_path, monkeypatch):
+    path = tmp_path / "datos.csv"
+    path.write_text("id,name\n1,a\n", encoding="utf-8")
+    opened = []
+    original_open = open
+
+    def tracking_open(*args, **kwargs):
+        handle = original_open(*args, **kwargs)
+        opened.append(handle)
+        return handle
+
+    def broken_header(self):
+        raise ValueError("cabecera rota")
+
+    monkeypatch.setattr("builtins.open", tracking_open)
+    monkeypatch.setattr(FileDataProvider, "_read_header", broken_header)
+    with pytest.raises(ValueError):
+        FileDataProvider(path)
+    assert opened and all(handle.closed for handle in opened)
+
+
+def test_csv_provider_with_converters_drives_pushdown_table(tmp_path):
+    path = tmp_path / "ventas.csv"
+    lines = ["id,region,amount"] + [f"{idx},\"Norte, {idx % 2}\",{idx * 10}" for idx in range(12)]
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+    with FileDataProvider(path, converters={"id": int, "amount": float}) as provider:
+        assert provider.columns == ["id", "region", "amount"]
+        table = SmartTable(
+            [
+                SmartTableColumn("id", "ID"),
+                SmartTableColumn("region", "Región"),
+                SmartTableColumn("amount", "Importe", filterable=True),
+            ],
+            data_provider=provider,
+            page_size=5,
+            pushdown=True,
+        )
+        assert table._records[0].values == {"id": 0, "region": "Norte, 0", "amount": 0.0}
+
+        table.set_filter("amount", 60, predicate=filter_gt)
+        assert [record.values["id"] for record in table._records] == [7, 8, 9, 10, 11]
+        table.load_more(sync=True)
+        assert table._exhausted
@@ -0,0 +1,200 @@
+import asyncio
+import pickle
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fletplus.components.smart_table import SmartTable, SmartTableColumn, filter_gt
+from fletplus.components.smart_table_store import ColumnarStore, run_query
+
+
+def _columns():
+    return [
+        SmartTableColumn("id", "ID", sortable=True),
+        SmartTableColumn("score", "Puntos", sortable=True, filterable=True),
+    ]
+
+
+def _rows(size: int = 2000):
+    return [{"id": idx, "score": (idx * 7919) % 1000} for idx in range(size)]
+
+
+def _ids(table: SmartTable):
+    return [record.values["id"] for record in table._view_records]
+
+
+async def _wait_computed(table: SmartTable) -> None:
+    for _ in range(500):
+        if not table.computing.get():
+            return
+        await asyncio.sleep(0.005)
+    raise AssertionError("La consulta no terminó")
+
+
+class _GatedExecutor(ThreadPoolExecutor):
+    """Ejecutor que retiene cada tarea hasta que el test la libera."""
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.gate = threading.Event()
+
+    def submit(self, fn, *args, **kwargs):
+        def gated():
+            self.gate.wait(5)
+            return fn(*args, **kwargs)
+
+        return super().submit(gated)
+
+
+def test_offloaded_query_keeps_previous_rows_until_result_arrives():
+    async def scenario():
+        executor = _GatedExecutor()
+        table = SmartTable(_columns(), _rows(), query_executor=executor, offload_threshold=100)
+        table.build()
+        assert table._computing_indicator is not None
+        assert _ids(table)[:3] == [0, 1, 2]
+
+        table.toggle_sort("score")
+        assert table.computing.get() is True
+        assert table._computing_indicator.visible is True
+        assert _ids(table)[:3] == [0, 1, 2]
+
+        executor.gate.set()
+        await _wait_computed(table)
+        scores = [record.values["score"] for record in table._view_records]
+        assert scores == sorted(scores)
+        assert table._computing_indicator.visible is False
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_offloaded_query_discards_superseded_results():
+    async def scenario():
+        executor = _GatedExecutor()
+        table = SmartTable(_columns(), _rows(), query_executor=executor, offload_threshold=100)
+        table.build()
+
+        table.toggle_sort("score")
+        table.set_filter("score", 900, predicate=filter_gt)
+        table.toggle_sort("score")
+        executor.gate.set()
+        await _wait_computed(table)
+        await asyncio.sleep(0.05)
+
+        scores = [record.values["score"] for record in table._view_records]
+        assert scores and all(score > 900 for score in scores)
+        assert scores == sorted(scores, reverse=True)
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_computing_indicator_survives_set_columns():
+    table = SmartTable(_columns(), _rows(50), query_executor="thread")
+    container = table.build()
+    indicator = table._computing_indicator
+    assert indicator in container.controls
+
+    table.set_columns(_columns()[:1])
+    assert indicator in container.controls
+    assert container.controls[-1] is table._table
+
+
+def test_offload_skipped_below_threshold_or_without_loop():
+    table = SmartTable(_columns(), _rows(), query_executor="thread", offload_threshold=100)
+    table.build()
+    table.toggle_sort("score")
+    assert table.computing.get() is False
+    scores = [record.values["score"] for record in table._view_records]
+    assert scores == sorted(scores)
+
+    async def scenario():
+        small = SmartTable(_columns(), _rows(50), query_executor="thread", offload_threshold=100)
+        small.build()
+        small.toggle_sort("score")
+        assert small.computing.get() is False
+
+    asyncio.run(scenario())
+
+
+def test_process_executor_resolves_columnar_queries():
+    async def scenario():
+        table = SmartTable(
+            _columns(),
+            _rows(),
+            storage="columnar",
+            query_executor="process",
+            offload_threshold=100,
+        )
+        reference = SmartTable(_columns(), _rows())
+        table.build()
+        reference.build()
+
+        for target in (table, reference):
+            target.set_filter("score", 500, predicate=filter_gt)
+            target.toggle_sort("score")
+        await _wait_computed(table)
+
+        assert _ids(table) == _ids(reference)
+        assert table._query_key() in table._query_cache
+
+    asyncio.run(scenario())
+
+
+class _GatedProcessExecutor(ProcessPoolExecutor):
+    """Se hace pasar por un pool de procesos pero ejecuta en un hilo retenido."""
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.gate = threading.Event()
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+
+        def run():
+            self.gate.wait(5)
+            future.set_result(fn(*args, **kwargs))
+
+        threading.Thread(target=run, daemon=True).start()
+        return future
+
+
+def test_process_result_is_not_cached_after_in_place_edit():
+    async def scenario():
+        executor = _GatedProcessExecutor()
+        table = SmartTable(
+            _columns(),
+            _rows(),
+            storage="columnar",
+            query_executor=executor,
+            offload_threshold=100,
+        )
+        table.build()
+        table.toggle_sort("score")
+        assert table.computing.get() is True
+
+        # Misma cantidad de filas, distinto contenido.
+        first = table._records[0]
+        with table._query_lock:
+            table._apply_updates(first, {"score": 5000})
+        executor.gate.set()
+        await _wait_computed(table)
+
+        assert table._view_records[-1] is first
+        scores = [record.values["score"] for record in table._view_records]
+        assert scores == sorted(scores)
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_detached_store_pickles_only_query_columns():
+    store = ColumnarStore()
+    for idx in range(10):
+        store.append(idx, {"id": idx, "score": -idx, "blob": "x" * 1000})
+    detached = store.detach(["score"])
+    payload = pickle.dumps(detached)
+
+    assert len(payload) < 1000
+    sort = type("Sort", (), {"key": "score", "ascending": True})()
+    assert run_query(pickle.loads(payload), [], [sort]) == list(range(9, -1, -1))
@@ -127,3 +127,46 @@ def test_rust_falls_back_for_unknown_predicate():
     python_records = table._apply_query_py(table._records)
 
     assert [rec.row_id for rec in rust_records] == [rec.row_id for rec in python_records]
+
+
+def test_table_handle_stays_in_sync_with_incremental_changes():
+    if backend.TableHandle is None:  # pragma: no cover - extensión antigua
+        pytest.skip("TableHandle no disponible")
+
+    handle = backend.TableHandle()
+    rows = [(idx, {"name": f"Item {idx}", "age": idx % 7}) for idx in range(50)]
+    handle.ingest(rows[:30])
+    handle.append(rows[30:])
+    handle.update(3, {"name": "Zeta", "age": 100})
+    rows[3] = (3, {"name": "Zeta", "age": 100})
+    assert handle.delete([5, 6, 999]) == 2
+    rows = [row for row in rows if row[0] not in (5, 6)]
+    assert len(handle) == 48
+
+    filters = [{"key": "age", "value": 3, "op": "gte"}]
+    sorts = [{"key": "age", "ascending": False}, {"key": "name", "ascending": True}]
+    assert handle.query(filters, sorts) == backend.apply_query_ids(rows, filters, sorts)
+
+
+def test_smart_table_reuses_native_handle_across_queries():
+    if backend.TableHandle is None:  # pragma: no cover - extensión antigua
+        pytest.skip("TableHandle no disponible")
+
+    table = _build_small_table()
+    table.toggle_sort("age")
+    first = [rec.row_id for rec in table._apply_query(table._records)]
+    handle = table._native_table
+    assert handle is not None
+
+    table._ingest_rows([{"id": 5, "name": "Bea", "age": 20, "score": 50.0}])
+    row_id = table._records[0].row_id
+    table.start_edit(row_id)
+    table._edit_buffers[row_id]["age"] = 99
+    table.save_row(row_id)
+
+    rust_ids = [rec.row_id for rec in table._apply_query(table._records)]
+    python_ids = [rec.row_id for rec in table._apply_query_py(table._records)]
+    assert table._native_table is handle
+    assert len(handle) == 5
+    assert rust_ids == python_ids
+    assert rust_ids != first
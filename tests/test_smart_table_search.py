@@ -0,0 +1,148 @@
+import flet as ft
+
+from fletplus.components.smart_table import SmartTable, SmartTableColumn
+from fletplus.components.smart_table_search import SearchIndex, highlight_spans, split_terms
+
+
+def _people():
+    return [
+        {"id": 0, "name": "Ana López", "city": "Madrid"},
+        {"id": 1, "name": "Luis Pérez", "city": "Málaga"},
+        {"id": 2, "name": "Marta Madrigal", "city": "Sevilla"},
+        {"id": 3, "name": "Óscar Ruiz", "city": "Madrid"},
+        {"id": 4, "name": "Lucía Gómez", "city": None},
+    ]
+
+
+def _table(**kwargs) -> SmartTable:
+    columns = [
+        SmartTableColumn("id", "ID", search_weight=0),
+        SmartTableColumn("name", "Nombre", editable=True, search_weight=2.0),
+        SmartTableColumn("city", "Ciudad"),
+    ]
+    table = SmartTable(columns, _people(), **kwargs)
+    table.build()
+    return table
+
+
+def _ids(table: SmartTable):
+    return [record.values["id"] for record in table._view_records]
+
+
+def test_search_index_ignores_case_and_accents_and_requires_all_terms():
+    index = SearchIndex({"name": 1.0, "city": 1.0})
+    index.add((row["id"], row) for row in _people())
+
+    assert set(index.search("MALAGA")) == {1}
+    assert set(index.search("oscar")) == {3}
+    assert set(index.search("mad")) == {0, 2, 3}
+    assert set(index.search("mad ana")) == {0}
+    assert set(index.search("lu")) == {1, 4}
+    assert index.search("xyz") == {}
+
+    index.update(1, {"name": "Luis Pérez", "city": "Cádiz"})
+    assert set(index.search("malaga")) == set()
+    assert set(index.search("cadiz")) == {1}
+
+
+def test_search_ranks_by_column_weight_without_explicit_sorts():
+    table = _table()
+    table.set_search("madri")
+
+    # "Madrigal" está en el nombre (peso 2) y en ninguna ciudad; Madrid solo en ciudad.
+    assert _ids(table) == [2, 0, 3]
+
+    table.toggle_sort("id")
+    table.toggle_sort("id")
+    assert _ids(table) == [3, 2, 0]
+
+    table.clear_search()
+    assert len(table._view_records) == 5
+
+
+def test_search_highlights_default_cells_and_custom_builders():
+    seen = []
+
+    def highlight(value, spans):
+        seen.append((value, list(spans)))
+        return ft.Text(str(value))
+
+    table = _table()
+    table.columns[2].highlight_builder = highlight
+    table.set_search("mad")
+
+    row = table._table.rows[0]
+    name_cell = row.cells[1].content
+    assert [span.text for span in name_cell.spans] == ["Marta ", "Mad", "rigal"]
+    assert table.search_highlights(0) == {"city": [(0, 3)]}
+    assert ("Madrid", [(0, 3)]) in seen
+
+
+def test_search_tracks_ingest_and_edits():
+    table = _table()
+    table.set_search("sevilla")
+    assert _ids(table) == [2]
+
+    table.start_edit(0)
+    table._edit_buffers[0]["name"] = "Ana de Sevilla"
+    table.save_row(0)
+    # La coincidencia en el nombre pesa más que la de la ciudad.
+    assert _ids(table) == [0, 2]
+
+    table._ingest_rows([{"id": 5, "name": "Pepe", "city": "Sevilla"}])
+    table.refresh()
+    assert _ids(table) == [0, 2, 5]
+
+
+def test_search_is_forwarded_to_pushdown_providers():
+    queries = []
+
+    def provider(query, start, end):
+        queries.append(query.to_dict())
+        return [{"id": idx, "name": f"Item {idx}", "city": "Bilbao"} for idx in range(start, min(end, 3))]
+
+    table = SmartTable(
+        [SmartTableColumn("id", "ID"), SmartTableColumn("name", "Nombre")],
+        data_provider=provider,
+        pushdown=True,
+    )
+    table.build()
+    table.set_search("  item   2 ")
+
+    assert queries[-1]["search"] == "item 2"
+    assert split_terms("Ítem 2") == ["item", "2"]
+    assert highlight_spans("Ítem 12", ["item", "2"]) == [(0, 4), (6, 7)]
+
+
+def test_search_reuses_rows_whose_highlights_do_not_change():
+    table = _table()
+    table.set_search("lu")
+    assert _ids(table) == [1, 4]
+    cells = [row.cells for row in table._table.rows]
+
+    # "u" no añade resaltados nuevos a ninguna de las dos filas.
+    table.set_search("lu u")
+    assert _ids(table) == [1, 4]
+    assert all(row.cells is old for row, old in zip(table._table.rows, cells))
+
+    table.set_search("luis")
+    assert table._table.rows[0].cells is not cells[0]
+
+
+def test_quick_search_field_survives_set_columns():
+    table = _table(quick_search=True)
+    container = table._container
+    field = container.controls[0]
+    assert isinstance(field, ft.TextField)
+
+    field.value = "lu"
+    field.on_change(type("Event", (), {"control": field})())
+    assert _ids(table) == [1, 4]
+
+    table.set_columns([SmartTableColumn("id", "ID"), SmartTableColumn("name", "Nombre")])
+    assert container.controls[0] is field
+    assert field.value == "lu"
+
+    table.clear_search()
+    assert field.value == ""
+    assert _ids(table) == [0, 1, 2, 3, 4]
@@ -1,4 +1,6 @@
 import asyncio
+import threading
+import time
 
 from fletplus.components.smart_table import SmartTable, SmartTableColumn
 
@@ -146,3 +148,315 @@ def test_refresh_consistency_after_sync_load_more():
     assert len(table._records) == 4
     assert len(table._table.rows) == 4
     assert table._table.rows[-1].cells[1].content.value == "Item 3"
+
+
+def _pushdown_provider(calls):
+    data = [{"id": idx, "name": f"Item {idx}"} for idx in range(40)]
+
+    def provider(query, start, end):
+        calls.append((dict((k, f.value) for k, f in query.filters.items()), start, end))
+        rows = data
+        flt = query.filters.get("name")
+        if flt is not None:
+            rows = [row for row in rows if flt.matches(row["name"])]
+        for sort in reversed(query.sorts):
+            rows = sorted(rows, key=lambda row: row[sort.key], reverse=not sort.ascending)
+        return rows[start:end]
+
+    return provider
+
+
+def test_pushdown_resets_paging_and_caches_pages_per_query():
+    calls = []
+    columns = [SmartTableColumn("id", "ID", sortable=True), SmartTableColumn("name", "Nombre", filterable=True)]
+    table = SmartTable(columns, page_size=5, data_provider=_pushdown_provider(calls), pushdown=True)
+    table.build()
+    table.load_more(sync=True)
+    assert len(table._records) == 10
+
+    table.set_filter("name", "Item 3")
+    # Item 3 y 30-39: la consulta va al proveedor desde el inicio.
+    assert calls[-1] == ({"name": "Item 3"}, 0, 5)
+    assert [row.cells[0].content.value for row in table._table.rows] == ["3", "30", "31", "32", "33"]
+    table.load_more(sync=True)
+    table.load_more(sync=True)
+    assert len(table._records) == 11
+    assert table._exhausted
+
+    calls.clear()
+    table.clear_filter("name")
+    assert calls == []
+    assert len(table._table.rows) == 10
+
+    table.toggle_sort("id")
+    table.toggle_sort("id")
+    assert table._table.rows[0].cells[0].content.value == "39"
+
+
+def test_pushdown_row_cache_stays_bounded_across_queries():
+    columns = [SmartTableColumn("id", "ID"), SmartTableColumn("name", "Nombre", filterable=True)]
+    table = SmartTable(
+        columns,
+        page_size=20,
+        data_provider=_pushdown_provider([]),
+        pushdown=True,
+        page_cache_size=2,
+    )
+    table.build()
+
+    for step in range(200):
+        table.set_filter("name", f"Item {step % 7}")
+        table.set_filter("name", f"Item {step % 5}{step % 3}")
+
+    cached_ids = {record.row_id for record in table._records}
+    for records, _ in table._page_cache.values():
+        cached_ids.update(record.row_id for record in records)
+    assert len(table._page_cache) <= 2
+    assert set(table._row_cache) <= cached_ids
+    assert set(table._row_keys) == set(table._row_cache)
+    assert len(table._row_cache) <= len(table._records)
+
+
+def test_pushdown_discards_superseded_async_loads():
+    async def scenario():
+        started = []
+
+        async def provider(query, start, end):
+            started.append(dict((k, f.value) for k, f in query.filters.items()))
+            await asyncio.sleep(0.01)
+            return [{"id": idx, "name": f"Item {idx}"} for idx in range(start, end)]
+
+        table = SmartTable(
+            [SmartTableColumn("id", "ID"), SmartTableColumn("name", "Nombre", filterable=True)],
+            page_size=3,
+            data_provider=provider,
+            pushdown=True,
+        )
+        await asyncio.sleep(0.02)
+        first = table.load_more()
+        table.set_filter("name", "Item")
+        await asyncio.sleep(0.02)
+
+        assert first.cancelled()
+        assert started[-1] == {"name": "Item"}
+        assert len(table._records) == 3
+
+    asyncio.run(scenario())
+
+
+def _prefetch_table(provider, **kwargs) -> SmartTable:
+    return SmartTable(
+        [SmartTableColumn("id", "ID")],
+        page_size=20,
+        data_provider=provider,
+        total_rows=200,
+        window_size=10,
+        overscan=0,
+        row_height=40,
+        prefetch_threshold=5,
+        **kwargs,
+    )
+
+
+def test_prefetch_loads_next_page_when_window_nears_end():
+    calls = []
+
+    def provider(query, start, end):
+        calls.append((start, end))
+        return [{"id": idx} for idx in range(start, min(end, 200))]
+
+    table = _prefetch_table(provider)
+    table.build()
+    assert calls == [(0, 20)]
+
+    table.set_scroll_offset(8 * 40)
+    _wait_prefetch(table)
+    assert calls == [(0, 20), (20, 40)]
+    assert len(table._records) == 40
+
+    table.set_scroll_offset(9 * 40)
+    _wait_prefetch(table)
+    assert len(calls) == 2
+
+
+def _wait_prefetch(table: SmartTable) -> None:
+    for _, pending in list(table._inflight_loads.values()):
+        pending.result(timeout=5)
+    # Sin página montada, las filas se incorporan en el siguiente desplazamiento.
+    table._drain_prefetched()
+
+
+def test_prefetch_without_event_loop_does_not_block_scrolling():
+    gate = threading.Event()
+    calls = []
+
+    def provider(query, start, end):
+        calls.append((start, end))
+        if start:
+            assert gate.wait(timeout=5)
+        return [{"id": idx} for idx in range(start, min(end, 200))]
+
+    table = _prefetch_table(provider)
+    table.build()
+
+    table.set_scroll_offset(8 * 40)
+    # El desplazamiento vuelve sin esperar al proveedor.
+    assert len(table._records) == 20
+    assert 20 in table._inflight_loads
+
+    gate.set()
+    table.load_more(sync=True)
+    assert calls.count((20, 40)) == 1
+    assert [record.values["id"] for record in table._records] == list(range(60))
+    assert not table._inflight_loads
+
+
+def test_executor_prefetch_only_calls_the_provider_off_thread():
+    gate = threading.Event()
+    provider_threads = []
+    ingest_threads = []
+
+    def provider(query, start, end):
+        provider_threads.append(threading.get_ident())
+        if start:
+            assert gate.wait(timeout=5)
+        return [{"id": idx} for idx in range(start, min(end, 200))]
+
+    table = _prefetch_table(provider)
+    table.build()
+    original = table._complete_range
+
+    def tracking_complete(start, batch, requested):
+        ingest_threads.append(threading.get_ident())
+        original(start, batch, requested)
+
+    table._complete_range = tracking_complete
+    table.set_scroll_offset(8 * 40)
+    gate.set()
+    _, pending = table._inflight_loads[20]
+    pending.result(timeout=5)
+    # El hilo del ejecutor no toca la tabla.
+    assert len(table._records) == 20
+
+    table.set_scroll_offset(8 * 40 + 1)
+    assert provider_threads[-1] != threading.get_ident()
+    assert ingest_threads == [threading.get_ident()]
+    assert len(table._records) == 40
+
+
+def test_executor_prefetch_is_applied_on_the_page_loop():
+    loop = asyncio.new_event_loop()
+    runner = threading.Thread(target=loop.run_forever, daemon=True)
+    runner.start()
+    ingest_threads = []
+
+    def provider(query, start, end):
+        return [{"id": idx} for idx in range(start, min(end, 200))]
+
+    try:
+        table = _prefetch_table(provider)
+        table.build()
+        table._owner_loop = lambda: loop
+        original = table._complete_range
+
+        def tracking_complete(start, batch, requested):
+            ingest_threads.append(threading.get_ident())
+            original(start, batch, requested)
+
+        table._complete_range = tracking_complete
+        table.set_scroll_offset(8 * 40)
+        for _ in range(500):
+            if len(table._records) == 40:
+                break
+            time.sleep(0.01)
+        assert len(table._records) == 40
+        assert ingest_threads == [runner.ident]
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        runner.join(timeout=5)
+        loop.close()
+
+
+def test_load_more_chains_executor_prefetch_without_blocking_the_loop():
+    gate = threading.Event()
+
+    def provider(query, start, end):
+        if start:
+            assert gate.wait(timeout=5)
+        return [{"id": idx} for idx in range(start, min(end, 200))]
+
+    table = _prefetch_table(provider)
+    table.build()
+    table.set_scroll_offset(8 * 40)
+
+    async def scenario():
+        task = table.load_more()
+        assert isinstance(task, asyncio.Task)
+        await asyncio.sleep(0.01)
+        assert not task.done()
+        gate.set()
+        await asyncio.wait_for(task, timeout=5)
+        assert [record.values["id"] for record in table._records] == list(range(60))
+
+    asyncio.run(scenario())
+
+
+def test_prefetch_bounds_concurrency_and_suppresses_duplicates():
+    async def scenario():
+        calls = []
+        gate = asyncio.Event()
+
+        async def provider(query, start, end):
+            calls.append((start, end))
+            await gate.wait()
+            return [{"id": idx} for idx in range(start, end)]
+
+        table = _prefetch_table(provider, prefetch_pages=3, max_concurrent_loads=2)
+        table.build()
+        await asyncio.sleep(0)
+        assert calls == [(0, 20)]
+
+        gate.set()
+        await asyncio.sleep(0.01)
+        gate.clear()
+        assert len(table._records) == 20
+
+        table.set_scroll_offset(8 * 40)
+        table.set_scroll_offset(9 * 40)
+        await asyncio.sleep(0)
+        assert calls[1:] == [(20, 40), (40, 60)]
+
+        task = table.load_more()
+        assert task is table._inflight_loads[20][1]
+
+        gate.set()
+        await asyncio.sleep(0.01)
+        assert len(table._records) == 60
+        assert [record.values["id"] for record in table._records] == list(range(60))
+
+    asyncio.run(scenario())
+
+
+def test_adaptive_page_size_follows_provider_latency():
+    delay = {"value": 0.0}
+
+    def provider(query, start, end):
+        time.sleep(delay["value"])
+        return [{"id": idx} for idx in range(start, end)]
+
+    table = SmartTable(
+        [SmartTableColumn("id", "ID")],
+        page_size=10,
+        data_provider=provider,
+        adaptive_page_size=True,
+        target_load_latency=0.02,
+    )
+    assert table.page_size == 20
+    table.load_more(sync=True)
+    assert table.page_size == 40
+    assert len(table._records) == 30
+
+    delay["value"] = 0.05
+    for _ in range(4):
+        table.load_more(sync=True)
+    assert 2 <= table.page_size < 40